@@ -0,0 +1,95 @@
+"""
+차트 표현별 할당량 / 캐시 바이트 측정
+
+같은 입력 묶음에 대해
+  - dict   : SajuEngine.calculate 결과 (기존 캐시 형식: 메모리 dict, 디스크 JSON)
+  - chart  : SajuEngine.calculate_chart 결과 (압축 Chart, 디스크는 pack() 정수)
+의 차트당 할당 블록 수/바이트(tracemalloc)와 캐시에 들고 있는 바이트를 비교합니다.
+
+    python bench/chart_memory.py --n 2000
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saju import SajuEngine  # noqa: E402
+
+
+def deep_sizeof(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen: return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, k), seen) for k in obj.__slots__)
+    return size
+
+
+def corpus(n, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        d = datetime.datetime(1900, 1, 1) + datetime.timedelta(minutes=rng.randrange(201 * 365 * 1440))
+        out.append((d.year, d.month, d.day, d.hour, d.minute, rng.choice(["남성", "여성"])))
+    return out
+
+
+def measure_allocations(fn, inputs):
+    """입력 하나당 평균 할당 블록 수 / 바이트 (결과는 유지해서 캐시에 들고 있는 상황을 재현)."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [fn(*args) for args in inputs]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats)
+    size = sum(s.size_diff for s in stats)
+    return kept, blocks / len(inputs), size / len(inputs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="차트 표현별 메모리 비교")
+    parser.add_argument("--n", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    engine = SajuEngine()
+    inputs = corpus(args.n)
+    engine.calculate(*inputs[0])  # 테이블 로딩을 측정에서 제외
+
+    dicts, d_blocks, d_bytes = measure_allocations(lambda *a: engine.calculate(*a, "사용자"), inputs)
+    charts, c_blocks, c_bytes = measure_allocations(engine.calculate_chart, inputs)
+
+    results = {
+        "n": args.n,
+        "dict": {
+            "alloc_blocks_per_chart": d_blocks,
+            "alloc_bytes_per_chart": d_bytes,
+            "memory_bytes_per_chart": sum(deep_sizeof(d) for d in dicts) / args.n,
+            "disk_bytes_per_chart": sum(len(json.dumps(d, ensure_ascii=False).encode()) for d in dicts) / args.n,
+        },
+        "chart": {
+            "alloc_blocks_per_chart": c_blocks,
+            "alloc_bytes_per_chart": c_bytes,
+            "memory_bytes_per_chart": sum(deep_sizeof(c) for c in charts) / args.n,
+            "disk_bytes_per_chart": 8,  # pack() 은 63비트 정수 (SQLite INTEGER 최대 8바이트)
+        },
+    }
+    for label in ("dict", "chart"):
+        r = results[label]
+        print(f"{label:<6} alloc {r['alloc_blocks_per_chart']:7.1f} blocks / {r['alloc_bytes_per_chart']:8.0f} B   "
+              f"cached {r['memory_bytes_per_chart']:8.0f} B (memory)  {r['disk_bytes_per_chart']:6.0f} B (disk)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+엔진 전용 경로의 콜드 스타트 측정
+
+새 파이썬 프로세스에서 (1) import saju, (2) 첫 calculate 호출까지의 시간과
+프로세스 전체 실행 시간을 여러 번 재어 중앙값을 출력합니다.
+비교용으로 streamlit import 시간도 함께 잽니다.
+
+    python bench/coldstart.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = r"""
+import sys, time, json
+t0 = time.perf_counter()
+{import_stmt}
+t1 = time.perf_counter()
+{call_stmt}
+t2 = time.perf_counter()
+print(json.dumps({{"import_ms": (t1 - t0) * 1e3, "first_call_ms": (t2 - t1) * 1e3,
+                  "loaded": sorted(m for m in ("streamlit", "ephem", "korean_lunar_calendar", "numpy") if m in sys.modules)}}))
+"""
+
+SCENARIOS = {
+    "saju (import only)": ("import saju", "pass"),
+    "saju + first calculate": ("from saju import SajuEngine", "SajuEngine().calculate(1990, 5, 5, 12, 0, '남성')"),
+    "streamlit (import only)": ("import streamlit", "pass"),
+}
+
+
+def measure(import_stmt, call_stmt, repeat):
+    code = _PROBE.format(import_stmt=import_stmt, call_stmt=call_stmt)
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        wall_ms = (time.perf_counter() - started) * 1e3
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        data["process_ms"] = wall_ms
+        runs.append(data)
+    return {
+        "import_ms": statistics.median(r["import_ms"] for r in runs),
+        "first_call_ms": statistics.median(r["first_call_ms"] for r in runs),
+        "process_ms": statistics.median(r["process_ms"] for r in runs),
+        "loaded": runs[-1]["loaded"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="엔진 콜드 스타트 측정")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    for label, (imp, call) in SCENARIOS.items():
+        r = measure(imp, call, args.repeat)
+        print(f"{label:<26} import {r['import_ms']:8.1f}ms  first call {r['first_call_ms']:7.1f}ms  "
+              f"process {r['process_ms']:8.1f}ms  loaded={','.join(r['loaded']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
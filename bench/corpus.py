@@ -0,0 +1,134 @@
+"""
+벤치마크 / 회귀 검사용 고정 입력 묶음 생성
+
+bench/corpus/*.csv 는 saju.batch 입력 형식(name, year, month, day, hour, minute,
+gender, calendar)이며 저장소에 함께 커밋합니다. 테이블이나 엔진이 바뀌어도
+입력은 그대로 두어야 이전 결과와 비교할 수 있으므로, 이 스크립트는
+입력 묶음을 새로 정할 때만 다시 실행합니다.
+
+  random        1900~2100 균등 임의 일시
+  jeolgi_edges  절기 경계 시각(KST 분 단위) 직전/당일/직후 분 — 월주·년주·대운수 경계
+  jasi          子時 경계 23:29 / 23:30 / 23:59 / 00:00 / 00:30 / 01:29 / 01:30
+  lunar_leap    윤달이 있는 해의 윤달 1일/15일/말일과 같은 달 평달 (음력 입력)
+  fallback      절기 테이블 범위 밖 연도 (ephem 직접 계산 경로)
+
+    python bench/corpus.py
+"""
+import argparse
+import csv
+import datetime
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from saju import lunar, solar_terms  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+FIELDS = ["name", "year", "month", "day", "hour", "minute", "gender", "calendar"]
+GENDERS = ("남성", "여성")
+JASI_TIMES = ((23, 29), (23, 30), (23, 59), (0, 0), (0, 30), (1, 29), (1, 30))
+
+
+def _row(i, year, month, day, hour, minute, calendar="양력"):
+    return {"name": f"bench{i}", "year": year, "month": month, "day": day, "hour": hour,
+            "minute": minute, "gender": GENDERS[i % 2], "calendar": calendar}
+
+
+def random_rows(n=2000, seed=0):
+    rng = random.Random(seed)
+    start = datetime.datetime(1900, 1, 1)
+    span = (datetime.datetime(2100, 12, 31) - start).days * 1440
+    for i in range(n):
+        d = start + datetime.timedelta(minutes=rng.randrange(span))
+        yield _row(i, d.year, d.month, d.day, d.hour, d.minute)
+
+
+def jeolgi_edge_rows(step=17):
+    """두 프레임(월주용 겉보기 / 대운용 J2000)의 경계를 step 개마다 골라 앞뒤 1분씩."""
+    table = solar_terms.get_table()
+    i = 0
+    for frame in solar_terms.FRAMES:
+        bounds = table.bounds[frame]
+        for k in range(1 + frame * (step // 2), table.count - 1, step):
+            kst = solar_terms.from_seconds(bounds[k]) + datetime.timedelta(hours=9)
+            kst = kst.replace(second=0, microsecond=0)
+            for delta in (-1, 0, 1):
+                d = kst + datetime.timedelta(minutes=delta)
+                if not 1900 <= d.year <= 2100: continue
+                yield _row(i, d.year, d.month, d.day, d.hour, d.minute)
+                i += 1
+
+
+def jasi_rows(days=60, seed=1):
+    rng = random.Random(seed)
+    start = datetime.date(1900, 1, 1)
+    span = (datetime.date(2100, 12, 31) - start).days
+    i = 0
+    for _ in range(days):
+        d = start + datetime.timedelta(days=rng.randrange(span))
+        for hour, minute in JASI_TIMES:
+            yield _row(i, d.year, d.month, d.day, hour, minute)
+            i += 1
+
+
+def lunar_leap_rows():
+    table = lunar.get_table()
+    i = 0
+    for year in range(table.first_year, table.last_year + 1):
+        _, bits, leap_month = table.record(year)
+        if not leap_month: continue
+        length = 30 if bits >> leap_month & 1 else 29
+        for day in (1, 15, length):
+            for calendar in ("음력(윤달)", "음력(평달)"):
+                if year * 10000 + leap_month * 100 + day > table.lunar_max: continue
+                yield _row(i, year, leap_month, day, 12, 0, calendar)
+                i += 1
+
+
+def fallback_rows():
+    i = 0
+    for year in (1850, 1875, 1899, 2101, 2125, 2150):
+        for month, day in ((2, 4), (8, 15)):
+            yield _row(i, year, month, day, 12, 0)
+            i += 1
+
+
+CORPORA = {
+    "random": random_rows,
+    "jeolgi_edges": jeolgi_edge_rows,
+    "jasi": jasi_rows,
+    "lunar_leap": lunar_leap_rows,
+    "fallback": fallback_rows,
+}
+
+
+def corpus_path(name):
+    return os.path.join(CORPUS_DIR, f"{name}.csv")
+
+
+def load(name):
+    """저장된 입력 묶음 → 레코드(dict) 목록 (saju.batch.iter_records 와 같은 형식)."""
+    with open(corpus_path(name), encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크 입력 묶음 생성")
+    parser.add_argument("names", nargs="*", default=list(CORPORA), help="생성할 묶음 (기본: 전체)")
+    args = parser.parse_args(argv)
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for name in args.names:
+        rows = list(CORPORA[name]())
+        with open(corpus_path(name), "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"{name:<13} {len(rows):6d}건 → {os.path.relpath(corpus_path(name), ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+HTTP 서비스(saju.server) 부하 생성기
+
+고정 입력 묶음(bench/corpus)을 keep-alive 연결 N 개로 쉬지 않고 보내며,
+동시 연결 수마다 처리량(건/초)과 지연 분위수(p50/p90/p99/p99.9, ms),
+상태 코드별 개수, 서버가 잰 마이크로 배치 평균 크기를 표로 출력합니다.
+
+    python -m saju.server --port 8080 --workers 4 &
+    python bench/loadgen.py --url http://127.0.0.1:8080 --concurrency 1,16,64,256
+    python bench/loadgen.py --spawn --server-args "--workers 2" -o loadgen.json
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import corpus  # noqa: E402
+
+ENDPOINTS = ("chart", "daewoon", "report")
+
+
+# ==========================================
+# 1. 최소 HTTP 클라이언트 (keep-alive)
+# ==========================================
+class Connection:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, path):
+        """GET path → (상태 코드, 본문 바이트). 연결이 끊겼으면 한 번 다시 연결합니다."""
+        for attempt in (0, 1):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1"))
+                head = await self.reader.readuntil(b"\r\n\r\n")
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.close()
+                if attempt: raise
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {k.strip().lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+        body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close": self.close()
+        return status, body
+
+    def close(self):
+        if self.writer is not None: self.writer.close()
+        self.reader = self.writer = None
+
+
+def request_paths(endpoint, records):
+    return [f"/v1/{endpoint}?" + urlencode({k: v for k, v in rec.items() if v not in ("", None)}) for rec in records]
+
+
+# ==========================================
+# 2. 부하 구간
+# ==========================================
+async def run_level(host, port, paths, concurrency, total):
+    """동시 연결 concurrency 개로 total 건을 보내고 (경과 초, 지연 ns 목록, 상태별 개수)."""
+    latencies, statuses = [], collections.Counter()
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        conn = Connection(host, port)
+        try:
+            while next_index < total:
+                path = paths[next_index % len(paths)]
+                next_index += 1
+                started = time.perf_counter_ns()
+                try:
+                    status, _ = await conn.request(path)
+                except (OSError, asyncio.IncompleteReadError):
+                    status = "error"
+                    conn.close()
+                latencies.append(time.perf_counter_ns() - started)
+                statuses[status] += 1
+        finally:
+            conn.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+def percentile(sorted_values, q):
+    if not sorted_values: return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def scrape(host, port):
+    """/metrics 에서 마이크로 배치 카운터를 읽습니다 (없으면 빈 dict)."""
+    conn = Connection(host, port)
+    try:
+        status, body = await conn.request("/metrics")
+    except OSError:
+        return {}
+    finally:
+        conn.close()
+    out = {}
+    if status != 200: return out
+    for line in body.decode("utf-8").splitlines():
+        for name in ("saju_microbatches_total", "saju_microbatch_items_total"):
+            if line.startswith(name + " "): out[name] = float(line.split()[1])
+    return out
+
+
+async def run(host, port, paths, levels, requests_per_level, warmup):
+    rows = []
+    await run_level(host, port, paths, min(levels), warmup)
+    for concurrency in levels:
+        before = await scrape(host, port)
+        elapsed, latencies, statuses = await run_level(host, port, paths, concurrency, requests_per_level)
+        after = await scrape(host, port)
+        latencies.sort()
+        batches = after.get("saju_microbatches_total", 0) - before.get("saju_microbatches_total", 0)
+        items = after.get("saju_microbatch_items_total", 0) - before.get("saju_microbatch_items_total", 0)
+        rows.append({
+            "concurrency": concurrency, "requests": len(latencies),
+            "throughput_rps": len(latencies) / elapsed,
+            **{f"p{label}_ms": percentile(latencies, q) / 1e6
+               for label, q in (("50", 0.5), ("90", 0.9), ("99", 0.99), ("99.9", 0.999))},
+            "max_ms": latencies[-1] / 1e6 if latencies else 0.0,
+            "status": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+            "avg_batch": items / batches if batches else None,
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'동시':>6} {'건/초':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8} {'배치':>6}  상태")
+    for r in rows:
+        batch = f"{r['avg_batch']:.1f}" if r["avg_batch"] else "-"
+        status = " ".join(f"{k}:{v}" for k, v in r["status"].items())
+        print(f"{r['concurrency']:>6} {r['throughput_rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p90_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['p99.9_ms']:>8.2f} {r['max_ms']:>8.2f} {batch:>6}  {status}")
+
+
+# ==========================================
+# 3. 실행
+# ==========================================
+def spawn_server(server_args):
+    """빈 포트로 python -m saju.server 를 띄우고 (프로세스, host, port) 를 돌려줍니다."""
+    cmd = [sys.executable, "-m", "saju.server", "--port", "0", *server_args.split()]
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(BENCH_DIR), stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise SystemExit(f"서버를 띄우지 못했습니다: {line!r}")
+    address = urlsplit(line.split()[2])
+    return proc, address.hostname, address.port
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="saju.server 부하 생성 (처리량 / 꼬리 지연)")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--spawn", action="store_true", help="빈 포트로 서버를 직접 띄워서 측정")
+    parser.add_argument("--server-args", default="", help="--spawn 때 서버에 넘길 인자 (예: \"--workers 4\")")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="chart")
+    parser.add_argument("--corpus", default="random", choices=sorted(corpus.CORPORA))
+    parser.add_argument("--concurrency", default="1,8,32,128,512", help="쉼표로 구분한 동시 연결 수")
+    parser.add_argument("--requests", type=int, default=5000, help="구간마다 보낼 요청 수")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("-o", "--output", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        proc, host, port = spawn_server(args.server_args)
+    else:
+        address = urlsplit(args.url)
+        host, port = address.hostname, address.port or 80
+    levels = [int(c) for c in args.concurrency.split(",")]
+    paths = request_paths(args.endpoint, corpus.load(args.corpus))
+    try:
+        rows = asyncio.run(run(host, port, paths, levels, args.requests, args.warmup))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"endpoint": args.endpoint, "corpus": args.corpus, "server_args": args.server_args,
+                       "levels": rows}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+엔진 성능 / 회귀 검사 묶음 (오프라인)
+
+bench/corpus/*.csv 고정 입력으로 다음을 재어 JSON 한 파일로 남기고,
+저장된 기준값(bench/baseline.json)과 비교해 허용 범위를 넘으면 종료 코드 1 을 돌려줍니다.
+
+  latency.*   calculate / get_daewoon_data / generate_detailed_report 단건 지연 p50·p99 (µs)
+  ephem.*     차트 한 건당 ephem 태양 위치 계산 횟수
+  batch.*     saju.batch.run_batch 처리량 (건/초, 단일 프로세스 / 프로세스 풀)
+  cache.*     ChartCache 실패·메모리 적중·디스크 적중 경로 지연 (µs)과 항목당 메모리 (바이트)
+  digest.*    calculate 결과 전체의 sha256 — 계산 결과가 한 글자라도 바뀌면 실패
+
+지연/처리량은 기계에 따라 다르므로 기준값은 비교할 기계에서 --update-baseline 으로 만듭니다.
+
+    python bench/suite.py -o /tmp/bench_results.json
+    python bench/suite.py --quick --no-compare
+    python bench/suite.py --update-baseline
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import corpus  # noqa: E402
+from saju import lunar  # noqa: E402
+from saju.batch import run_batch  # noqa: E402
+from saju.cache import ChartCache  # noqa: E402
+from saju.engine import SajuEngine  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")  # .gitignore 에 있음
+SUITE_VERSION = 1
+
+# 지표 이름 앞부분 → (좋은 방향, 허용 한도)
+#   lower : 값이 기준 x 한도 를 넘으면 실패      higher : 기준 / 한도 보다 작으면 실패
+#   exact : 기준과 달라지면 실패 (한도 무시)
+THRESHOLDS = (
+    ("latency.", "lower", 1.5),
+    ("cache.latency.", "lower", 1.5),
+    ("cache.bytes_", "lower", 1.1),
+    ("batch.", "higher", 1.5),
+    ("ephem.", "lower", 1.0),
+    ("digest.", "exact", None),
+)
+
+
+# ==========================================
+# 1. 입력 / 측정 도구
+# ==========================================
+def solar_inputs(records):
+    """batch 레코드 → calculate 인자 튜플 (음력은 양력으로 변환, 존재하지 않는 날짜는 제외)."""
+    out = []
+    for rec in records:
+        year, month, day = int(rec["year"]), int(rec["month"]), int(rec["day"])
+        if rec["calendar"].startswith("음력"):
+            try:
+                d = lunar.to_solar(year, month, day, "윤달" in rec["calendar"])
+            except lunar.InvalidLunarDate: continue
+            year, month, day = d.year, d.month, d.day
+        out.append((year, month, day, int(rec["hour"]), int(rec["minute"]), rec["gender"]))
+    return out
+
+
+def percentiles(samples_ns):
+    samples = sorted(samples_ns)
+    if len(samples) < 2: return {"p50_us": samples[0] / 1e3, "p99_us": samples[0] / 1e3}
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_us": q[49] / 1e3, "p99_us": q[98] / 1e3}
+
+
+def time_calls(fn, args_list, repeat):
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for args in args_list:
+            t0 = clock()
+            fn(*args)
+            samples.append(clock() - t0)
+    return percentiles(samples)
+
+
+@contextmanager
+def count_ephem():
+    """ephem.Sun 을 세는 하위 클래스로 바꿔 compute() 호출 수를 셉니다."""
+    import ephem
+    original = ephem.Sun
+    counter = {"compute": 0}
+
+    class CountingSun(original):
+        def compute(self, *args, **kwargs):
+            counter["compute"] += 1
+            return super().compute(*args, **kwargs)
+
+    ephem.Sun = CountingSun
+    try:
+        yield counter
+    finally:
+        ephem.Sun = original
+
+
+def result_digest(engine, inputs):
+    h = hashlib.sha256()
+    for args in inputs:
+        h.update(json.dumps(engine.calculate(*args), ensure_ascii=False, sort_keys=True).encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+# ==========================================
+# 2. 측정 항목
+# ==========================================
+def bench_latency(engine, inputs, repeat):
+    metrics = {}
+    for name, args_list in inputs.items():
+        r = repeat if name != "fallback" else 1
+        for k, v in time_calls(engine.calculate, args_list, r).items():
+            metrics[f"latency.calculate.{name}.{k}"] = v
+
+        daewoon_args = []
+        for args in args_list:
+            chart = engine.calculate_chart(*args)
+            daewoon_args.append((datetime.datetime(*args[:5]), chart.direction))
+        for k, v in time_calls(engine.get_daewoon_data, daewoon_args, r).items():
+            metrics[f"latency.get_daewoon_data.{name}.{k}"] = v
+
+    report_args = [(i % 10, "사용자") for i in range(1000)]
+    for k, v in time_calls(engine.generate_detailed_report, report_args, repeat).items():
+        metrics[f"latency.generate_detailed_report.{k}"] = v
+    return metrics
+
+
+def bench_ephem(engine, inputs):
+    metrics = {}
+    for name, args_list in inputs.items():
+        with count_ephem() as counter:
+            for args in args_list:
+                engine.calculate(*args)
+        metrics[f"ephem.calls_per_chart.{name}"] = counter["compute"] / len(args_list)
+    return metrics
+
+
+def bench_batch(records, workers, min_records):
+    rows = list(records)
+    while len(rows) < min_records: rows += records
+    metrics = {}
+    for label, w in (("inprocess", 0), ("pool", workers)):
+        started = time.perf_counter()
+        count = sum(1 for _ in run_batch(enumerate(rows, 2), workers=w))
+        metrics[f"batch.{label}.charts_per_sec"] = count / (time.perf_counter() - started)
+    return metrics
+
+
+def bench_cache(inputs):
+    metrics = {}
+    clock = time.perf_counter_ns
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "charts.sqlite3")
+        cache = ChartCache(path=path, max_entries=len(inputs) + 1)
+        for label in ("miss", "memory_hit"):
+            samples = []
+            for args in inputs:
+                t0 = clock()
+                cache.get_chart(*args)
+                samples.append(clock() - t0)
+            for k, v in percentiles(samples).items():
+                metrics[f"cache.latency.{label}.{k}"] = v
+
+        disk = ChartCache(path=path, max_entries=len(inputs) + 1)
+        samples = []
+        for args in inputs:
+            t0 = clock()
+            disk.get_chart(*args)
+            samples.append(clock() - t0)
+        for k, v in percentiles(samples).items():
+            metrics[f"cache.latency.disk_hit.{k}"] = v
+
+        stats = disk.stats()
+        metrics["cache.disk_hit_ratio"] = stats["disk_hits"] / len(inputs)
+        metrics["cache.bytes_per_disk_entry"] = os.path.getsize(path) / max(stats.get("disk_entries", 1), 1)
+        cache._conn.close()
+        disk._conn.close()
+
+    # 메모리 1단에 들고 있는 항목당 바이트 (키 문자열 + Chart + LRU 노드)
+    memory_only = ChartCache(path=None, max_entries=len(inputs) + 1)
+    memory_only.get_chart(*inputs[0])
+    memory_only.clear()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for args in inputs:
+        memory_only.get_chart(*args)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    metrics["cache.bytes_per_memory_entry"] = size / len(inputs)
+    return metrics
+
+
+def run_suite(quick=False, workers=None):
+    records = {name: corpus.load(name) for name in corpus.CORPORA}
+    inputs = {name: solar_inputs(recs) for name, recs in records.items()}
+    if quick:
+        inputs = {name: args[:200] for name, args in inputs.items()}
+    engine = SajuEngine()
+    engine.calculate(*inputs["random"][0])  # 테이블 로딩을 측정에서 제외
+
+    repeat = 1 if quick else 3
+    workers = workers or min(4, os.cpu_count() or 1)
+    all_records = [rec for name, recs in records.items() if name != "fallback" for rec in recs]
+
+    metrics = {}
+    metrics.update(bench_latency(engine, inputs, repeat))
+    metrics.update(bench_ephem(engine, inputs))
+    metrics.update(bench_batch(all_records, workers, 2000 if quick else 20000))
+    metrics.update(bench_cache(inputs["random"]))
+    for name, args_list in inputs.items():
+        metrics[f"digest.{name}"] = result_digest(engine, args_list)
+
+    return {
+        "suite_version": SUITE_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpu_count": os.cpu_count(), "batch_workers": workers},
+        "quick": quick,
+        "corpus_sizes": {name: len(args) for name, args in inputs.items()},
+        "metrics": {k: round(v, 3) if isinstance(v, float) else v for k, v in sorted(metrics.items())},
+    }
+
+
+# ==========================================
+# 3. 기준값 비교
+# ==========================================
+def _rule(metric):
+    for prefix, direction, limit in THRESHOLDS:
+        if metric.startswith(prefix): return direction, limit
+    return None, None
+
+
+def compare(results, baseline, scale=1.0):
+    """기준값과 비교해 (지표, 기준, 현재, 판정) 목록을 돌려줍니다. 판정은 ok / REGRESSION / new / missing."""
+    rows = []
+    current, base = results["metrics"], baseline["metrics"]
+    for metric in sorted(set(current) | set(base)):
+        if metric not in base:
+            rows.append((metric, None, current[metric], "new"))
+            continue
+        if metric not in current:
+            rows.append((metric, base[metric], None, "missing"))
+            continue
+        old, new = base[metric], current[metric]
+        direction, limit = _rule(metric)
+        if direction == "exact": bad = old != new
+        elif direction == "lower": bad = new > old * (1 + (limit - 1) * scale) + 1e-9
+        elif direction == "higher": bad = new < old / (1 + (limit - 1) * scale) - 1e-9
+        else: bad = False
+        rows.append((metric, old, new, "REGRESSION" if bad else "ok"))
+    return rows
+
+
+def _fmt(value):
+    if value is None: return "-"
+    if isinstance(value, str): return value[:12]
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="엔진 성능 / 회귀 검사")
+    parser.add_argument("-o", "--output", default=RESULTS_PATH, help="결과 JSON 경로 (기본: bench/results.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--compare-only", metavar="RESULTS", help="측정 없이 저장된 결과 파일만 비교")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--no-compare", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="입력 묶음별 200건, 반복 1회")
+    parser.add_argument("--workers", type=int, default=None, help="batch 프로세스 풀 크기 (기본: min(4, CPU 수))")
+    parser.add_argument("--tolerance-scale", type=float, default=1.0, help="허용 한도 배율 (시끄러운 기계에서 2 등)")
+    args = parser.parse_args(argv)
+
+    if args.compare_only:
+        with open(args.compare_only, encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        started = time.perf_counter()
+        results = run_suite(args.quick, args.workers)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"{len(results['metrics'])}개 지표 → {args.output} ({time.perf_counter() - started:.1f}초)")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준값 저장 → {args.baseline}")
+        return 0
+    if args.no_compare: return 0
+    if not os.path.exists(args.baseline):
+        print(f"기준값 파일이 없습니다: {args.baseline} (--update-baseline 으로 생성)")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("quick") != results.get("quick"):
+        print("주의: 기준값과 측정 모드(--quick)가 다릅니다.")
+    rows = compare(results, baseline, args.tolerance_scale)
+    for metric, old, new, verdict in rows:
+        if verdict == "ok" and not metric.startswith(("latency.calculate.random", "batch.", "ephem.")): continue
+        print(f"{verdict:<10} {metric:<52} {_fmt(old):>14} → {_fmt(new):>14}")
+    failed = [r for r in rows if r[3] == "REGRESSION"]
+    print(f"{len(rows)}개 지표 중 회귀 {len(failed)}개")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
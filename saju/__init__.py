@@ -0,0 +1,34 @@
+"""
+청은(靑隱) 사주 엔진 라이브러리
+
+    from saju import SajuEngine
+    SajuEngine().calculate(1990, 1, 1, 12, 0, "남성", "홍길동")
+
+하위 모듈
+  - saju.engine      : SajuEngine (단건 계산)
+  - saju.tables      : 천간/지지/십신/12운성 상수와 조회 테이블
+  - saju.chart       : 압축 차트(Chart)와 표시용 dict 변환
+  - saju.reports     : 연간 리포트 데이터 (연도, 일간별 컴파일 파일)
+  - saju.render      : 화면용 HTML 조각 캐시
+  - saju.almanac     : 세운 / 월운 / 일진 달력 생성기와 CSV·iCal 내보내기
+  - saju.solar_terms : 절기 경계 테이블
+  - saju.lunar       : 음력 ↔ 양력 변환 테이블
+  - saju.vector      : NumPy 벡터화 계산 (numpy 필요)
+  - saju.reverse     : 네 기둥 → 출생 시각 구간 역색인 (numpy 필요)
+  - saju.compat      : 궁합 점수 벡터화 (일대다 / 다대다 상위 k, numpy 필요)
+  - saju.batch       : CSV/NDJSON 대량 계산 CLI
+  - saju.analytics   : 출생 시각 전수 통계 (멀티프로세스 map/reduce, 체크포인트, numpy 필요)
+  - saju.server      : asyncio HTTP JSON 서비스 (마이크로 배치, 과부하 거절)
+  - saju.cache       : 메모리 LRU + SQLite 차트 캐시
+  - saju.pool        : UI 공용 계산 풀 (같은 입력 합치기, 시간 초과)
+  - saju.metrics     : 단계별 시간 / 카운터 계측 (Prometheus 텍스트)
+"""
+__all__ = ["SajuEngine", "lunar_to_solar"]
+
+
+def __getattr__(name):
+    # import saju 자체는 가볍게 두고, 엔진은 처음 접근할 때 불러옵니다.
+    if name in __all__:
+        from . import engine
+        return getattr(engine, name)
+    raise AttributeError(f"module 'saju' has no attribute {name!r}")
@@ -0,0 +1,278 @@
+"""
+세운(歲運) / 월운(月運) / 일진(日辰) 달력
+
+차트 하나의 일간·일지를 기준으로 해·달·날의 간지와 십신, 12운성, 신살을
+제너레이터로 하나씩 내보냅니다. 해/달 경계는 solar_terms 테이블의 입춘·절 경계
+(엔진 월주 판정과 같은 분 단위 시각)를 쓰고, 일진은 일주 계산(1900-01-01 = 甲戌 기준
+날짜 차)을 하루씩 이어 갑니다. 어떤 범위를 요청해도 한 번에 한 항목만 만들기 때문에
+CSV / iCal 로 바로 흘려 쓰면 100년 치 일진도 메모리를 거의 쓰지 않습니다.
+
+    from saju.almanac import calendar, write_ical
+    chart = SajuEngine().calculate_chart(1990, 1, 1, 12, 0, "남성")
+    for e in calendar(chart, datetime.date(2026, 1, 1), datetime.date(2027, 1, 1), kinds=("월운",)):
+        print(e.start, e.ganji, e.sibsin, e.unseong)
+
+    python -m saju.almanac --birth 1990-01-01T12:00 --gender 남성 --from 2026-01-01 --to 2126-01-01 --format ics -o out.ics
+    python -m saju.almanac --input customers.csv --from 2026-01-01 --to 2027-01-01 --kinds 일진 -o days.csv
+"""
+import collections
+import csv
+import datetime
+import heapq
+import math
+import sys
+
+from . import solar_terms
+from .tables import (CHEON, JI, MONTH_START_MAP, SIBSIN_CHEON, SIBSIN_JI, UNSEONG,
+                     SHINSAL_JI_BITS, GWIN_BITS, SHINSAL_TEXT)
+
+SEUN, WOLUN, ILJIN = KINDS = ("세운", "월운", "일진")
+_KIND_ORDER = {k: i for i, k in enumerate(KINDS)}
+_KIND_CODES = {SEUN: "year", WOLUN: "month", ILJIN: "day"}
+
+IPCHUN = 21   # 입춘 절기 번호 (황경 315°)
+SOHAN = 19    # 소한 — 1월에 시작하는 丑월, 전년도 세운에 속함
+_DAY_EPOCH = datetime.date(1900, 1, 1)
+_KST = datetime.timedelta(hours=9)
+
+CSV_FIELDS = ["name", "kind", "start", "end", "ganji", "sibsin", "ji_sibsin", "unseong", "shinsal"]
+
+
+class Entry(collections.namedtuple("Entry", "kind start end gan ji sibsin ji_sibsin unseong shinsal")):
+    """달력 항목. start/end 는 한국 표준시 datetime (end 는 포함하지 않음)."""
+    __slots__ = ()
+
+    @property
+    def ganji(self):
+        return f"{CHEON[self.gan]}{JI[self.ji]}"
+
+
+def _entry(kind, chart, start, end, gan, ji):
+    dg, dj = chart.day_gan, chart.day_ji
+    return Entry(kind, start, end, gan, ji, SIBSIN_CHEON[dg][gan], SIBSIN_JI[dg][ji], UNSEONG[dg][ji],
+                 SHINSAL_TEXT[SHINSAL_JI_BITS[dj][ji] | GWIN_BITS[dg][ji]])
+
+
+def _as_datetime(value):
+    if isinstance(value, datetime.datetime): return value
+    return datetime.datetime(value.year, value.month, value.day)
+
+
+# ==========================================
+# 1. 절기 경계
+# ==========================================
+def _boundary_kst(seconds):
+    """절기 경계(UTC 초) → 엔진이 새 절기로 판정하는 첫 분 (한국 표준시)."""
+    return solar_terms.EPOCH + datetime.timedelta(minutes=math.ceil(seconds / 60.0)) + _KST
+
+
+def _term_segments(start, end, terms):
+    """[start, end) 와 겹치는 (시작, 끝, 절기 번호) 구간. terms 에 든 절기 경계에서만 자릅니다."""
+    # 입춘처럼 1년에 한 번인 경계도 start 앞의 것을 잡도록 1년 남짓 앞에서 시작
+    bounds = solar_terms.iter_boundaries(start - _KST - datetime.timedelta(days=370))
+    previous = None
+    for seconds, term in bounds:
+        if term not in terms: continue
+        boundary = _boundary_kst(seconds)
+        if previous is not None and boundary > start:
+            yield previous[0], boundary, previous[1]
+        if boundary >= end: return
+        previous = (boundary, term)
+
+
+# ==========================================
+# 2. 생성기
+# ==========================================
+def years(chart, start, end):
+    """세운: 입춘 ~ 다음 입춘."""
+    start, end = _as_datetime(start), _as_datetime(end)
+    for seg_start, seg_end, _ in _term_segments(start, end, (IPCHUN,)):
+        year = seg_start.year
+        yield _entry(SEUN, chart, seg_start, seg_end, (year - 4) % 10, (year - 4) % 12)
+
+
+_JEOL = tuple(range(1, 24, 2))  # 월이 바뀌는 절 (홀수 절기 번호)
+
+
+def months(chart, start, end):
+    """월운: 절 ~ 다음 절. 월간은 년상기월 (해당 세운의 년간 기준)."""
+    start, end = _as_datetime(start), _as_datetime(end)
+    for seg_start, seg_end, term in _term_segments(start, end, _JEOL):
+        year = seg_start.year - (1 if term == SOHAN else 0)
+        month_idx = ((term + 3) // 2) % 12
+        gan = (MONTH_START_MAP[(year - 4) % 10 % 5] + month_idx) % 10
+        yield _entry(WOLUN, chart, seg_start, seg_end, gan, (month_idx + 2) % 12)
+
+
+def days(chart, start, end):
+    """일진: 00:00 ~ 다음 날 00:00."""
+    day = _as_datetime(start).date()
+    last = _as_datetime(end)
+    diff = (day - _DAY_EPOCH).days
+    gan, ji = (diff + 10) % 10, (diff + 10) % 12
+    one = datetime.timedelta(days=1)
+    current = datetime.datetime(day.year, day.month, day.day)
+    while current < last:
+        following = current + one
+        yield _entry(ILJIN, chart, current, following, gan, ji)
+        current, gan, ji = following, (gan + 1) % 10, (ji + 1) % 12
+
+
+_GENERATORS = {SEUN: years, WOLUN: months, ILJIN: days}
+
+
+def calendar(chart, start, end, kinds=KINDS):
+    """kinds 항목을 시작 시각 순서(같으면 세운 → 월운 → 일진)로 합쳐 내보냅니다."""
+    streams = [_GENERATORS[k](chart, start, end) for k in kinds]
+    if len(streams) == 1: return streams[0]
+    return heapq.merge(*streams, key=lambda e: (e.start, _KIND_ORDER[e.kind]))
+
+
+# ==========================================
+# 3. 내보내기 (한 항목씩 바로 씀)
+# ==========================================
+def write_csv(entries, stream, name="", header=True):
+    """CSV 로 씁니다. 여러 사람을 한 파일에 이어 쓸 때는 두 번째부터 header=False. 건수를 반환."""
+    writer = csv.writer(stream)
+    if header: writer.writerow(CSV_FIELDS)
+    count = 0
+    for e in entries:
+        writer.writerow([name, e.kind, e.start.isoformat(timespec="minutes"), e.end.isoformat(timespec="minutes"),
+                         e.ganji, e.sibsin, e.ji_sibsin, e.unseong, e.shinsal])
+        count += 1
+    return count
+
+
+_VTIMEZONE = [
+    "BEGIN:VTIMEZONE", "TZID:Asia/Seoul",
+    "BEGIN:STANDARD", "DTSTART:19700101T000000", "TZOFFSETFROM:+0900", "TZOFFSETTO:+0900", "TZNAME:KST",
+    "END:STANDARD", "END:VTIMEZONE",
+]
+
+
+def _ical_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line):
+    """RFC 5545: 한 줄 75 바이트 이하, 이어지는 줄은 공백으로 시작 (UTF-8 글자 중간에서 자르지 않음)."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75: return line + "\r\n"
+    parts, current, size = [], [], 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > (75 if not parts else 74):
+            parts.append("".join(current))
+            current, size = [], 0
+        current.append(ch)
+        size += n
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ical_event(e, name, uid_prefix, dtstamp):
+    summary = f"{e.kind} {e.ganji} ({e.sibsin}·{e.unseong})"
+    if e.shinsal != "-": summary += f" {e.shinsal}"
+    description = f"{name}님 일간 기준 천간 {e.sibsin}, 지지 {e.ji_sibsin}, 12운성 {e.unseong}, 신살 {e.shinsal}"
+    if e.kind == ILJIN:
+        when = [f"DTSTART;VALUE=DATE:{e.start:%Y%m%d}", f"DTEND;VALUE=DATE:{e.end:%Y%m%d}"]
+    else:
+        when = [f"DTSTART;TZID=Asia/Seoul:{e.start:%Y%m%dT%H%M%S}", f"DTEND;TZID=Asia/Seoul:{e.end:%Y%m%dT%H%M%S}"]
+    lines = ["BEGIN:VEVENT", f"UID:{uid_prefix}-{_KIND_CODES[e.kind]}-{e.start:%Y%m%dT%H%M}@saju",
+             f"DTSTAMP:{dtstamp}", *when, f"SUMMARY:{_ical_text(summary)}",
+             f"DESCRIPTION:{_ical_text(description)}", "TRANSP:TRANSPARENT", "END:VEVENT"]
+    return "".join(_fold(line) for line in lines)
+
+
+def write_ical(entries, stream, chart, name="사용자", dtstamp=None):
+    """iCalendar(.ics) 로 씁니다. stream 은 newline='' 로 연 텍스트 스트림. 건수를 반환."""
+    dtstamp = (dtstamp or datetime.datetime.now(datetime.timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    uid_prefix = f"{chart.year:04d}{chart.month:02d}{chart.day:02d}{chart.hour:02d}{chart.minute:02d}{'M' if chart.is_man else 'F'}"
+    head = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Cheongeun Institute//Saju Almanac//KO",
+            "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{_ical_text(name)} 운세 달력", *_VTIMEZONE]
+    stream.write("".join(_fold(line) for line in head))
+    count = 0
+    for e in entries:
+        stream.write(_ical_event(e, name, uid_prefix, dtstamp))
+        count += 1
+    stream.write("END:VCALENDAR\r\n")
+    return count
+
+
+# ==========================================
+# 4. 실행
+# ==========================================
+def main(argv=None):
+    import argparse
+    import os
+    import time
+    from .batch import RecordError, iter_records, parse_record, _detect_format
+    from .engine import SajuEngine
+
+    parser = argparse.ArgumentParser(description="세운/월운/일진 달력 내보내기")
+    who = parser.add_mutually_exclusive_group(required=True)
+    who.add_argument("--birth", help="양력 출생 일시 (YYYY-MM-DDTHH:MM)")
+    who.add_argument("--input", help="saju.batch 형식 CSV/NDJSON 명단 ('-' 는 표준입력)")
+    parser.add_argument("--gender", default="남성")
+    parser.add_argument("--name", default="사용자")
+    parser.add_argument("--from", dest="start", required=True, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", required=True, help="종료일 (YYYY-MM-DD, 포함하지 않음)")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="쉼표로 구분 (세운,월운,일진)")
+    parser.add_argument("--format", choices=["csv", "ics"], default="csv")
+    parser.add_argument("-o", "--output", default="-", help="출력 경로 ('-' 는 표준출력, --input 과 ics 는 디렉터리)")
+    args = parser.parse_args(argv)
+
+    start = datetime.date.fromisoformat(args.start)
+    end = datetime.date.fromisoformat(args.end)
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    engine = SajuEngine()
+
+    fin = None
+    if args.birth:
+        birth = datetime.datetime.fromisoformat(args.birth)
+        people = [(args.name, (birth.year, birth.month, birth.day, birth.hour, birth.minute, args.gender))]
+    else:
+        fin = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+        records = enumerate(iter_records(fin, _detect_format(args.input, None)))
+        people = (((rec.get("name") if isinstance(rec, dict) else None) or f"row{i}", rec) for i, (_, rec) in records)
+
+    started = time.perf_counter()
+    total = users = 0
+    out = None
+    if args.format == "csv":
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    elif args.input:
+        os.makedirs(args.output, exist_ok=True)
+    try:
+        for name, birth in people:
+            if isinstance(birth, RecordError):
+                print(f"{name}: {birth}", file=sys.stderr)
+                continue
+            if isinstance(birth, dict):
+                try: birth = parse_record(birth)
+                except RecordError as e:
+                    print(f"{name}: {e}", file=sys.stderr)
+                    continue
+            chart = engine.calculate_chart(*birth)
+            if chart is None:
+                print(f"{name}: 잘못된 날짜/시간", file=sys.stderr)
+                continue
+            entries = calendar(chart, start, end, kinds)
+            if args.format == "csv":
+                total += write_csv(entries, out, name, header=users == 0)
+            else:
+                path = os.path.join(args.output, f"{users:05d}.ics") if args.input else args.output
+                target = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+                try: total += write_ical(entries, target, chart, name)
+                finally:
+                    if target is not sys.stdout: target.close()
+            users += 1
+    finally:
+        if out is not None and out is not sys.stdout: out.close()
+        if fin is not None and fin is not sys.stdin: fin.close()
+    print(f"{users}명, {total}개 항목 ({time.perf_counter() - started:.1f}초)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+"""
+출생 시각 전수 통계 (연구용 분석 모드)
+
+시작~끝 구간의 모든 분(또는 --step 분 간격)을 출생 시각으로 보고 다음 분포를 셉니다.
+
+  day_gan / day_pillar   일간(10) / 일주(60갑자) 빈도
+  special                기둥별(년·월·일·시) 백호 / 괴강 (check_baekho, check_goemigwan)
+  special_any            네 기둥 중 하나라도 백호 / 괴강인 차트
+  shinsal                기둥별 도화 / 역마 / 화개 / 천을귀인 (get_shinsal)
+  shinsal_any            네 기둥 중 하나라도 해당 신살이 있는 차트
+  daewoon                성별(여/남)별 대운수 (0 = 절기 탐색 실패, 화면에는 1 로 표시)
+
+구간은 달 단위 작업으로 나눠 프로세스 풀에서 saju.vector 로 계산하고(map),
+각 작업의 히스토그램을 공유 메모리의 합계 배열에 더합니다(reduce). 합계와 완료한
+작업 목록은 주기적으로 체크포인트 파일에 저장하므로, 중단(Ctrl+C 포함)된 실행은
+같은 명령을 다시 실행하면 남은 달만 계산합니다.
+
+가중치: --weights 로 출생아 수 CSV 를 주면 각 시각에 가중치를 줍니다. 열은
+year[,month[,day[,hour]]] 와 births 이며, 한 행의 출생아 수는 그 기간에 속한 시각들에
+고르게 나눕니다 (표에 없는 기간의 시각은 가중치 0). 대운수 분포는 가중치(없으면 1)에
+--male-ratio(기본 0.5)를 곱해 성별로 나눕니다.
+
+결과는 히스토그램별 배열을 담은 .npz 이며, --columns 를 주면 시각별 열(네 기둥 60갑자,
+성별 대운수, 특수살·신살 비트, 가중치)을 달마다 압축 .npz 로 함께 씁니다.
+
+    python -m saju.analytics -o stats.npz --from 1900-01-01 --to 2100-12-31 --step 1 --workers 8
+    python -m saju.analytics -o stats.npz --step 60 --weights births_by_month.csv --columns cols/
+    python -m saju.analytics --show stats.npz
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import vector
+from .chart import DAEWOON_FAILED
+from .tables import (CHEON, GANJI_NAMES, PILLAR_TITLES, SHINSAL_BIT_NAMES, BAEKHO_TEXT, GOEGANG_TEXT,
+                     SHINSAL_JI_BITS, GWIN_BITS)
+
+FORMAT_VERSION = 1
+EPOCH = datetime.datetime(1900, 1, 1)  # 분 번호 0 (한국 표준시)
+DAEWOON_BINS = 64  # Chart.pack 의 대운수 6비트와 같은 범위
+GENDERS = ("여성", "남성")
+SPECIAL_NAMES = ("백호", "괴강")
+SHINSAL_NAMES = tuple(name for _, name in SHINSAL_BIT_NAMES)
+
+# 히스토그램 이름 → 모양. 공유 메모리에는 이 순서로 이어 붙인 float64 배열 하나로 둡니다.
+LAYOUT = (
+    ("total", ()),
+    ("day_gan", (10,)),
+    ("day_pillar", (60,)),
+    ("special", (4, 2)),
+    ("special_any", (2,)),
+    ("shinsal", (4, 4)),
+    ("shinsal_any", (4,)),
+    ("daewoon", (2, DAEWOON_BINS)),
+)
+_OFFSETS = {}
+_n = 0
+for _name, _shape in LAYOUT:
+    _size = int(np.prod(_shape, dtype=np.int64))
+    _OFFSETS[_name] = (_n, _n + _size, _shape)
+    _n += _size
+HIST_SIZE = _n
+
+# 시각별 특수살·신살 비트: 기둥 i 마다 6비트 (백호 1, 괴강 2, 도화 4, 역마 8, 화개 16, 천을귀인 32)
+_PILLAR_BITS = 6
+_SPECIAL_CODE = np.array([[(1 if BAEKHO_TEXT[g][j] else 0) | (2 if GOEGANG_TEXT[g][j] else 0) for j in range(12)]
+                          for g in range(10)], dtype=np.uint32)
+_SHINSAL_JI = np.array(SHINSAL_JI_BITS, dtype=np.uint32)
+_GWIN = np.array(GWIN_BITS, dtype=np.uint32)
+
+
+def minute_of(dt):
+    return int((dt - EPOCH).total_seconds() // 60)
+
+
+def split_hist(flat):
+    """공유 메모리의 1차원 합계 → {이름: 배열}."""
+    return {name: flat[a:b].reshape(shape) for name, (a, b, shape) in _OFFSETS.items()}
+
+
+# ==========================================
+# 1. 작업 분할 / 가중치
+# ==========================================
+def month_chunks(start, end):
+    """[start, end) 분 구간 → 달 경계로 자른 (이름, 시작 분, 끝 분) 목록."""
+    chunks = []
+    first = EPOCH + datetime.timedelta(minutes=start)
+    y, m = first.year, first.month
+    while True:
+        a = max(start, minute_of(datetime.datetime(y, m, 1)))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        b = min(end, minute_of(datetime.datetime(y, m, 1)))
+        if a >= end: break
+        chunks.append((f"{(EPOCH + datetime.timedelta(minutes=a)):%Y%m}", a, b))
+        if b >= end: break
+    return chunks
+
+
+def first_point(a, start, step):
+    """a 이후 첫 start + k*step 시각 (k >= 0)."""
+    return start + max(0, -(-(a - start) // step)) * step
+
+
+def points_between(a, b, start, step):
+    """[a, b) 안에 있는 start + k*step 시각 수."""
+    first = first_point(a, start, step)
+    return 0 if first >= b else (b - 1 - first) // step + 1
+
+
+def load_weights(path, start, end, step):
+    """
+    출생아 수 CSV → (구간 시작 분, 구간 끝 분, 시각당 가중치) 배열 세 개.
+    열: year[,month[,day[,hour]]], births (없는 하위 열은 그 상위 기간 전체).
+    """
+    rows = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for rec in csv.DictReader(f):
+            year = int(rec["year"])
+            month, day, hour = (int(rec[k]) if rec.get(k) not in (None, "") else None for k in ("month", "day", "hour"))
+            if month is None: a, b = datetime.datetime(year, 1, 1), datetime.datetime(year + 1, 1, 1)
+            elif day is None:
+                a = datetime.datetime(year, month, 1)
+                b = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+            elif hour is None:
+                a = datetime.datetime(year, month, day)
+                b = a + datetime.timedelta(days=1)
+            else:
+                a = datetime.datetime(year, month, day, hour)
+                b = a + datetime.timedelta(hours=1)
+            a, b = minute_of(a), minute_of(b)
+            n = points_between(max(a, start), min(b, end), start, step)
+            if n: rows.append((a, b, float(rec["births"]) / n))
+    rows.sort()
+    for (_, b0, _), (a1, _, _) in zip(rows, rows[1:]):
+        if a1 < b0: raise ValueError(f"가중치 표의 기간이 겹칩니다: {path}")
+    if not rows: raise ValueError(f"가중치 표에 구간과 겹치는 행이 없습니다: {path}")
+    starts, ends, per_point = zip(*rows)
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64), np.array(per_point, dtype=np.float64)
+
+
+def _point_weights(minutes, weights):
+    starts, ends, per_point = weights
+    i = np.clip(np.searchsorted(starts, minutes, side="right") - 1, 0, None)
+    inside = (minutes >= starts[i]) & (minutes < ends[i])
+    return np.where(inside, per_point[i], 0.0)
+
+
+# ==========================================
+# 2. 계산 (map)
+# ==========================================
+def compute_points(minutes):
+    """분 번호 배열 → 시각별 열 dict (네 기둥 60갑자, 성별 대운수, 특수살·신살 비트)."""
+    kst = vector._EPOCH_MIN + minutes.astype("timedelta64[m]")
+    p = vector.pillar_arrays(kst)
+    gans = (p["year_gan"], p["month_gan"], p["day_gan"], p["time_gan"])
+    jis = (p["year_ji"], p["month_ji"], p["day_ji"], p["time_ji"])
+    out = {f"{key}_pillar": ((6 * g - 5 * j) % 60).astype(np.uint8)
+           for key, g, j in zip(("year", "month", "day", "hour"), gans, jis)}
+
+    flags = np.zeros(minutes.shape, dtype=np.uint32)
+    day_gan, day_ji = p["day_gan"], p["day_ji"]
+    for i, (g, j) in enumerate(zip(gans, jis)):
+        bits = _SPECIAL_CODE[g, j] | (_SHINSAL_JI[day_ji, j] | _GWIN[day_gan, j]) << 2
+        flags |= bits << (_PILLAR_BITS * i)
+    out["flags"] = flags
+
+    utc_seconds = ((minutes - vector._KST_OFFSET_MIN) * 60).astype(np.float64)
+    man_direction = np.where(p["year_gan"] % 2 == 0, 1, -1)
+    for gender, direction in (("f", -man_direction), ("m", man_direction)):
+        hours = vector.boundary_hours_array(utc_seconds, direction)
+        num = np.where(hours < 0, DAEWOON_FAILED, vector.daewoon_num_array(hours))
+        out[f"daewoon_{gender}"] = np.minimum(num, DAEWOON_BINS - 1).astype(np.uint8)
+    return out
+
+
+def histogram(cols, weight, male_ratio):
+    """시각별 열 → LAYOUT 순서의 1차원 합계 배열."""
+    flat = np.zeros(HIST_SIZE, dtype=np.float64)
+    h = split_hist(flat)
+    h["total"][...] = weight.sum()
+    day = cols["day_pillar"]
+    h["day_pillar"][:] = np.bincount(day, weight, 60)
+    h["day_gan"][:] = h["day_pillar"].reshape(6, 10).sum(axis=0)  # 60갑자 k 의 천간 = k % 10
+    flags = cols["flags"]
+    any_bits = np.zeros(flags.shape, dtype=np.uint32)
+    for i in range(4):
+        bits = flags >> (_PILLAR_BITS * i) & 63
+        any_bits |= bits
+        for b in range(2): h["special"][i, b] = weight[(bits >> b & 1).astype(bool)].sum()
+        for b in range(4): h["shinsal"][i, b] = weight[(bits >> (b + 2) & 1).astype(bool)].sum()
+    for b in range(2): h["special_any"][b] = weight[(any_bits >> b & 1).astype(bool)].sum()
+    for b in range(4): h["shinsal_any"][b] = weight[(any_bits >> (b + 2) & 1).astype(bool)].sum()
+    h["daewoon"][0] = np.bincount(cols["daewoon_f"], weight * (1.0 - male_ratio), DAEWOON_BINS)
+    h["daewoon"][1] = np.bincount(cols["daewoon_m"], weight * male_ratio, DAEWOON_BINS)
+    return flat
+
+
+# 작업 프로세스 상태 (_init_worker 가 채움)
+_STATE = {}
+
+
+def _init_worker(shm_name, n_chunks, lock, stop, config, weights):
+    # Ctrl+C 는 주 프로세스가 받아 stop 으로 알립니다. 작업자는 하던 달을 끝까지 더하고 멈춥니다.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _STATE.update(shm=shm, lock=lock, stop=stop, config=config, weights=weights,
+                  hist=np.ndarray((HIST_SIZE,), dtype=np.float64, buffer=shm.buf),
+                  done=np.ndarray((n_chunks,), dtype=np.uint8, buffer=shm.buf, offset=HIST_SIZE * 8))
+
+
+def _run_chunk(task):
+    index, name, a, b = task
+    if _STATE["stop"].is_set(): return index, 0
+    config = _STATE["config"]
+    step = config["step"]
+    first = first_point(a, config["start"], step)
+    minutes = np.arange(first, b, step, dtype=np.int64)
+    cols = compute_points(minutes)
+    weights = _STATE["weights"]
+    weight = np.ones(minutes.shape) if weights is None else _point_weights(minutes, weights)
+    if config["columns"]:
+        if weights is not None: cols["weight"] = weight.astype(np.float32)
+        path = os.path.join(config["columns"], f"chunk_{name}.npz")
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp, start=np.int64(first), step=np.int64(step), **cols)
+        os.replace(tmp, path)
+    flat = histogram(cols, weight, config["male_ratio"])
+    # 합계와 완료 표시를 한 잠금 안에서 바꿔 체크포인트가 항상 같은 시점을 보게 합니다.
+    with _STATE["lock"]:
+        _STATE["hist"] += flat
+        _STATE["done"][index] = 1
+    return index, len(minutes)
+
+
+# ==========================================
+# 3. 실행 / 체크포인트 (reduce)
+# ==========================================
+def _config_digest(config, weights_path):
+    key = dict(config, columns=bool(config["columns"]), version=FORMAT_VERSION)
+    if weights_path:
+        with open(weights_path, "rb") as f:
+            key["weights"] = hashlib.sha256(f.read()).hexdigest()
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def _snapshot(lock, hist, done):
+    with lock:
+        return hist.copy(), done.copy()
+
+
+def _save(path, hist, done, digest, names):
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, hist=hist, done=done, digest=np.array(digest), names=np.array(names))
+    os.replace(tmp, path)
+
+
+def write_output(path, hist, meta):
+    """히스토그램별 배열 + meta(JSON 문자열)를 .npz 로 씁니다."""
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp, meta=np.array(json.dumps(meta, ensure_ascii=False)), **split_hist(hist))
+    os.replace(tmp, path)
+
+
+def run(start, end, step=1, workers=None, weights_path=None, male_ratio=0.5, columns=None,
+        checkpoint=None, checkpoint_every=30.0, progress=None):
+    """
+    [start, end) 분 구간 전수 통계. 1차원 합계 배열과 완료 여부를 돌려줍니다.
+    checkpoint 경로에 같은 설정의 체크포인트가 있으면 이어서 계산합니다.
+    중단되면 체크포인트를 저장한 뒤 KeyboardInterrupt 를 다시 올립니다.
+    """
+    config = {"start": start, "end": end, "step": step, "male_ratio": male_ratio, "columns": columns}
+    digest = _config_digest(config, weights_path)
+    weights = load_weights(weights_path, start, end, step) if weights_path else None
+    chunks = month_chunks(start, end)
+    names = [name for name, _, _ in chunks]
+    if columns: os.makedirs(columns, exist_ok=True)
+
+    shm = shared_memory.SharedMemory(create=True, size=HIST_SIZE * 8 + len(chunks))
+    try:
+        hist = np.ndarray((HIST_SIZE,), dtype=np.float64, buffer=shm.buf)
+        done = np.ndarray((len(chunks),), dtype=np.uint8, buffer=shm.buf, offset=HIST_SIZE * 8)
+        hist[:] = 0
+        done[:] = 0
+        if checkpoint and os.path.exists(checkpoint):
+            with np.load(checkpoint) as saved:
+                if str(saved["digest"]) != digest:
+                    raise ValueError(f"체크포인트 설정이 다릅니다 (--fresh 로 새로 시작): {checkpoint}")
+                hist[:] = saved["hist"]
+                done[:] = saved["done"]
+
+        ctx = multiprocessing.get_context()
+        lock, stop = ctx.Lock(), ctx.Event()
+        tasks = [(k, name, a, b) for k, (name, a, b) in enumerate(chunks) if not done[k]]
+        workers = workers or os.cpu_count() or 1
+        last_save = time.monotonic()
+        finished = len(chunks) - len(tasks)
+        pool = ctx.Pool(workers, initializer=_init_worker,
+                        initargs=(shm.name, len(chunks), lock, stop, config, weights))
+        try:
+            for _, n in pool.imap_unordered(_run_chunk, tasks):
+                finished += 1
+                if progress: progress(finished, len(chunks), n)
+                if checkpoint and time.monotonic() - last_save >= checkpoint_every:
+                    _save(checkpoint, *_snapshot(lock, hist, done), digest, names)
+                    last_save = time.monotonic()
+        except KeyboardInterrupt:
+            # 남은 작업은 건너뛰게 하고, 계산 중인 달은 마저 더한 뒤 저장합니다.
+            stop.set()
+            pool.close()
+            pool.join()
+            if checkpoint: _save(checkpoint, *_snapshot(lock, hist, done), digest, names)
+            raise
+        except BaseException:
+            pool.terminate()
+            pool.join()
+            raise
+        pool.close()
+        pool.join()
+        result = _snapshot(lock, hist, done)
+        if checkpoint: _save(checkpoint, *result, digest, names)
+        return result
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# ==========================================
+# 4. 요약 출력
+# ==========================================
+def _pct(value, total):
+    return f"{value:>14,.0f} {100.0 * value / total if total else 0.0:6.2f}%"
+
+
+def summarize(h, out=sys.stdout):
+    total = float(h["total"])
+    print(f"전체 {total:,.0f}", file=out)
+    print("\n[일간]", file=out)
+    for g in range(10): print(f"  {CHEON[g]}  {_pct(h['day_gan'][g], total)}", file=out)
+    print("\n[백호 / 괴강] 기둥별 · 하나라도", file=out)
+    for b, name in enumerate(SPECIAL_NAMES):
+        cells = "  ".join(f"{PILLAR_TITLES[i]} {100.0 * h['special'][i, b] / total if total else 0:5.2f}%" for i in range(4))
+        print(f"  {name}  {cells}  | {_pct(h['special_any'][b], total)}", file=out)
+    print("\n[신살] 기둥별 · 하나라도", file=out)
+    for b, name in enumerate(SHINSAL_NAMES):
+        cells = "  ".join(f"{PILLAR_TITLES[i]} {100.0 * h['shinsal'][i, b] / total if total else 0:5.2f}%" for i in range(4))
+        print(f"  {name:<4}  {cells}  | {_pct(h['shinsal_any'][b], total)}", file=out)
+    print("\n[대운수] 여성 / 남성", file=out)
+    for num in range(DAEWOON_BINS):
+        f, m = h["daewoon"][0, num], h["daewoon"][1, num]
+        if f or m:
+            label = "실패" if num == DAEWOON_FAILED else f"{num:>4}"
+            print(f"  {label}  {_pct(f, h['daewoon'][0].sum())}  {_pct(m, h['daewoon'][1].sum())}", file=out)
+    top = np.argsort(h["day_pillar"])[::-1][:5]
+    print("\n[일주 상위 5] " + ", ".join(f"{GANJI_NAMES[k]} {h['day_pillar'][k]:,.0f}" for k in top), file=out)
+
+
+def load_output(path):
+    with np.load(path) as f:
+        return {name: f[name] for name, _ in LAYOUT}, json.loads(str(f["meta"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="출생 시각 전수 통계 (일간 / 백호·괴강 / 신살 / 대운수)")
+    parser.add_argument("-o", "--output", default="saju_stats.npz", help="히스토그램 .npz 경로")
+    parser.add_argument("--from", dest="start", default="1900-01-01", help="시작 (YYYY-MM-DD[THH:MM], 포함)")
+    parser.add_argument("--to", dest="end", default="2100-12-31", help="끝 날짜 (YYYY-MM-DD 는 그날 끝까지 포함)")
+    parser.add_argument("--step", type=int, default=60, help="시각 간격 (분, 1 = 매분, 60 = 매시 정각)")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--weights", help="출생아 수 CSV (year[,month[,day[,hour]]],births)")
+    parser.add_argument("--male-ratio", type=float, default=0.5, help="대운수 분포의 남성 비율 (가중치와 곱함)")
+    parser.add_argument("--columns", help="시각별 열을 달마다 .npz 로 쓸 디렉터리")
+    parser.add_argument("--checkpoint", help="체크포인트 경로 (기본: <출력>.ckpt.npz)")
+    parser.add_argument("--checkpoint-every", type=float, default=30.0, help="체크포인트 저장 간격 (초)")
+    parser.add_argument("--fresh", action="store_true", help="기존 체크포인트를 지우고 처음부터")
+    parser.add_argument("--show", metavar="NPZ", help="계산 없이 저장된 결과만 요약 출력")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        h, meta = load_output(args.show)
+        print(json.dumps(meta, ensure_ascii=False))
+        summarize(h)
+        return 0
+
+    start_dt = datetime.datetime.fromisoformat(args.start)
+    end_dt = datetime.datetime.fromisoformat(args.end)
+    if "T" not in args.end and " " not in args.end: end_dt += datetime.timedelta(days=1)
+    start, end = minute_of(start_dt), minute_of(end_dt)
+    if start < 0 or end <= start: parser.error("구간이 올바르지 않습니다 (1900-01-01 이후, 시작 < 끝)")
+    if args.step < 1: parser.error("--step 은 1 이상")
+    checkpoint = args.checkpoint or f"{args.output}.ckpt.npz"
+    if args.fresh and os.path.exists(checkpoint): os.remove(checkpoint)
+
+    started = time.perf_counter()
+    points = [0]
+
+    def progress(finished, total, n):
+        points[0] += n
+        elapsed = time.perf_counter() - started
+        print(f"\r{finished}/{total}개월, {points[0]:,}개 시각, {points[0] / max(elapsed, 1e-9):,.0f}개/초",
+              end="", file=sys.stderr, flush=True)
+
+    # python -m 으로 실행하면 이 파일은 __main__ 이므로, 작업 프로세스가 쓰는
+    # saju.analytics 의 함수로 실행합니다.
+    from .analytics import run as run_stats
+    try:
+        hist, done = run_stats(start, end, args.step, args.workers, args.weights, args.male_ratio, args.columns,
+                         checkpoint, args.checkpoint_every, progress)
+    except KeyboardInterrupt:
+        print(f"\n중단됨. 체크포인트 저장: {checkpoint} (같은 명령으로 이어서 실행)", file=sys.stderr)
+        return 130
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    meta = {"version": FORMAT_VERSION, "from": start_dt.isoformat(), "to": end_dt.isoformat(), "step": args.step,
+            "weights": args.weights, "male_ratio": args.male_ratio, "months": int(done.sum()),
+            "genders": GENDERS, "special": SPECIAL_NAMES, "shinsal": SHINSAL_NAMES, "pillars": PILLAR_TITLES}
+    write_output(args.output, hist, meta)
+    os.remove(checkpoint)
+    summarize(split_hist(hist))
+    print(f"\n저장: {args.output} ({time.perf_counter() - started:.1f}초)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
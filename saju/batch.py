@@ -0,0 +1,224 @@
+"""
+대량 사주 계산 (헤드리스 배치)
+
+CSV/NDJSON 출생 정보를 한 줄씩 읽어 프로세스 풀에서 청크 단위로
+SajuEngine.calculate 를 실행하고, 결과를 입력 순서대로 바로 써 냅니다.
+동시에 처리 중인 청크 수를 (작업자 수 x 2)로 제한하므로 입력 크기와
+관계없이 메모리 사용량이 일정합니다.
+
+입력 필드: name, year, month, day, hour, minute, gender(남성/여성),
+          calendar(양력 / 음력(평달) / 음력(윤달), 생략 시 양력)
+읽을 수 없는 줄이나 계산할 수 없는 레코드는 작업을 멈추지 않고 error 필드와
+입력 줄 번호(line)를 담은 행으로 내보냅니다.
+
+    python -m saju.batch customers.csv -o charts.ndjson --workers 8 --chunk-size 500
+    cat customers.ndjson | python -m saju.batch - --input-format ndjson -o - --output-format csv
+"""
+import argparse
+import collections
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import lunar
+from .engine import SajuEngine
+
+GENDER_ALIASES = {"남성": "남성", "남": "남성", "m": "남성", "male": "남성",
+                  "여성": "여성", "여": "여성", "f": "여성", "female": "여성"}
+CALENDAR_ALIASES = {"": "양력", "양력": "양력", "solar": "양력",
+                    "음력": "음력(평달)", "음력(평달)": "음력(평달)", "lunar": "음력(평달)",
+                    "음력(윤달)": "음력(윤달)", "lunar_leap": "음력(윤달)"}
+TITLE_KEYS = {"년주": "year_pillar", "월주": "month_pillar", "일주": "day_pillar", "시주": "hour_pillar"}
+CSV_FIELDS = ["name", "year", "month", "day", "hour", "minute", "gender", "calendar",
+              "solar_date", "year_pillar", "month_pillar", "day_pillar", "hour_pillar",
+              "gongmang", "daewoon_dir", "daewoon", "line", "error"]
+# 계산할 수 있는 양력 연도 (앞뒤 절기가 datetime 범위 안에 있어야 함)
+MIN_YEAR, MAX_YEAR = 2, 9998
+
+
+# ==========================================
+# 1. 입력 / 출력 스트림
+# ==========================================
+def _detect_format(path, fmt):
+    if fmt: return fmt
+    ext = os.path.splitext(path)[1].lower()
+    return "csv" if ext == ".csv" else "ndjson"
+
+
+def iter_records(stream, fmt):
+    """
+    입력 스트림에서 (입력 줄 번호, 레코드 dict) 를 하나씩 꺼냅니다.
+    JSON 으로 읽을 수 없거나 객체가 아닌 줄은 레코드 자리에 RecordError 를 넣습니다.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for rec in reader:
+            yield reader.line_num, rec
+    else:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line: continue
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                rec = RecordError(f"JSON 오류: {e}")
+            else:
+                if not isinstance(rec, dict): rec = RecordError(f"레코드는 JSON 객체여야 합니다: {type(rec).__name__}")
+            yield number, rec
+
+
+def iter_chunks(records, size):
+    chunk = []
+    for rec in records:
+        chunk.append(rec)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+
+def _flatten(out):
+    row = {k: out.get(k, "") for k in CSV_FIELDS}
+    result = out.get("result")
+    if result:
+        for p in result["pillars"]:
+            row[TITLE_KEYS[p["title"]]] = p["ganji"]
+        row["gongmang"] = result["gongmang"]
+        row["daewoon_dir"] = result["daewoon"]["dir"]
+        row["daewoon"] = " ".join(d.replace("**", "").replace("<br>", ":") for d in result["daewoon"]["list"])
+    return row
+
+
+def write_results(results, stream, fmt):
+    """결과를 한 건씩 바로 씁니다. 처리 건수를 반환."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for out in results:
+            writer.writerow(_flatten(out))
+            count += 1
+    else:
+        for out in results:
+            stream.write(json.dumps(out, ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+    return count
+
+
+# ==========================================
+# 2. 레코드 계산 (작업 프로세스)
+# ==========================================
+_ENGINE = None
+
+
+def _init_worker():
+    global _ENGINE
+    _ENGINE = SajuEngine()
+
+
+class RecordError(ValueError):
+    pass
+
+
+def parse_record(rec):
+    """레코드 → 양력 (year, month, day, hour, minute, gender). 잘못된 입력은 RecordError."""
+    try:
+        year, month, day = int(rec["year"]), int(rec["month"]), int(rec["day"])
+        hour, minute = int(rec.get("hour") or 0), int(rec.get("minute") or 0)
+        gender = GENDER_ALIASES[str(rec.get("gender", "")).strip().lower()]
+        cal_type = CALENDAR_ALIASES[str(rec.get("calendar") or "").strip().lower()]
+    except (KeyError, TypeError, ValueError) as e:
+        raise RecordError(f"입력 오류: {e!r}") from e
+    if "음력" in cal_type:
+        try:
+            solar = lunar.to_solar(year, month, day, "윤달" in cal_type)
+        except lunar.InvalidLunarDate as e:
+            raise RecordError(f"존재하지 않는 음력 날짜 ({e})") from e
+        year, month, day = solar.year, solar.month, solar.day
+    if not MIN_YEAR <= year <= MAX_YEAR: raise RecordError(f"지원 범위 밖의 연도: {year}")
+    return year, month, day, hour, minute, gender
+
+
+def compute_record(engine, rec, line=None):
+    """레코드 한 건 → 출력 dict. 잘못된 입력은 error 필드와 입력 줄 번호(line)로 돌려줍니다."""
+    if not isinstance(rec, dict):
+        return {"line": line, "error": str(rec) if isinstance(rec, RecordError) else "레코드는 JSON 객체여야 합니다"}
+    out = dict(rec)
+    try:
+        year, month, day, hour, minute, gender = parse_record(rec)
+    except RecordError as e:
+        out["line"], out["error"] = line, str(e)
+        return out
+    out["solar_date"] = f"{year:04d}-{month:02d}-{day:02d}"
+    try:
+        result = engine.calculate(year, month, day, hour, minute, gender, rec.get("name") or "사용자")
+    except (OverflowError, ValueError) as e:
+        out["line"], out["error"] = line, f"계산 실패: {e}"
+        return out
+    if result is None: out["line"], out["error"] = line, "잘못된 날짜/시간"
+    else: out["result"] = result
+    return out
+
+
+def _run_chunk(chunk):
+    return [compute_record(_ENGINE, rec, line) for line, rec in chunk]
+
+
+def run_batch(records, workers=None, chunk_size=500):
+    """
+    (입력 줄 번호, 레코드) 이터러블(iter_records 의 결과)을 받아 결과를 입력 순서대로
+    하나씩 내보내는 제너레이터. workers=0 이면 현재 프로세스에서 순차 처리합니다.
+    """
+    if workers == 0:
+        engine = SajuEngine()
+        for line, rec in records:
+            yield compute_record(engine, rec, line)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for chunk in iter_chunks(records, chunk_size):
+            pending.append(pool.submit(_run_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# ==========================================
+# 3. 실행
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/NDJSON 대량 사주 계산")
+    parser.add_argument("input", help="입력 파일 경로 ('-' 는 표준입력)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 경로 ('-' 는 표준출력)")
+    parser.add_argument("--input-format", choices=["csv", "ndjson"])
+    parser.add_argument("--output-format", choices=["csv", "ndjson"])
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수, 0: 단일 프로세스)")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    in_fmt = _detect_format(args.input, args.input_format)
+    out_fmt = _detect_format(args.output, args.output_format)
+    fin = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    started = time.perf_counter()
+    try:
+        results = run_batch(iter_records(fin, in_fmt), args.workers, args.chunk_size)
+        count = write_results(results, fout, out_fmt)
+    finally:
+        if fin is not sys.stdin: fin.close()
+        if fout is not sys.stdout: fout.close()
+    elapsed = time.perf_counter() - started
+    print(f"{count}건 처리, {elapsed:.1f}초 ({count / max(elapsed, 1e-9):.0f}건/초)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+사주 차트 2단 캐시 (메모리 LRU + SQLite)
+
+키는 (양력 출생 일시, 성별) 뿐이며 이름은 포함하지 않습니다.
+값은 압축 Chart 이고, 이름과 표시 문자열은 꺼낼 때 with_name() 으로 입힙니다.
+
+  1단: 프로세스 메모리 LRU (Chart 객체, max_entries 개 제한)
+  2단: SQLite 파일 (WAL 모드, Chart.pack() 정수) — 여러 Streamlit/작업 프로세스가 함께 사용
+
+두 단계 모두 ttl 초가 지난 항목은 없는 것으로 보고, 디스크는
+max_disk_entries 를 넘으면 오래된 항목부터 지웁니다.
+
+    python -m saju.cache warm --from 1950-01-01 --to 2010-12-31 --times 12:00
+    python -m saju.cache stats
+"""
+import collections
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from . import metrics
+from .chart import Chart
+from .engine import SajuEngine
+
+CACHE_VERSION = 2  # 차트 형식/계산이 바뀌면 올려서 기존 항목을 무효화 (테이블 이름에 반영)
+DEFAULT_PATH = os.environ.get("SAJU_CACHE_DB", os.path.join(os.path.expanduser("~"), ".cache", "saju", "charts.sqlite3"))
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_DISK_ENTRIES = 500_000
+DEFAULT_TTL = 90 * 86400
+_PRUNE_EVERY = 1000
+
+_TABLE = f"charts_v{CACHE_VERSION}"
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {_TABLE} (
+    key TEXT PRIMARY KEY,
+    packed INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {_TABLE}_created ON {_TABLE} (created);
+"""
+
+
+def cache_key(year, month, day, hour, minute, gender):
+    return f"{year:04d}-{month:02d}-{day:02d}T{hour:02d}:{minute:02d}|{gender}"
+
+
+def with_name(chart, name, gender=None):
+    """캐시된 Chart → 이름을 입힌 표시용 dict (SajuEngine.calculate 와 같은 형식)."""
+    if chart is None: return None
+    return chart.to_dict(name, gender)
+
+
+class ChartCache:
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES, ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disk_failed = path is None
+        self._writes = 0
+        self._engine = SajuEngine()
+        self.counters = collections.Counter()
+
+    # ------------------------------------------
+    # 디스크(SQLite)
+    # ------------------------------------------
+    def _db(self):
+        if self._conn is None and not self._disk_failed:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            except (sqlite3.Error, OSError):
+                # 디스크를 쓸 수 없으면 메모리 캐시만으로 동작
+                self._disk_failed = True
+                self.counters["disk_errors"] += 1
+        return self._conn
+
+    def _disk_get(self, key, now):
+        db = self._db()
+        if db is None: return None
+        try:
+            row = db.execute(f"SELECT packed, created FROM {_TABLE} WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            self.counters["disk_errors"] += 1
+            return None
+        if row is None: return None
+        if now - row[1] > self.ttl:
+            self.counters["expired"] += 1
+            return None
+        return Chart.unpack(row[0])
+
+    def _disk_put_many(self, items, now):
+        db = self._db()
+        if db is None: return
+        rows = []
+        for key, chart in items:
+            try: rows.append((key, chart.pack(), now))
+            except ValueError: pass  # pack 범위 밖 연도는 메모리에만 보관
+        try:
+            db.execute("BEGIN")
+            db.executemany(f"INSERT OR REPLACE INTO {_TABLE} (key, packed, created) VALUES (?, ?, ?)", rows)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            if db.in_transaction: db.execute("ROLLBACK")
+            self.counters["disk_errors"] += 1
+            return
+        self._writes += len(items)
+        if self._writes >= _PRUNE_EVERY:
+            self._writes = 0
+            self.prune(now)
+
+    def prune(self, now=None):
+        """만료 항목과 max_disk_entries 초과분(오래된 순)을 지웁니다."""
+        db = self._db()
+        if db is None: return 0
+        now = time.time() if now is None else now
+        try:
+            removed = db.execute(f"DELETE FROM {_TABLE} WHERE created < ?", (now - self.ttl,)).rowcount
+            removed += db.execute(
+                f"DELETE FROM {_TABLE} WHERE key IN (SELECT key FROM {_TABLE} ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)).rowcount
+        except sqlite3.Error:
+            self.counters["disk_errors"] += 1
+            return 0
+        self.counters["disk_evictions"] += removed
+        return removed
+
+    # ------------------------------------------
+    # 메모리 LRU
+    # ------------------------------------------
+    def _memory_get(self, key, now):
+        entry = self._memory.get(key)
+        if entry is None: return None
+        chart, stored = entry
+        if now - stored > self.ttl:
+            del self._memory[key]
+            self.counters["expired"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return chart
+
+    def _memory_put(self, key, chart, now):
+        self._memory[key] = (chart, now)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def get(self, key):
+        """캐시된 Chart 또는 None. 적중/실패 카운터를 올립니다."""
+        now = time.time()
+        with self._lock:
+            chart = self._memory_get(key, now)
+            if chart is not None:
+                self.counters["memory_hits"] += 1
+                metrics.inc("cache_lookups", result="memory_hit")
+                return chart
+            chart = self._disk_get(key, now)
+            if chart is not None:
+                self.counters["disk_hits"] += 1
+                metrics.inc("cache_lookups", result="disk_hit")
+                self._memory_put(key, chart, now)
+                return chart
+            self.counters["misses"] += 1
+            metrics.inc("cache_lookups", result="miss")
+            return None
+
+    def peek(self, key):
+        """메모리에 있는 Chart 또는 None (디스크는 보지 않고 카운터도 올리지 않음)."""
+        with self._lock: return self._memory_get(key, time.time())
+
+    def put(self, key, chart):
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, chart, now)
+            self._disk_put_many([(key, chart)], now)
+
+    def get_chart(self, year, month, day, hour, minute, gender, name="사용자"):
+        """SajuEngine.calculate 와 같은 결과를 캐시를 거쳐 돌려줍니다. 잘못된 날짜면 None."""
+        try:
+            datetime.datetime(year, month, day, hour, minute)
+        except ValueError: return None
+        key = cache_key(year, month, day, hour, minute, gender)
+        chart = self.get(key)
+        if chart is None:
+            chart = self._engine.calculate_chart(year, month, day, hour, minute, gender)
+            self.put(key, chart)
+        return with_name(chart, name, gender)
+
+    def warm(self, births, batch_size=1000):
+        """(year, month, day, hour, minute, gender) 목록을 미리 계산해 디스크에 채웁니다. 새로 넣은 개수를 반환."""
+        added = 0
+        pending = []
+        for birth in births:
+            key = cache_key(*birth)
+            with self._lock:
+                if self._disk_get(key, time.time()) is not None: continue
+            chart = self._engine.calculate_chart(*birth)
+            if chart is None: continue
+            pending.append((key, chart))
+            if len(pending) >= batch_size:
+                with self._lock: self._disk_put_many(pending, time.time())
+                added += len(pending)
+                pending = []
+        if pending:
+            with self._lock: self._disk_put_many(pending, time.time())
+            added += len(pending)
+        return added
+
+    def stats(self):
+        with self._lock:
+            out = dict(self.counters)
+            out["memory_entries"] = len(self._memory)
+            db = self._db()
+            if db is not None:
+                try: out["disk_entries"] = db.execute(f"SELECT COUNT(*) FROM {_TABLE}").fetchone()[0]
+                except sqlite3.Error: pass
+        lookups = out.get("memory_hits", 0) + out.get("disk_hits", 0) + out.get("misses", 0)
+        out["hit_ratio"] = (lookups - out.get("misses", 0)) / lookups if lookups else 0.0
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            if db is not None: db.execute(f"DELETE FROM {_TABLE}")
+
+
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_cache():
+    """프로세스 전체에서 공유하는 캐시 인스턴스."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None: _DEFAULT = ChartCache()
+    return _DEFAULT
+
+
+# ==========================================
+# 워밍업 / 통계 도구
+# ==========================================
+def iter_common_births(start, end, times, genders):
+    day = start
+    while day <= end:
+        for t in times:
+            for g in genders:
+                yield day.year, day.month, day.day, t.hour, t.minute, g
+        day += datetime.timedelta(days=1)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="사주 차트 캐시 관리")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_warm = sub.add_parser("warm", help="자주 쓰는 생년월일을 미리 계산해 저장")
+    p_warm.add_argument("--from", dest="start", default="1950-01-01")
+    p_warm.add_argument("--to", dest="end", default="2010-12-31")
+    p_warm.add_argument("--times", default="12:00", help="쉼표로 구분한 시:분 목록 (UI 기본값 12:00)")
+    p_warm.add_argument("--genders", default="남성,여성")
+    sub.add_parser("stats", help="캐시 항목 수 출력")
+    sub.add_parser("prune", help="만료/초과 항목 삭제")
+    sub.add_parser("clear", help="모든 항목 삭제")
+    args = parser.parse_args(argv)
+
+    cache = ChartCache(path=args.path)
+    if args.cmd == "warm":
+        start = datetime.date.fromisoformat(args.start)
+        end = datetime.date.fromisoformat(args.end)
+        times = [datetime.time(*map(int, t.strip().split(":"))) for t in args.times.split(",")]
+        genders = [g.strip() for g in args.genders.split(",")]
+        started = time.perf_counter()
+        added = cache.warm(iter_common_births(start, end, times, genders))
+        print(f"{added}건 추가 ({time.perf_counter() - started:.1f}초)")
+    elif args.cmd == "prune":
+        print(f"{cache.prune()}건 삭제")
+    elif args.cmd == "clear":
+        cache.clear()
+    print(cache.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
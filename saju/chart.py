@@ -0,0 +1,125 @@
+"""
+압축 차트 표현
+
+Chart 는 입력 일시와 네 기둥의 천간/지지 인덱스, 대운수만 정수로 들고 있고,
+화면/리포트용 문자열은 to_dict() 를 호출할 때 조회 테이블에서 만들어 냅니다.
+pack() 은 같은 정보를 63비트 정수 하나로 줄여 캐시/DB 에 그대로 저장할 수 있게 합니다.
+
+비트 배치 (하위 비트부터)
+  분 6 | 시 5 | 일 5 | 월 4 | 년 12 | 남성 1 | 년주·월주·일주·시주 60갑자 6 x 4 | 대운수 6
+"""
+from . import metrics
+from .reports import build_report
+from .tables import (CHEON, JI, GANJI_INDEX, PILLAR_TITLES, SIBSIN_CHEON, UNSEONG,
+                     SHINSAL_JI_BITS, GWIN_BITS, SHINSAL_TEXT, SPECIAL_TEXT, GONGMANG)
+
+# 대운수 0 은 '절기 탐색 실패' (화면에는 1 로 표시)
+DAEWOON_FAILED = 0
+# 이전 형식의 리포트 키. 한 릴리스 동안 report 의 사본('year' 제외)을 함께 내보내고 다음 릴리스에서 뺍니다.
+LEGACY_REPORT_KEY = "report_2026"
+MAX_PACKED_YEAR = (1 << 12) - 1
+
+_FIELDS = ((0, 6), (6, 5), (11, 5), (16, 4), (20, 12), (32, 1))  # 분, 시, 일, 월, 년, 남성
+_GANJI_SHIFT = 33
+_DAEWOON_SHIFT = 57
+
+
+class Chart:
+    __slots__ = ("year", "month", "day", "hour", "minute", "is_man", "gans", "jis", "daewoon_num")
+
+    def __init__(self, year, month, day, hour, minute, is_man, gans, jis, daewoon_num):
+        self.year = year
+        self.month = month
+        self.day = day
+        self.hour = hour
+        self.minute = minute
+        self.is_man = is_man
+        self.gans = gans
+        self.jis = jis
+        self.daewoon_num = daewoon_num
+
+    def __eq__(self, other):
+        return isinstance(other, Chart) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, k) for k in self.__slots__))
+
+    def __repr__(self):
+        ganji = " ".join(f"{CHEON[g]}{JI[j]}" for g, j in zip(self.gans, self.jis))
+        return (f"Chart({self.year:04d}-{self.month:02d}-{self.day:02d} {self.hour:02d}:{self.minute:02d} "
+                f"{'남' if self.is_man else '여'}, {ganji}, 대운 {self.daewoon_num})")
+
+    @property
+    def day_gan(self):
+        return self.gans[2]
+
+    @property
+    def day_ji(self):
+        return self.jis[2]
+
+    @property
+    def direction(self):
+        """1 순행 / -1 역행 (양남음녀 순행)"""
+        return 1 if self.is_man == (self.gans[0] % 2 == 0) else -1
+
+    # ------------------------------------------
+    # 정수 압축
+    # ------------------------------------------
+    def pack(self):
+        if not 0 <= self.year <= MAX_PACKED_YEAR:
+            raise ValueError(f"pack 가능한 연도 범위를 벗어났습니다: {self.year}")
+        values = (self.minute, self.hour, self.day, self.month, self.year, int(self.is_man))
+        packed = 0
+        for (shift, _), v in zip(_FIELDS, values):
+            packed |= v << shift
+        for i in range(4):
+            packed |= GANJI_INDEX[self.gans[i]][self.jis[i]] << (_GANJI_SHIFT + 6 * i)
+        return packed | self.daewoon_num << _DAEWOON_SHIFT
+
+    @classmethod
+    def unpack(cls, packed):
+        minute, hour, day, month, year, is_man = ((packed >> shift) & ((1 << bits) - 1) for shift, bits in _FIELDS)
+        ganji = [(packed >> (_GANJI_SHIFT + 6 * i)) & 63 for i in range(4)]
+        return cls(year, month, day, hour, minute, bool(is_man),
+                   tuple(g % 10 for g in ganji), tuple(g % 12 for g in ganji), packed >> _DAEWOON_SHIFT)
+
+    # ------------------------------------------
+    # 표시용 dict (SajuEngine.calculate 결과와 같은 형식)
+    # ------------------------------------------
+    def pillars(self):
+        day_gan, day_ji = self.gans[2], self.jis[2]
+        sibsin_row, unseong_row = SIBSIN_CHEON[day_gan], UNSEONG[day_gan]
+        shinsal_row, gwin_row = SHINSAL_JI_BITS[day_ji], GWIN_BITS[day_gan]
+        out = []
+        for i in range(4):
+            g, j = self.gans[i], self.jis[i]
+            out.append({
+                "title": PILLAR_TITLES[i], "ganji": f"{CHEON[g]}{JI[j]}",
+                "sibsin": sibsin_row[g] if i != 2 else "본원", "unseong": unseong_row[j],
+                "shinsal": SHINSAL_TEXT[shinsal_row[j] | gwin_row[j]], "special": SPECIAL_TEXT[g][j]
+            })
+        return out
+
+    def daewoon_list(self):
+        direction = self.direction
+        start = 1 if self.daewoon_num == DAEWOON_FAILED else self.daewoon_num
+        month_gan, month_ji = self.gans[1], self.jis[1]
+        return [f"**{start + (i - 1) * 10}**<br>{CHEON[(month_gan + i * direction) % 10]}{JI[(month_ji + i * direction) % 12]}"
+                for i in range(1, 9)]
+
+    def to_dict(self, name="사용자", gender=None):
+        if gender is None: gender = "남성" if self.is_man else "여성"
+        timer = metrics.timer()
+        out = {
+            "pillars": self.pillars(), "gongmang": GONGMANG[self.gans[2]][self.jis[2]],
+            "daewoon": {"dir": "순행" if self.direction == 1 else "역행", "list": self.daewoon_list(),
+                        "debug": "절기 탐색 실패" if self.daewoon_num == DAEWOON_FAILED else ""},
+            "report": build_report(self.gans[2], name),
+            # 디버깅용: 정확히 어떤 날짜로 계산했는지 반환
+            "input_check": f"양력 {self.year}년 {self.month}월 {self.day}일 {self.hour}시 {self.minute}분 ({gender})"
+        }
+        legacy = dict(out["report"])
+        del legacy["year"]
+        out[LEGACY_REPORT_KEY] = legacy
+        if timer: timer.lap("report")
+        return out
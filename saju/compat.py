@@ -0,0 +1,334 @@
+"""
+궁합(宮合) 벡터화 엔진 (NumPy)
+
+차트마다 점수에 필요한 정수 특징만 뽑아 Roster 배열로 들고 있고,
+두 사람의 점수는 조회 테이블과 비트 연산으로 계산합니다.
+  - 일주 쌍 (60 x 60 표 한 번 조회)
+      천간 : 일간 오행 관계(C_DATA) — 천간합 / 상생 / 비화 / 상극
+      십신 : 서로의 일간을 상대 기준으로 본 십신 (양방향)
+      지지 : 일지 관계(J_DATA) — 육합 / 삼합 / 충 / 오행 상생·상극
+      귀인 : 상대 일지가 내 천을귀인 (양방향)
+  - 신살 : 네 기둥 신살(도화/역마/화개/천을귀인) 중 겹치는 종류 수
+  - 공망 : 상대 네 기둥 지지가 내 공망(get_gongmang)에 드는 개수 (양방향, 감점)
+총점 = 50 + 합계. 순위는 자르기 전 점수로 매기고(상위권 동점이 번호 순으로 갈리지 않도록),
+돌려주는 점수만 0~100 으로 자릅니다(display_score).
+
+일대다(score_one / top_k)는 명단 길이 N 배열 몇 개만 만들고,
+다대다(top_k_matrix / top_k_pairs)는 행을 block 단위로 나눠 block x M 점수표만
+메모리에 두면서 상위 k 개씩만 남깁니다.
+
+    from saju.compat import Roster, top_k
+    roster = Roster.from_packed(packed)          # ChartCache 의 packed 정수 배열 등
+    me = Roster.from_charts([engine.calculate_chart(1990, 1, 1, 12, 0, "남성")])
+    idx, scores = top_k(me, roster, k=20)
+
+    python -m saju.compat --roster 100000 --k 10
+"""
+import sys
+
+import numpy as np
+
+from .chart import _GANJI_SHIFT
+from .tables import (C_DATA, J_DATA, SIBSIN_NAMES, SIBSIN_CHEON_IDX, SHINSAL_GROUPS, SHINSAL_JI_BITS,
+                     GWIN_BITS, GONGMANG_JI, GANJI_INDEX, SHINSAL_TEXT, JI)
+
+BASE_SCORE = 50
+
+# 천간 (일간 대 일간)
+STEM_HAP = 20          # 천간합 (甲己, 乙庚, 丙辛, 丁壬, 戊癸)
+STEM_SAENG = 10        # 오행 상생 (어느 쪽이든)
+STEM_BIHWA = 5         # 같은 오행
+STEM_GEUK = -10        # 오행 상극 (어느 쪽이든)
+# 상대 일간이 내 기준 어떤 십신인가 (양방향 합산)
+SIBSIN_SCORE = {"비견": 0, "겁재": -3, "식신": 5, "상관": -5, "편재": 3,
+                "정재": 8, "편관": -3, "정관": 8, "편인": -2, "정인": 5}
+# 지지 (일지 대 일지)
+BRANCH_YUKHAP = 15     # 육합 (子丑, 寅亥, 卯戌, 辰酉, 巳申, 午未)
+BRANCH_SAMHAP = 10     # 같은 삼합 국
+BRANCH_CHUNG = -15     # 충
+BRANCH_SAENG = 5
+BRANCH_GEUK = -5
+GWIN_SCORE = 8         # 상대 일지가 내 천을귀인
+SHARED_SHINSAL = 3     # 겹치는 신살 종류당
+GONGMANG_PENALTY = -5  # 내 공망 지지가 상대 원국에 있을 때 지지 하나당
+EXCLUDED = np.iinfo(np.int16).min  # 제외한 칸 (어떤 점수보다도 낮음)
+
+_YUKHAP = {frozenset(p) for p in ((0, 1), (2, 11), (3, 10), (4, 9), (5, 8), (6, 7))}
+
+
+# ==========================================
+# 1. 점수표
+# ==========================================
+def _element_relation(a, b, saeng, bihwa, geuk):
+    if a == b: return bihwa
+    if (a + 1) % 5 == b or (b + 1) % 5 == a: return saeng
+    return geuk
+
+
+def _stem_score(a, b):
+    if abs(a - b) == 5: return STEM_HAP
+    return _element_relation(C_DATA[a][0], C_DATA[b][0], STEM_SAENG, STEM_BIHWA, STEM_GEUK)
+
+
+def _sibsin_score(a, b):
+    return SIBSIN_SCORE[SIBSIN_NAMES[SIBSIN_CHEON_IDX[a][b]]] + SIBSIN_SCORE[SIBSIN_NAMES[SIBSIN_CHEON_IDX[b][a]]]
+
+
+def _branch_score(a, b):
+    if frozenset((a, b)) in _YUKHAP: return BRANCH_YUKHAP
+    if (a - b) % 12 == 6: return BRANCH_CHUNG
+    if a != b and SHINSAL_GROUPS[a] == SHINSAL_GROUPS[b]: return BRANCH_SAMHAP
+    return _element_relation(J_DATA[a][0], J_DATA[b][0], BRANCH_SAENG, 0, BRANCH_GEUK)
+
+
+def _gwin_score(gan, other_ji):
+    return GWIN_SCORE if GWIN_BITS[gan][other_ji] else 0
+
+
+STEM_TABLE = np.array([[_stem_score(a, b) for b in range(10)] for a in range(10)], dtype=np.int16)
+SIBSIN_TABLE = np.array([[_sibsin_score(a, b) for b in range(10)] for a in range(10)], dtype=np.int16)
+BRANCH_TABLE = np.array([[_branch_score(a, b) for b in range(12)] for a in range(12)], dtype=np.int16)
+GWIN_TABLE = np.array([[_gwin_score(g, j) for j in range(12)] for g in range(10)], dtype=np.int16)
+
+_GAN60 = np.arange(60) % 10
+_JI60 = np.arange(60) % 12
+# [내 일주 60갑자][상대 일주 60갑자] → 일주 쌍 점수 (천간 + 십신 + 지지 + 귀인)
+DAY_PAIR_TABLE = (STEM_TABLE[_GAN60[:, None], _GAN60[None, :]]
+                  + SIBSIN_TABLE[_GAN60[:, None], _GAN60[None, :]]
+                  + BRANCH_TABLE[_JI60[:, None], _JI60[None, :]]
+                  + GWIN_TABLE[_GAN60[:, None], _JI60[None, :]]
+                  + GWIN_TABLE[_GAN60[None, :], _JI60[:, None]]).astype(np.int16)
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(1 << 12)], dtype=np.int16)
+_SHINSAL_JI_BITS = np.array(SHINSAL_JI_BITS, dtype=np.uint8)
+_GWIN_BITS = np.array(GWIN_BITS, dtype=np.uint8)
+_GONGMANG_MASK = np.array([[(1 << a) | (1 << b) for a, b in row] for row in GONGMANG_JI], dtype=np.uint16)
+_GANJI_INDEX = np.array(GANJI_INDEX, dtype=np.uint8)
+
+
+# ==========================================
+# 2. 명단 (차트별 정수 특징)
+# ==========================================
+class Roster:
+    """
+    day60    : 일주 60갑자 인덱스 (uint8)
+    shinsal  : 네 기둥 신살 비트 합 (도화 1 / 역마 2 / 화개 4 / 천을귀인 8)
+    branches : 네 기둥 지지 비트 (1 << 지지)
+    gongmang : 공망 두 지지 비트
+    """
+    __slots__ = ("day60", "shinsal", "branches", "gongmang")
+
+    def __init__(self, day60, shinsal, branches, gongmang):
+        self.day60 = day60
+        self.shinsal = shinsal
+        self.branches = branches
+        self.gongmang = gongmang
+
+    def __len__(self):
+        return len(self.day60)
+
+    def __getitem__(self, key):
+        return Roster(*(np.atleast_1d(getattr(self, k)[key]) for k in self.__slots__))
+
+    @classmethod
+    def from_ganji(cls, gans, jis):
+        """(N, 4) 천간 / 지지 인덱스 배열 (년·월·일·시주 순)."""
+        gans = np.asarray(gans, dtype=np.int64).reshape(-1, 4)
+        jis = np.asarray(jis, dtype=np.int64).reshape(-1, 4)
+        day_gan, day_ji = gans[:, 2], jis[:, 2]
+        shinsal = np.zeros(len(gans), dtype=np.uint8)
+        branches = np.zeros(len(gans), dtype=np.uint16)
+        for i in range(4):
+            shinsal |= _SHINSAL_JI_BITS[day_ji, jis[:, i]] | _GWIN_BITS[day_gan, jis[:, i]]
+            branches |= (1 << jis[:, i]).astype(np.uint16)
+        return cls(_GANJI_INDEX[day_gan, day_ji], shinsal, branches, _GONGMANG_MASK[day_gan, day_ji])
+
+    @classmethod
+    def from_charts(cls, charts):
+        charts = list(charts)
+        return cls.from_ganji([c.gans for c in charts], [c.jis for c in charts])
+
+    @classmethod
+    def from_packed(cls, packed):
+        """Chart.pack() 정수 배열 (ChartCache 의 packed 열 등)."""
+        packed = np.asarray(packed, dtype=np.int64)
+        ganji = np.stack([(packed >> (_GANJI_SHIFT + 6 * i)) & 63 for i in range(4)], axis=1)
+        return cls.from_ganji(ganji % 10, ganji % 12)
+
+    @classmethod
+    def from_arrays(cls, out):
+        """saju.vector.calculate_arrays / pillar_arrays 결과 dict."""
+        keys = ("year", "month", "day", "time")
+        return cls.from_ganji(np.stack([out[f"{k}_gan"] for k in keys], axis=1),
+                              np.stack([out[f"{k}_ji"] for k in keys], axis=1))
+
+
+# ==========================================
+# 3. 점수
+# ==========================================
+def _pair_scores(a, b):
+    """a, b 의 각 특징 배열을 브로드캐스트해 자르기 전 점수 (int16) 배열을 만듭니다. 순위는 이 값으로 매깁니다."""
+    score = DAY_PAIR_TABLE[a.day60, b.day60] + BASE_SCORE
+    score += SHARED_SHINSAL * _POPCOUNT[a.shinsal & b.shinsal]
+    score += GONGMANG_PENALTY * (_POPCOUNT[a.gongmang & b.branches] + _POPCOUNT[b.gongmang & a.branches])
+    return score.astype(np.int16)
+
+
+def display_score(raw):
+    """자르기 전 점수 → 화면용 0~100 점수 (int16)."""
+    return np.clip(raw, 0, 100).astype(np.int16)
+
+
+def score_one(person, roster):
+    """한 사람(길이 1 Roster) 대 명단 전체 점수 배열 (길이 N, 0~100)."""
+    return display_score(_pair_scores(person[0:1], roster))
+
+
+def _top(scores, k):
+    """점수 내림차순 (같으면 번호 오름차순) 상위 k 개의 번호."""
+    k = min(k, len(scores))
+    if k <= 0: return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    cut = scores[part].min()
+    # 경계 점수 동점은 앞 번호부터 고르도록 다시 모음
+    above = np.flatnonzero(scores > cut)
+    ties = np.flatnonzero(scores == cut)[:k - len(above)]
+    chosen = np.concatenate([above, ties])
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+def top_k(person, roster, k=10, exclude=None):
+    """(명단 번호 배열, 0~100 점수 배열) — 자르기 전 점수 내림차순 상위 k 개. exclude 번호는 제외."""
+    scores = _pair_scores(person[0:1], roster).astype(np.int32)
+    if exclude is not None: scores[np.asarray(exclude)] = EXCLUDED
+    idx = _top(scores, k)
+    idx = idx[scores[idx] != EXCLUDED]
+    return idx, display_score(scores[idx])
+
+
+def iter_score_blocks(a, b, block_rows=None, max_cells=4_000_000):
+    """a x b 점수표를 (시작 행, block x len(b) 배열) 단위로 내보냅니다."""
+    block_rows = block_rows or max(1, max_cells // max(len(b), 1))
+    col = Roster(*(getattr(b, k)[None, :] for k in Roster.__slots__))
+    for start in range(0, len(a), block_rows):
+        rows = Roster(*(getattr(a, k)[start:start + block_rows, None] for k in Roster.__slots__))
+        yield start, _pair_scores(rows, col)
+
+
+def top_k_matrix(a, b, k=10, exclude_self=False, max_cells=4_000_000):
+    """
+    a 의 각 행마다 b 에서 상위 k 개 → (번호 (len(a), k), 점수 (len(a), k)).
+    b 가 k 보다 짧으면 남는 칸은 번호 -1 / 점수 -1. exclude_self 는 a 와 b 가 같은 명단일 때 대각선 제외.
+    순위는 자르기 전 점수로, 돌려주는 점수는 0~100.
+    """
+    k_eff = min(k, len(b))
+    out_idx = np.full((len(a), k), -1, dtype=np.int64)
+    out_score = np.full((len(a), k), -1, dtype=np.int16)
+    for start, block in iter_score_blocks(a, b, max_cells=max_cells):
+        block = block.astype(np.int64)
+        rows = np.arange(len(block))
+        if exclude_self: block[rows, start + rows] = EXCLUDED
+        # 번호가 작은 쪽이 먼저 오도록 (점수 * 열 수 - 번호) 한 값으로 정렬
+        key = block * len(b) - np.arange(len(b))[None, :]
+        part = np.argpartition(-key, k_eff - 1, axis=1)[:, :k_eff] if k_eff < len(b) else np.tile(np.arange(len(b)), (len(block), 1))
+        order = np.argsort(-np.take_along_axis(key, part, axis=1), axis=1, kind="stable")
+        idx = np.take_along_axis(part, order, axis=1)
+        score = np.take_along_axis(block, idx, axis=1)
+        empty = score == EXCLUDED
+        idx[empty] = -1
+        score = display_score(score)
+        score[empty] = -1
+        out_idx[start:start + len(block), :k_eff] = idx
+        out_score[start:start + len(block), :k_eff] = score
+    return out_idx, out_score
+
+
+def top_k_pairs(a, b, k=10, exclude_self=False, max_cells=4_000_000):
+    """a x b 전체에서 자르기 전 점수 상위 k 쌍 → (a 번호, b 번호, 0~100 점수) 배열. 메모리는 block 크기 + k."""
+    best_key = np.empty(0, dtype=np.int64)
+    n_b = len(b)
+    cells = len(a) * n_b
+    cutoff = EXCLUDED + 1
+    for start, block in iter_score_blocks(a, b, max_cells=max_cells):
+        if exclude_self:
+            rows = np.arange(len(block))
+            block[rows, start + rows] = EXCLUDED
+        # 지금까지 k 번째 점수보다 낮은 칸은 볼 필요 없음
+        cell = np.flatnonzero(block.ravel() >= cutoff)
+        # (점수, 앞선 쌍 우선)을 정수 하나로: 점수 * 칸 수 - 전체 칸 번호
+        flat = block.ravel()[cell].astype(np.int64) * cells - (start * n_b + cell)
+        cand = np.concatenate([best_key, flat])
+        if len(cand) > k: cand = cand[np.argpartition(-cand, k - 1)[:k]]
+        best_key = cand
+        if len(best_key) >= k: cutoff = -((-best_key.min()) // cells)
+    best_key = np.sort(best_key)[::-1]
+    scores = -((-best_key) // cells)
+    cell = scores * cells - best_key
+    return cell // n_b, cell % n_b, display_score(scores)
+
+
+# ==========================================
+# 4. 설명 (한 쌍)
+# ==========================================
+def explain(chart_a, chart_b):
+    """두 Chart 의 항목별 점수 dict (상담/화면 표시용). total 은 score_one 과 같고 raw 는 자르기 전 점수."""
+    ra, rb = Roster.from_charts([chart_a]), Roster.from_charts([chart_b])
+    ga, ja, gb, jb = chart_a.day_gan, chart_a.day_ji, chart_b.day_gan, chart_b.day_ji
+    shared = int(ra.shinsal[0] & rb.shinsal[0])
+    gm_a = [JI[j] for j in GONGMANG_JI[ga][ja] if rb.branches[0] >> j & 1]
+    gm_b = [JI[j] for j in GONGMANG_JI[gb][jb] if ra.branches[0] >> j & 1]
+    return {
+        "천간": int(STEM_TABLE[ga, gb]),
+        "십신": int(SIBSIN_TABLE[ga, gb]),
+        "지지": int(BRANCH_TABLE[ja, jb]),
+        "귀인": int(GWIN_TABLE[ga, jb] + GWIN_TABLE[gb, ja]),
+        "신살": SHARED_SHINSAL * int(_POPCOUNT[shared]),
+        "공망": GONGMANG_PENALTY * (len(gm_a) + len(gm_b)),
+        "detail": {
+            "sibsin": (SIBSIN_NAMES[SIBSIN_CHEON_IDX[ga][gb]], SIBSIN_NAMES[SIBSIN_CHEON_IDX[gb][ga]]),
+            "shared_shinsal": SHINSAL_TEXT[shared], "gongmang": (gm_a, gm_b),
+        },
+        "total": int(display_score(_pair_scores(ra, rb))[0]),
+        "raw": int(_pair_scores(ra, rb)[0]),
+    }
+
+
+# ==========================================
+# 5. 측정 도구
+# ==========================================
+def random_roster(n, seed=0):
+    """1900~2100 임의 출생 일시 n 명의 Roster (벡터 엔진으로 계산)."""
+    from .vector import pillar_arrays
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 201 * 365 * 1440, n)
+    return Roster.from_arrays(pillar_arrays(np.datetime64("1900-01-01T00:00", "m") + minutes.astype("timedelta64[m]")))
+
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="궁합 점수 벡터화 측정")
+    parser.add_argument("--roster", type=int, default=100_000, help="임의 명단 크기")
+    parser.add_argument("--pairs", type=int, default=2000, help="다대다 측정용 a 명단 크기")
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    roster = random_roster(args.roster)
+    person = random_roster(1, seed=1)
+    started = time.perf_counter()
+    idx, scores = top_k(person, roster, args.k)
+    print(f"1 x {args.roster}: {(time.perf_counter() - started) * 1e3:.1f}ms, 상위 {args.k}: "
+          + ", ".join(f"#{i}({s})" for i, s in zip(idx.tolist(), scores.tolist())))
+
+    a = random_roster(args.pairs, seed=2)
+    started = time.perf_counter()
+    top_k_matrix(a, roster, args.k)
+    print(f"{args.pairs} x {args.roster} 행별 상위 {args.k}: {time.perf_counter() - started:.2f}초")
+    started = time.perf_counter()
+    ia, ib, s = top_k_pairs(a, roster, args.k)
+    print(f"{args.pairs} x {args.roster} 전체 상위 {args.k} 쌍: {time.perf_counter() - started:.2f}초, 최고점 {s[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
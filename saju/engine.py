@@ -0,0 +1,123 @@
+"""
+청은(靑隱) 사주 엔진
+
+스트림릿 UI(or00.py)와 배치 처리(saju.batch)가 함께 쓰는 계산 엔진입니다.
+import 시에는 아무것도 실행하지 않으며, ephem / korean_lunar_calendar 는
+테이블 범위 밖 날짜를 처리할 때만 불러옵니다.
+"""
+import datetime
+
+from . import lunar, metrics, solar_terms
+from .chart import Chart, DAEWOON_FAILED
+from .reports import build_report
+from .tables import (CHEON, JI, SIBSIN_NAMES, UNSEONG_NAMES, C_DATA, J_DATA, UNSEONG_START,
+                     MONTH_START_MAP, TIME_START_MAP, SIBSIN_CHEON, SIBSIN_JI, UNSEONG, GONGMANG,
+                     SHINSAL_JI_BITS, GWIN_BITS, SHINSAL_TEXT, BAEKHO_TEXT, GOEGANG_TEXT)
+
+# ==========================================
+# 1. 청은(靑隱) 통합 엔진 (V40)
+# ==========================================
+class SajuEngine:
+    def __init__(self):
+        self.cheon = CHEON
+        self.ji = JI
+        self.sibsin_names = SIBSIN_NAMES
+        self.unseong_names = UNSEONG_NAMES
+        self.c_data = C_DATA
+        self.j_data = J_DATA
+        self.unseong_start = UNSEONG_START
+
+    def _get_ganji(self, gan_idx, ji_idx):
+        return f"{self.cheon[gan_idx % 10]}{self.ji[ji_idx % 12]}"
+
+    def _get_sibsin(self, me_idx, target_idx, is_target_cheon=True):
+        table = SIBSIN_CHEON if is_target_cheon else SIBSIN_JI
+        return table[me_idx][target_idx]
+
+    def _get_12unseong(self, day_gan_idx, ji_idx):
+        return UNSEONG[day_gan_idx][ji_idx]
+
+    def get_gongmang(self, day_gan, day_ji):
+        return GONGMANG[day_gan][day_ji]
+
+    def get_shinsal(self, day_gan, day_ji, target_ji):
+        return SHINSAL_TEXT[SHINSAL_JI_BITS[day_ji][target_ji] | GWIN_BITS[day_gan][target_ji]]
+
+    def check_baekho(self, gan, ji):
+        return BAEKHO_TEXT[gan][ji]
+    
+    def check_goemigwan(self, gan, ji):
+        return GOEGANG_TEXT[gan][ji]
+
+    def get_daewoon_data(self, kst_date, direction):
+        # 절기 경계 테이블 조회 (기존 1시간 단위 탐색과 동일한 시간 수)
+        utc_date = kst_date - datetime.timedelta(hours=9)
+        hours = solar_terms.boundary_hours(utc_date, direction)
+        if hours is None: return 1, "절기 탐색 실패"
+
+        diff_days = hours / 24.0
+        
+        raw_num = diff_days / 3.0
+        daewoon_num = int(raw_num)
+        remainder = diff_days % 3
+        if remainder > 2: daewoon_num += 1
+        if daewoon_num < 1: daewoon_num = 1
+        return daewoon_num, ""
+
+    def generate_detailed_report(self, day_gan_idx, name):
+        return build_report(day_gan_idx, name)
+
+    def calculate_chart(self, year, month, day, hour, minute, gender):
+        """네 기둥과 대운수만 담은 압축 Chart. 잘못된 날짜면 None."""
+        try:
+            kst_date = datetime.datetime(year, month, day, hour, minute)
+        except ValueError: return None
+        timer = metrics.timer()
+        utc_date = kst_date - datetime.timedelta(hours=9)
+        # 절기 번호 = int(태양 황경 / 15), 315° = 입춘(21)
+        term_idx = solar_terms.term_index(utc_date)
+        if timer: timer.lap("sun_longitude")
+        target_year = year
+        if month == 1: target_year = year - 1
+        elif month == 2:
+            if term_idx < 21: target_year = year - 1
+        year_gan = (target_year - 4) % 10
+        year_ji = (target_year - 4) % 12
+        month_idx = ((term_idx + 3) // 2) % 12
+        month_gan = (MONTH_START_MAP[year_gan % 5] + month_idx) % 10
+        month_ji = (month_idx + 2) % 12 
+        base_date = datetime.date(1900, 1, 1)
+        target_date_only = datetime.date(year, month, day)
+        diff_days = (target_date_only - base_date).days
+        day_gan = (diff_days + 10) % 10
+        day_ji = (diff_days + 10) % 12 
+        total_min = hour * 60 + minute
+        if total_min >= 23*60 + 30 or total_min < 1*60 + 30:
+            time_ji = 0 
+            if total_min >= 23*60 + 30: calc_day_gan = (day_gan + 1) % 10
+            else: calc_day_gan = day_gan
+        else:
+            time_ji = ((total_min - 30) // 120 + 1) % 12
+            calc_day_gan = day_gan
+        time_gan = (TIME_START_MAP[calc_day_gan % 5] + time_ji) % 10
+
+        is_year_yang = (year_gan % 2 == 0)
+        is_man = (gender == '남성')
+        direction = 1 if is_man == is_year_yang else -1
+        if timer: timer.lap("pillars")
+        daewoon_num, debug_msg = self.get_daewoon_data(kst_date, direction)
+        if debug_msg: daewoon_num = DAEWOON_FAILED
+        if timer: timer.lap("daewoon_search")
+        return Chart(year, month, day, hour, minute, is_man,
+                     (year_gan, month_gan, day_gan, time_gan), (year_ji, month_ji, day_ji, time_ji), daewoon_num)
+
+    def calculate(self, year, month, day, hour, minute, gender, name="사용자"):
+        chart = self.calculate_chart(year, month, day, hour, minute, gender)
+        if chart is None: return None
+        return chart.to_dict(name, gender)
+
+
+def lunar_to_solar(year, month, day, is_leap=False):
+    """음력 → 양력 (year, month, day). 존재하지 않는 음력 날짜면 사유를 담은 lunar.InvalidLunarDate."""
+    solar = lunar.to_solar(year, month, day, is_leap)
+    return solar.year, solar.month, solar.day
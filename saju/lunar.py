@@ -0,0 +1,337 @@
+"""
+음력 ↔ 양력 변환 테이블
+
+음력 연도마다 8바이트 고정 레코드(설날의 일 번호, 월별 대소 비트, 윤달)를
+data/lunar_table.bin 에 저장해 두고 mmap 으로 읽습니다. 변환은 레코드 하나와
+비트 연산만으로 끝나므로 O(1) 이며, NumPy 배열 단위 일괄 변환도 제공합니다.
+
+테이블은 korean_lunar_calendar(KARI 기준) 데이터에서 만들며, 이 라이브러리가
+지원하는 1900~2050년(음력 2050-11-18 / 양력 2050-12-31 까지) 전 구간에서 결과가
+같은지 `python -m saju.lunar check` 로 전수 검사합니다. 범위 밖 날짜는
+korean_lunar_calendar 로 직접 변환합니다.
+
+    python -m saju.lunar build
+    python -m saju.lunar check
+"""
+import datetime
+import mmap
+import os
+import struct
+import sys
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "lunar_table.bin")
+
+# 일 번호: 1900-01-01 = 0
+EPOCH = datetime.date(1900, 1, 1)
+_EPOCH_ORD = EPOCH.toordinal()
+
+# 헤더: 매직, 버전, 첫 음력 연도, 연도 수, 음력 최대일(yyyymmdd), 양력 최대일(yyyymmdd)
+_MAGIC = b"SJLC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHHII")
+# 레코드: 설날 일 번호, 월 순서별 30일 여부 비트(윤달 포함 최대 13개), 윤달(0 = 없음), 예비
+_RECORD = struct.Struct("<iHBB")
+
+# 일괄 변환 오류 코드
+OK, OUT_OF_RANGE, BAD_MONTH, NOT_LEAP_MONTH, BAD_DAY = 0, 1, 2, 3, 4
+ERROR_MESSAGES = {
+    OUT_OF_RANGE: "지원 범위 밖의 날짜",
+    BAD_MONTH: "잘못된 월",
+    NOT_LEAP_MONTH: "해당 연도에 없는 윤달",
+    BAD_DAY: "해당 월에 없는 일",
+}
+
+
+class InvalidLunarDate(ValueError):
+    def __init__(self, code, detail=""):
+        self.code = code
+        super().__init__(f"{ERROR_MESSAGES[code]}{': ' + detail if detail else ''}")
+
+
+def _ymd(value):
+    return value // 10000, value // 100 % 100, value % 100
+
+
+def _days_before(bits, pos):
+    """월 순서 pos 이전까지의 일수 (29일 x 개수 + 30일인 달 수)."""
+    return 29 * pos + (bits & ((1 << pos) - 1)).bit_count()
+
+
+def _position(month, is_leap, leap_month):
+    """(월, 윤달 여부) → 그 해 월 순서(0부터). 윤달은 같은 달 평달 바로 뒤."""
+    if is_leap: return leap_month
+    return month - 1 if (leap_month == 0 or month <= leap_month) else month
+
+
+class LunarTable:
+    def __init__(self, buf, first_year, n_years, lunar_max, solar_max):
+        self._buf = buf
+        self.first_year = first_year
+        self.n_years = n_years
+        self.last_year = first_year + n_years - 1
+        self.lunar_max = lunar_max
+        self.solar_max = solar_max
+        self.solar_min = self.new_year_day(first_year)
+        self._np_cache = None
+
+    @classmethod
+    def load(cls, path=TABLE_PATH):
+        with open(path, "rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                buf = f.read()
+        magic, version, first_year, n_years, lunar_max, solar_max = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"지원하지 않는 음력 테이블 형식입니다: {path}")
+        return cls(buf, first_year, n_years, lunar_max, solar_max)
+
+    @staticmethod
+    def save(records, first_year, lunar_max, solar_max, path=TABLE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, first_year, len(records), lunar_max, solar_max))
+            for rec in records:
+                f.write(_RECORD.pack(*rec, 0))
+
+    def record(self, year):
+        """(설날 일 번호, 월 대소 비트, 윤달)"""
+        return _RECORD.unpack_from(self._buf, _HEADER.size + (year - self.first_year) * _RECORD.size)[:3]
+
+    def new_year_day(self, year):
+        return self.record(year)[0]
+
+    def covers_lunar(self, year):
+        return self.first_year <= year <= self.last_year
+
+    def covers_solar(self, date):
+        return self.solar_min <= date.toordinal() - _EPOCH_ORD and date.year * 10000 + date.month * 100 + date.day <= self.solar_max
+
+    # ------------------------------------------
+    # 단건 변환
+    # ------------------------------------------
+    def lunar_to_solar(self, year, month, day, is_leap=False):
+        """음력 → datetime.date. 잘못된 입력은 InvalidLunarDate."""
+        if not self.covers_lunar(year) or year * 10000 + month * 100 + day > self.lunar_max:
+            raise InvalidLunarDate(OUT_OF_RANGE, f"{year}-{month:02d}-{day:02d}")
+        if not 1 <= month <= 12:
+            raise InvalidLunarDate(BAD_MONTH, str(month))
+        new_year, bits, leap_month = self.record(year)
+        if is_leap and leap_month != month:
+            detail = f"{year}년 윤달은 {leap_month}월" if leap_month else f"{year}년은 윤달 없음"
+            raise InvalidLunarDate(NOT_LEAP_MONTH, detail)
+        pos = _position(month, is_leap, leap_month)
+        length = 30 if bits >> pos & 1 else 29
+        if not 1 <= day <= length:
+            raise InvalidLunarDate(BAD_DAY, f"{month}월은 {length}일까지")
+        return datetime.date.fromordinal(_EPOCH_ORD + new_year + _days_before(bits, pos) + day - 1)
+
+    def solar_to_lunar(self, date):
+        """양력 datetime.date → (year, month, day, is_leap)."""
+        if not self.covers_solar(date):
+            raise InvalidLunarDate(OUT_OF_RANGE, date.isoformat())
+        n = date.toordinal() - _EPOCH_ORD
+        year = min(date.year, self.last_year)
+        new_year, bits, leap_month = self.record(year)
+        if n < new_year:
+            year -= 1
+            new_year, bits, leap_month = self.record(year)
+        offset = n - new_year
+        pos = offset // 30
+        if _days_before(bits, pos + 1) <= offset: pos += 1
+        day = offset - _days_before(bits, pos) + 1
+        if leap_month and pos == leap_month: return year, leap_month, day, True
+        month = pos if (leap_month and pos > leap_month) else pos + 1
+        return year, month, day, False
+
+    # ------------------------------------------
+    # 일괄 변환 (NumPy)
+    # ------------------------------------------
+    def _arrays(self):
+        if self._np_cache is None: self._np_cache = self._build_arrays()
+        return self._np_cache
+
+    def _build_arrays(self):
+        import numpy as np
+        rec = np.frombuffer(self._buf, dtype=np.dtype([("new_year", "<i4"), ("bits", "<u2"), ("leap", "u1"), ("pad", "u1")]),
+                            count=self.n_years, offset=_HEADER.size)
+        popcount = np.array([bin(i).count("1") for i in range(1 << 13)], dtype=np.int64)
+        return np, rec["new_year"].astype(np.int64), rec["bits"].astype(np.int64), rec["leap"].astype(np.int64), popcount
+
+    def lunar_to_solar_array(self, years, months, days, is_leap):
+        """
+        음력 배열 → (양력 datetime64[D] 배열, 오류 코드 배열).
+        오류가 있는 항목은 NaT 이며 코드는 ERROR_MESSAGES 참고.
+        """
+        np, new_year, bits, leap, popcount = self._arrays()
+        years, months, days = (np.asarray(a, dtype=np.int64) for a in (years, months, days))
+        is_leap = np.broadcast_to(np.asarray(is_leap, dtype=bool), years.shape)
+        code = np.zeros(years.shape, dtype=np.int8)
+
+        in_range = (years >= self.first_year) & (years <= self.last_year) & (years * 10000 + months * 100 + days <= self.lunar_max)
+        code[~in_range] = OUT_OF_RANGE
+        yi = np.where(in_range, years - self.first_year, 0)
+        b, lm = bits[yi], leap[yi]
+        code[(code == OK) & ((months < 1) | (months > 12))] = BAD_MONTH
+        code[(code == OK) & is_leap & (lm != months)] = NOT_LEAP_MONTH
+        pos = np.where(is_leap, lm, np.where((lm == 0) | (months <= lm), months - 1, months))
+        pos = np.clip(pos, 0, 12)
+        length = 29 + (b >> pos & 1)
+        code[(code == OK) & ((days < 1) | (days > length))] = BAD_DAY
+
+        n = new_year[yi] + 29 * pos + popcount[b & ((1 << pos) - 1)] + days - 1
+        out = (np.datetime64("1900-01-01", "D") + n.astype("timedelta64[D]")).astype("datetime64[D]")
+        out[code != OK] = np.datetime64("NaT")
+        return out, code
+
+    def solar_to_lunar_array(self, dates):
+        """양력 datetime64 배열 → (years, months, days, is_leap, 오류 코드) 배열."""
+        np, new_year, bits, leap, popcount = self._arrays()
+        d = np.asarray(dates, dtype="datetime64[D]")
+        n = (d - np.datetime64("1900-01-01", "D")).astype(np.int64)
+        solar_year = d.astype("datetime64[Y]").astype(np.int64) + 1970
+        ymd = solar_year * 10000 + (d.astype("datetime64[M]").astype(np.int64) % 12 + 1) * 100 \
+            + (d - d.astype("datetime64[M]")).astype(np.int64) + 1
+        code = np.where((n >= self.solar_min) & (ymd <= self.solar_max), OK, OUT_OF_RANGE).astype(np.int8)
+
+        yi = np.clip(np.minimum(solar_year, self.last_year) - self.first_year, 0, self.n_years - 1)
+        yi = np.where(n < new_year[yi], yi - 1, yi).clip(0)
+        b, lm = bits[yi], leap[yi]
+        offset = n - new_year[yi]
+        pos = np.clip(offset // 30, 0, 12)
+        nxt = np.clip(pos + 1, 0, 13)
+        pos = np.where(29 * nxt + popcount[b & ((1 << nxt) - 1)] <= offset, pos + 1, pos)
+        day = offset - (29 * pos + popcount[b & ((1 << pos) - 1)]) + 1
+        leap_flag = (lm > 0) & (pos == lm)
+        month = np.where(leap_flag, lm, np.where((lm > 0) & (pos > lm), pos, pos + 1))
+        years = yi + self.first_year
+        bad = code != OK
+        return (np.where(bad, 0, years), np.where(bad, 0, month), np.where(bad, 0, day),
+                leap_flag & ~bad, code)
+
+
+_TABLE = None
+
+
+def get_table():
+    global _TABLE
+    if _TABLE is None: _TABLE = LunarTable.load()
+    return _TABLE
+
+
+def to_solar(year, month, day, is_leap=False):
+    """음력 → datetime.date. 테이블 범위 밖은 korean_lunar_calendar 로 변환. 잘못된 날짜는 InvalidLunarDate."""
+    table = get_table()
+    if table.covers_lunar(year) and year * 10000 + month * 100 + day <= table.lunar_max:
+        return table.lunar_to_solar(year, month, day, is_leap)
+    from korean_lunar_calendar import KoreanLunarCalendar
+    calendar = KoreanLunarCalendar()
+    if not calendar.setLunarDate(year, month, day, is_leap):
+        raise InvalidLunarDate(OUT_OF_RANGE, f"{year}-{month:02d}-{day:02d}")
+    return datetime.date(calendar.solarYear, calendar.solarMonth, calendar.solarDay)
+
+
+def to_lunar(date):
+    """양력 datetime.date → (year, month, day, is_leap). 테이블 범위 밖은 korean_lunar_calendar 로 변환."""
+    table = get_table()
+    if table.covers_solar(date): return table.solar_to_lunar(date)
+    from korean_lunar_calendar import KoreanLunarCalendar
+    calendar = KoreanLunarCalendar()
+    if not calendar.setSolarDate(date.year, date.month, date.day):
+        raise InvalidLunarDate(OUT_OF_RANGE, date.isoformat())
+    return calendar.lunarYear, calendar.lunarMonth, calendar.lunarDay, bool(calendar.isIntercalation)
+
+
+# ==========================================
+# 테이블 생성 / 검증 도구
+# ==========================================
+def build_records(first_year=1899, last_year=2050):
+    """korean_lunar_calendar 의 연도 데이터에서 (설날 일 번호, 월 대소 비트, 윤달) 레코드를 만듭니다."""
+    from korean_lunar_calendar import KoreanLunarCalendar
+    cal = KoreanLunarCalendar()
+    get_data = cal._KoreanLunarCalendar__getLunarData
+    get_leap = cal._KoreanLunarCalendar__getLunarIntercalationMonth
+    get_days = cal._KoreanLunarCalendar__getLunarDays
+    records = []
+    for year in range(first_year, last_year + 1):
+        cal.setLunarDate(year, 1, 1, False)
+        new_year = datetime.date(cal.solarYear, cal.solarMonth, cal.solarDay).toordinal() - _EPOCH_ORD
+        leap_month = get_leap(get_data(year))
+        bits = 0
+        for month in range(1, 13):
+            for is_leap in ((False, True) if month == leap_month else (False,)):
+                if get_days(year, month, is_leap) == 30:
+                    bits |= 1 << _position(month, is_leap, leap_month)
+        records.append((new_year, bits, leap_month))
+    return records, cal.KOREAN_LUNAR_MAX_VALUE, cal.KOREAN_SOLAR_MAX_VALUE
+
+
+def check_table(table):
+    """범위 내 모든 양력 날짜와 모든 음력 (년, 월, 일, 윤달) 조합을 korean_lunar_calendar 와 비교합니다."""
+    from korean_lunar_calendar import KoreanLunarCalendar
+    import numpy as np
+    mismatches = []
+    cal = KoreanLunarCalendar()
+
+    first = datetime.date.fromordinal(_EPOCH_ORD + table.solar_min)
+    last = datetime.date(*_ymd(table.solar_max))
+    dates, want = [], []
+    d = first
+    while d <= last:
+        cal.setSolarDate(d.year, d.month, d.day)
+        expected = (cal.lunarYear, cal.lunarMonth, cal.lunarDay, bool(cal.isIntercalation))
+        got = table.solar_to_lunar(d)
+        if got != expected: mismatches.append(("solar", d, got, expected))
+        dates.append(d)
+        want.append(expected)
+        d += datetime.timedelta(days=1)
+    ys, ms, ds, ls, codes = table.solar_to_lunar_array(np.array(dates, dtype="datetime64[D]"))
+    for k, expected in enumerate(want):
+        got = (int(ys[k]), int(ms[k]), int(ds[k]), bool(ls[k]))
+        if codes[k] != OK or got != expected: mismatches.append(("solar_array", dates[k], got, expected))
+
+    lunar_inputs, lunar_want = [], []
+    for year in range(table.first_year, table.last_year + 1):
+        for month in range(0, 14):
+            for day in range(0, 32):
+                for is_leap in (False, True):
+                    c = KoreanLunarCalendar()
+                    ok = c.setLunarDate(year, month, day, is_leap)
+                    expected = datetime.date(c.solarYear, c.solarMonth, c.solarDay) if ok else None
+                    try: got = table.lunar_to_solar(year, month, day, is_leap)
+                    except InvalidLunarDate: got = None
+                    if got != expected: mismatches.append(("lunar", (year, month, day, is_leap), got, expected))
+                    lunar_inputs.append((year, month, day, is_leap))
+                    lunar_want.append(expected)
+    arr = np.array(lunar_inputs, dtype=np.int64)
+    out, codes = table.lunar_to_solar_array(arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3].astype(bool))
+    for k, expected in enumerate(lunar_want):
+        got = out[k].astype(datetime.date) if codes[k] == OK else None
+        if got != expected: mismatches.append(("lunar_array", lunar_inputs[k], got, expected))
+    return len(dates) + len(lunar_inputs), mismatches
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="음력 변환 테이블 생성/검증")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="korean_lunar_calendar 데이터로 테이블 생성")
+    p_build.add_argument("--out", default=TABLE_PATH)
+    p_check = sub.add_parser("check", help="저장된 테이블을 korean_lunar_calendar 와 전수 비교")
+    p_check.add_argument("--path", default=TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        records, lunar_max, solar_max = build_records()
+        LunarTable.save(records, 1899, lunar_max, solar_max, args.out)
+        print(f"{len(records)}개 연도 저장: {args.out}")
+        return 0
+
+    n, mismatches = check_table(LunarTable.load(args.path))
+    for m in mismatches[:20]: print("불일치:", m)
+    print(f"검사 {n}건, 불일치 {len(mismatches)}건")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
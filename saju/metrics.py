@@ -0,0 +1,287 @@
+"""
+단계별 소요 시간 / 카운터 계측
+
+기본값은 꺼짐이며, 꺼져 있을 때 엔진 쪽 비용은 timer() 호출 한 번과
+None 비교 몇 번뿐입니다. 환경 변수로 켭니다.
+
+  SAJU_METRICS=1             계측 켜기
+  SAJU_METRICS_FILE=경로     write_textfile() 이 쓸 Prometheus 텍스트 파일 (node_exporter textfile 수집기용)
+  SAJU_METRICS_PORT=9108     configure_from_env() 가 /metrics HTTP 엔드포인트를 띄움
+
+SAJU_METRICS 는 모듈을 처음 불러올 때 읽고, configure_from_env() 를 부를 때마다 다시 읽습니다
+(or00.py 는 화면을 그릴 때마다 부름). 코드에서 켜고 끌 때는 set_enabled(on) 을 쓰며, 엔진 쪽은
+ENABLED 를 호출 때마다 읽으므로 바로 반영됩니다.
+
+단계 (saju_stage_seconds 히스토그램의 stage 레이블)
+  sun_longitude   절기 번호(태양 황경) 조회
+  pillars         네 기둥 계산
+  daewoon_search  대운수 절기 경계 탐색
+  report          표시용 dict / 리포트 생성
+  lookup          UI(or00.py)의 음력 변환 + 캐시 조회 (계산 단계를 포함)
+  render          UI 화면 그리기
+  queue_wait      HTTP 서비스(saju.server)에서 요청이 마이크로 배치에 실리기까지 기다린 시간
+  batch_compute   마이크로 배치 한 번의 계산 시간
+
+    python -m saju.metrics --sample 1000
+"""
+import collections
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _env_enabled():
+    return os.environ.get("SAJU_METRICS", "") not in ("", "0")
+
+
+ENABLED = _env_enabled()
+
+# 히스토그램 버킷 상한 (초)
+BUCKETS = (1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.3, 1.0)
+
+COUNTERS = {
+    "ephem_calls": "ephem 태양 위치 계산 횟수",
+    "solar_term_lookups": "절기 조회 횟수 (source=table|ephem)",
+    "solar_term_search_steps": "ephem 절기 탐색 반복(1시간 단위) 횟수",
+    "cache_lookups": "차트 캐시 조회 결과 (result=memory_hit|disk_hit|miss)",
+    "http_requests": "HTTP 요청 수 (endpoint, status)",
+    "http_rejected": "과부하로 거절한 요청 수 (reason=queue_full|connections)",
+    "microbatches": "마이크로 배치 실행 횟수",
+    "microbatch_items": "마이크로 배치로 계산한 차트 수",
+    "pool_requests": "UI 계산 풀 요청 결과 (result=computed|merged|timeouts|rejected|errors)",
+}
+GAUGES = {
+    "queue_depth": "계산을 기다리는 요청 수",
+    "inflight_batches": "계산 중인 마이크로 배치 수",
+    "open_connections": "열린 HTTP 연결 수",
+    "pool_pending": "UI 계산 풀에서 계산 중이거나 대기 중인 서로 다른 입력 수",
+    "pool_waiters": "UI 계산 풀 결과를 기다리는 세션 수 (같은 입력에 합쳐진 요청 포함)",
+}
+
+_lock = threading.Lock()
+_local = threading.local()
+_counters = collections.Counter()
+_gauges = {}
+_stages = {}  # stage → [버킷별 개수..., 합계, 개수]
+_server = None
+
+
+def set_enabled(on):
+    global ENABLED
+    ENABLED = bool(on)
+
+
+def enable(on=True):
+    set_enabled(on)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _stages.clear()
+
+
+# ==========================================
+# 1. 기록
+# ==========================================
+class Timer:
+    """lap(stage) 을 부를 때마다 직전 lap 이후 시간을 그 단계로 기록합니다."""
+    __slots__ = ("last",)
+
+    def __init__(self):
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        observe(stage, now - self.last)
+        self.last = now
+
+
+def timer():
+    """계측이 켜져 있으면 Timer, 꺼져 있으면 None."""
+    return Timer() if ENABLED else None
+
+
+def observe(stage, seconds):
+    with _lock:
+        row = _stages.get(stage)
+        if row is None: row = _stages[stage] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                row[i] += 1
+                break
+        row[-2] += seconds
+        row[-1] += 1
+    trace = getattr(_local, "trace", None)
+    if trace is not None: trace["stages"][stage] = trace["stages"].get(stage, 0.0) + seconds
+
+
+def inc(name, n=1, **labels):
+    if not ENABLED: return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += n
+    trace = getattr(_local, "trace", None)
+    if trace is not None: trace["counters"][key] = trace["counters"].get(key, 0) + n
+
+
+def set_gauge(name, value, **labels):
+    if not ENABLED: return
+    with _lock:
+        _gauges[name, tuple(sorted(labels.items()))] = value
+
+
+def start_trace():
+    """이 스레드에서 기록되는 단계 시간/카운터를 요청 단위로 따로 모읍니다 (UI 디버그 패널용)."""
+    _local.trace = {"stages": {}, "counters": {}}
+    return _local.trace
+
+
+def end_trace():
+    collected = getattr(_local, "trace", None)
+    _local.trace = None
+    return collected
+
+
+def merge_trace(collected):
+    """다른 스레드/프로세스에서 trace() 로 모은 결과를 이 스레드의 trace 에 더합니다 (saju.pool)."""
+    trace = getattr(_local, "trace", None)
+    if trace is None or not collected: return
+    for stage, seconds in collected["stages"].items():
+        trace["stages"][stage] = trace["stages"].get(stage, 0.0) + seconds
+    for key, n in collected["counters"].items():
+        trace["counters"][key] = trace["counters"].get(key, 0) + n
+
+
+@contextmanager
+def trace():
+    collected = start_trace()
+    try:
+        yield collected
+    finally:
+        end_trace()
+
+
+def format_trace(collected):
+    """trace() 결과 → 한 줄 요약 문자열."""
+    parts = [f"{stage} {seconds * 1e3:.2f}ms" for stage, seconds in collected["stages"].items()]
+    parts += [f"{_label(name, labels)} {n}" for (name, labels), n in sorted(collected["counters"].items())]
+    return " · ".join(parts) or "기록 없음"
+
+
+# ==========================================
+# 2. 내보내기 (Prometheus 텍스트 형식)
+# ==========================================
+def _label(name, labels):
+    if not labels: return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def render():
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        stages = {k: list(v) for k, v in _stages.items()}
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP saju_{name}_total {help_text}")
+        lines.append(f"# TYPE saju_{name}_total counter")
+        keys = sorted(k for k in counters if k[0] == name) or [(name, ())]
+        for key in keys:
+            lines.append(f"{_label(f'saju_{name}_total', key[1])} {counters.get(key, 0)}")
+    for name, help_text in GAUGES.items():
+        keys = sorted(k for k in gauges if k[0] == name)
+        if not keys: continue
+        lines.append(f"# HELP saju_{name} {help_text}")
+        lines.append(f"# TYPE saju_{name} gauge")
+        for key in keys:
+            lines.append(f"{_label(f'saju_{name}', key[1])} {gauges[key]:g}")
+    lines.append("# HELP saju_stage_seconds 단계별 소요 시간")
+    lines.append("# TYPE saju_stage_seconds histogram")
+    for stage in sorted(stages):
+        row = stages[stage]
+        cumulative = 0
+        for bound, count in zip(BUCKETS, row):
+            cumulative += count
+            lines.append(f'saju_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+        lines.append(f'saju_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {row[-1]}')
+        lines.append(f'saju_stage_seconds_sum{{stage="{stage}"}} {row[-2]:.9f}')
+        lines.append(f'saju_stage_seconds_count{{stage="{stage}"}} {row[-1]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path=None):
+    """Prometheus 텍스트 파일을 원자적으로 씁니다 (임시 파일 → rename). 경로가 없으면 아무것도 하지 않음."""
+    path = path or os.environ.get("SAJU_METRICS_FILE")
+    if not path or not ENABLED: return None
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+    return path
+
+
+def serve(port, host="0.0.0.0"):
+    """/metrics 를 내보내는 HTTP 서버를 데몬 스레드로 띄웁니다. 프로세스당 한 번만 실행."""
+    global _server
+    with _lock:
+        if _server is not None: return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, name="saju-metrics", daemon=True).start()
+    return _server
+
+
+def configure_from_env():
+    """SAJU_METRICS 를 다시 읽고, SAJU_METRICS_PORT 가 있으면 계측을 켜고 엔드포인트를 띄웁니다. 여러 번 불러도 안전."""
+    if "SAJU_METRICS" in os.environ: set_enabled(_env_enabled())
+    port = os.environ.get("SAJU_METRICS_PORT")
+    if port:
+        enable()
+        try: serve(int(port))
+        except OSError: pass  # 다른 프로세스가 이미 포트를 쓰는 중
+    return ENABLED
+
+
+def main(argv=None):
+    import argparse
+    import random
+    parser = argparse.ArgumentParser(description="임의 입력으로 계측을 켜고 Prometheus 텍스트를 출력")
+    parser.add_argument("--sample", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # python -m 으로 실행하면 이 파일은 __main__ 이므로 엔진이 쓰는 saju.metrics 를 따로 불러옵니다.
+    from . import metrics
+    from .engine import SajuEngine
+    metrics.enable()
+    engine = SajuEngine()
+    rng = random.Random(args.seed)
+    for _ in range(args.sample):
+        engine.calculate(rng.randint(1900, 2100), rng.randint(1, 12), rng.randint(1, 28),
+                         rng.randint(0, 23), rng.randint(0, 59), rng.choice(["남성", "여성"]))
+    sys.stdout.write(metrics.render())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
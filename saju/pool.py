@@ -0,0 +1,270 @@
+"""
+UI 공용 계산 풀 (single-flight)
+
+Streamlit 세션 스레드가 캐시에 없는 차트를 직접 계산하지 않고, 프로세스 전체가
+함께 쓰는 작업 풀에 맡깁니다. 같은 입력(양력 일시, 성별)이 이미 계산 중이면
+새로 보내지 않고 그 계산이 끝나기를 함께 기다리며(single-flight), 결과는
+ChartCache 에 넣어 다음 요청부터는 캐시에서 바로 꺼냅니다.
+
+기다리는 시간은 timeout 초까지이며, 넘으면 PoolTimeout 을 올리고 계산은 뒤에서
+계속됩니다(끝나면 캐시에 들어가므로 다시 누르면 바로 나옴). 계산 대기가 max_pending 을
+넘으면 PoolBusy 로 바로 돌려보냅니다. 계산 중 오류나 작업 프로세스 중단, 취소는 PoolError 로
+바꾸며, 세 예외(PoolTimeout / PoolBusy 는 PoolError 의 하위 클래스) 모두 화면에 그대로 보여 줄
+문구를 담습니다. 작업자에서 기록된 단계 시간은 결과와 함께 돌아와 호출한 스레드의 trace 에 더해집니다.
+
+  SAJU_POOL_WORKERS=2      작업 스레드(또는 프로세스) 수
+  SAJU_POOL_PROCESSES=1    스레드 대신 작업 프로세스 사용 (GIL 을 나눠 쓰지 않음). streamlit run 아래에서는
+                           작업 프로세스가 페이지 스크립트를 한 번 빈 화면으로 불러오므로 기본은 스레드입니다.
+  SAJU_POOL_TIMEOUT=10     요청 하나가 기다리는 최대 시간 (초)
+  SAJU_POOL_MAX_PENDING=256
+
+    python -m saju.pool --sessions 64 --dates 8 --processes
+"""
+import datetime
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from . import metrics
+from .cache import cache_key, get_default_cache, with_name
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_PENDING = 256
+
+
+class PoolError(Exception):
+    pass
+
+
+class PoolTimeout(PoolError):
+    pass
+
+
+class PoolBusy(PoolError):
+    pass
+
+
+# ==========================================
+# 1. 작업 프로세스
+# ==========================================
+_ENGINE = None
+
+
+def _init_worker():
+    global _ENGINE
+    from .engine import SajuEngine
+    _ENGINE = SajuEngine()
+
+
+def _calculate_chart(birth):
+    """(Chart, 단계 시간/카운터 trace). trace 는 요청한 세션의 계측 패널에 더해집니다."""
+    if _ENGINE is None: _init_worker()
+    with metrics.trace() as collected:
+        chart = _ENGINE.calculate_chart(*birth)
+    return chart, collected
+
+
+def _mp_context():
+    # Streamlit 서버는 여러 스레드가 도는 프로세스라 fork 대신 forkserver(없으면 spawn)로 띄웁니다.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+# ==========================================
+# 2. 풀
+# ==========================================
+class ChartPool:
+    def __init__(self, cache=None, workers=DEFAULT_WORKERS, processes=False, timeout=DEFAULT_TIMEOUT,
+                 max_pending=DEFAULT_MAX_PENDING):
+        self.cache = cache if cache is not None else get_default_cache()
+        self.workers = max(1, workers)
+        self.processes = processes
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor = None
+        self._inflight = {}  # cache_key → Future (계산 중인 입력마다 하나)
+        self._waiters = 0
+        self._lock = threading.Lock()
+        self.counters = {"computed": 0, "merged": 0, "timeouts": 0, "rejected": 0, "errors": 0}
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=_mp_context(), initializer=_init_worker)
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="saju-pool")
+        return self._executor
+
+    def _publish(self):
+        metrics.set_gauge("pool_pending", len(self._inflight))
+        metrics.set_gauge("pool_waiters", self._waiters)
+
+    def _count(self, result):
+        self.counters[result] += 1
+        metrics.inc("pool_requests", result=result)
+
+    def submit(self, birth):
+        """(year, month, day, hour, minute, gender) 계산 Future. 같은 입력이 계산 중이면 그 Future 를 함께 씁니다."""
+        key = cache_key(*birth)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._count("merged")
+                return future
+            chart = self.cache.peek(key)
+            if chart is not None:
+                # 캐시를 본 뒤 여기 오기 전에 같은 입력의 계산이 막 끝난 경우
+                self._count("merged")
+                future = Future()
+                future.set_result((chart, None))
+                return future
+            if len(self._inflight) >= self.max_pending:
+                self._count("rejected")
+                raise PoolBusy("지금 요청이 많아 잠시 계산을 받을 수 없습니다. 잠시 후 다시 시도해 주세요.")
+            try:
+                future = self._get_executor().submit(_calculate_chart, birth)
+            except BrokenProcessPool:
+                # 작업 프로세스가 죽었으면 남은 풀을 정리하고 새로 만듭니다.
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                future = self._get_executor().submit(_calculate_chart, birth)
+            self._inflight[key] = future
+            self._count("computed")
+            self._publish()
+        future.add_done_callback(lambda f: self._finish(key, f))
+        return future
+
+    def _finish(self, key, future):
+        chart = error = None
+        if not future.cancelled():
+            error = future.exception()
+            if error is None: chart, _ = future.result()
+        if chart is not None: self.cache.put(key, chart)
+        with self._lock:
+            if self._inflight.get(key) is future: del self._inflight[key]
+            if error is not None: self._count("errors")
+            self._publish()
+
+    def get_chart(self, year, month, day, hour, minute, gender, name="사용자", timeout=None):
+        """
+        ChartCache.get_chart 와 같은 결과. 캐시에 없으면 풀에서 계산하며 timeout 초까지 기다립니다.
+        잘못된 날짜면 None, 시간 초과는 PoolTimeout, 대기열이 가득 차면 PoolBusy,
+        계산 오류 / 작업 프로세스 중단 / 취소는 PoolError.
+        """
+        try:
+            datetime.datetime(year, month, day, hour, minute)
+        except ValueError: return None
+        birth = (year, month, day, hour, minute, gender)
+        chart = self.cache.get(cache_key(*birth))
+        if chart is not None: return with_name(chart, name, gender)
+        try:
+            future = self.submit(birth)
+        except PoolError:
+            raise
+        except Exception as e:
+            raise PoolError(f"계산을 시작하지 못했습니다 ({type(e).__name__}). 잠시 후 다시 시도해 주세요.") from e
+        with self._lock:
+            self._waiters += 1
+            self._publish()
+        try:
+            chart, collected = future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            with self._lock: self._count("timeouts")
+            raise PoolTimeout("계산이 평소보다 오래 걸리고 있습니다. 잠시 후 다시 눌러 주세요. "
+                              "(계산은 계속 진행 중이며 끝나면 바로 보여 드립니다.)") from None
+        except CancelledError:
+            raise PoolError("계산이 취소되었습니다. 다시 시도해 주세요.") from None
+        except BrokenProcessPool as e:
+            raise PoolError("계산 작업자가 중단되었습니다. 다시 시도해 주세요.") from e
+        except Exception as e:
+            raise PoolError(f"계산 중 오류가 발생했습니다 ({type(e).__name__}).") from e
+        finally:
+            with self._lock:
+                self._waiters -= 1
+                self._publish()
+        metrics.merge_trace(collected)
+        return with_name(chart, name, gender)
+
+    def stats(self):
+        with self._lock:
+            out = dict(self.counters)
+            out["pending"] = len(self._inflight)
+            out["waiters"] = self._waiters
+        out["workers"] = self.workers
+        out["processes"] = self.processes
+        return out
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None: executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_pool():
+    """프로세스 전체에서 공유하는 풀 (캐시는 get_default_cache())."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = ChartPool(workers=int(os.environ.get("SAJU_POOL_WORKERS", DEFAULT_WORKERS)),
+                                 processes=os.environ.get("SAJU_POOL_PROCESSES", "") not in ("", "0"),
+                                 timeout=float(os.environ.get("SAJU_POOL_TIMEOUT", DEFAULT_TIMEOUT)),
+                                 max_pending=int(os.environ.get("SAJU_POOL_MAX_PENDING", DEFAULT_MAX_PENDING)))
+    return _DEFAULT
+
+
+# ==========================================
+# 3. 몰림 재현 도구
+# ==========================================
+def main(argv=None):
+    import argparse
+    import random
+    parser = argparse.ArgumentParser(description="같은 생년월일이 한꺼번에 몰릴 때의 풀 동작 재현")
+    parser.add_argument("--sessions", type=int, default=64, help="동시에 요청하는 세션(스레드) 수")
+    parser.add_argument("--dates", type=int, default=8, help="세션들이 고르는 서로 다른 생년월일 수")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--processes", action="store_true", help="스레드 대신 작업 프로세스 사용")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # python -m 으로 실행하면 이 파일은 __main__ 이므로 saju.pool 의 ChartPool 을 씁니다.
+    from .cache import ChartCache
+    from .pool import ChartPool, PoolError as Failed
+    rng = random.Random(args.seed)
+    dates = [(rng.randint(1950, 2010), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), 0,
+              rng.choice(["남성", "여성"])) for _ in range(args.dates)]
+    pool = ChartPool(ChartCache(path=None), workers=args.workers, processes=args.processes, timeout=args.timeout)
+    pool.get_chart(2000, 1, 1, 0, 0, "남성")  # 작업자 띄우기
+    latencies, failures = [], []
+    barrier = threading.Barrier(args.sessions)
+
+    def session(k):
+        barrier.wait()
+        started = time.perf_counter()
+        try: pool.get_chart(*dates[k % len(dates)], name=f"세션{k}")
+        except Failed as e: failures.append(type(e).__name__)
+        latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=session, args=(k,)) for k in range(args.sessions)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    pool.shutdown()
+    latencies.sort()
+    print(f"세션 {args.sessions}개 / 생년월일 {args.dates}개: p50 {latencies[len(latencies) // 2] * 1e3:.1f}ms, "
+          f"max {latencies[-1] * 1e3:.1f}ms, 실패 {len(failures)}")
+    print(pool.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
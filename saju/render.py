@@ -0,0 +1,74 @@
+"""
+화면용 HTML 조각 캐시
+
+리포트 카드는 (연도, 일간) 마다, 원국 카드는 (기둥 이름, 간지, 십신, 12운성) 마다
+결과가 하나뿐이므로 처음 만들 때 한 번만 문자열을 조립하고 이후에는 그대로 돌려줍니다.
+스트림릿이 다시 실행될 때 새로 넣는 값은 이름(헤더)과 차트별 기둥 조합뿐입니다.
+"""
+from functools import lru_cache
+
+from .reports import get_store
+
+# 리포트 카드 순서 (or00.py 의 2행 x 2열 + 1행 배치)
+REPORT_CARDS = ("summary", "score", "wealth", "career", "timing", "qimen")
+
+
+@lru_cache(maxsize=None)
+def report_cards(year, day_gan_idx):
+    """(연도, 일간) 리포트의 카드별 HTML. REPORT_CARDS 순서의 튜플."""
+    _, r = get_store().entry(year, day_gan_idx)
+    keywords = " ".join([f"<span class='keyword-badge'>{k}</span>" for k in r['summary']['keywords']])
+    return (f"""
+            <div class="report-card">
+                <div class="card-title">🔑 올해의 핵심 키워드</div>
+                <div style="margin-bottom:10px;">
+                    {keywords}
+                </div>
+                <p>{r['summary']['desc']}</p>
+            </div>
+            """, f"""
+            <div class="report-card" style="text-align:center;">
+                <div class="card-title">🏆 종합 운세</div>
+                <div class="score-text">{r['summary']['score']}점</div>
+                <progress value="{r['summary']['score']}" max="100" style="width:100%"></progress>
+            </div>
+            """, f"""
+            <div class="report-card">
+                <div class="card-title">💰 재물 & 투자 전략</div>
+                {r['wealth']}
+            </div>
+            """, f"""
+            <div class="report-card">
+                <div class="card-title">🏢 직업 & 커리어 전략</div>
+                {r['career']}
+            </div>
+            """, f"""
+            <div class="report-card" style="border-left-color: #28a745;">
+                <div class="card-title">📅 월별 운세 타이밍</div>
+                {r['timing']}
+            </div>
+            """, f"""
+            <div class="report-card" style="border-left-color: #6610f2; background-color: #f3e5f5;">
+                <div class="card-title">🧭 기문둔갑(奇門遁甲) 전략</div>
+                <p><strong>📍 행운의 방위:</strong> <span class="highlight">{r['qimen']['dir']}</span></p>
+                <p><strong>⚔️ 행동 지침:</strong> {r['qimen']['action']}</p>
+                <p><strong>🍀 개운 컬러:</strong> {r['qimen']['color']}</p>
+            </div>
+            """)
+
+
+@lru_cache(maxsize=4096)
+def pillar_card(title, ganji, sibsin, unseong):
+    return f"""
+                <div style='text-align:center; padding:15px; background-color:#f8f9fa; border-radius:10px; border:1px solid #ddd;'>
+                    <strong>{title}</strong><br>
+                    <h2 style='margin:5px 0; color:#333;'>{ganji}</h2>
+                    <span style='color:grey; font-size:0.9em;'>{sibsin}</span><br>
+                    <span style='color:blue; font-size:0.9em;'>{unseong}</span>
+                </div>
+                """
+
+
+@lru_cache(maxsize=1024)
+def daewoon_cell(text):
+    return f"<div style='text-align:center; border:1px solid #eee; border-radius:5px; padding:5px; font-size:0.8em;'>{text}</div>"
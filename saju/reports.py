@@ -0,0 +1,152 @@
+"""
+연간 전략 리포트 본문
+
+리포트 본문은 (연도, 일간 천간) 마다 하나씩, data/reports/<연도>.json 원본을
+컴파일한 data/reports.bin 에 들어 있습니다. 처음 조회할 때 mmap 으로 열므로
+여러 프로세스가 같은 페이지를 공유하고, 본문은 필요한 항목만 그때그때 풀어 씁니다.
+이름이 들어가는 헤더는 report_header() 로 출력 직전에 만듭니다.
+
+새 연도 추가는 데이터 작업입니다: data/reports/2027.json 을 같은 형식으로 만들고
+다시 컴파일한 뒤 검사합니다. 연도를 따로 정하지 않은 조회(Chart.to_dict 의 report,
+화면 제목)는 reports.bin 에 들어 있는 가장 최근 연도(latest_year())를 씁니다.
+
+    python -m saju.reports build
+    python -m saju.reports check
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from .tables import CHEON
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SOURCE_DIR = os.path.join(DATA_DIR, "reports")
+STORE_PATH = os.path.join(DATA_DIR, "reports.bin")
+
+# 헤더: 매직, 형식 버전, 항목 수, 본문 CRC32(내용 리비전)
+_MAGIC = b"SJRP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+# 색인: 연도, 천간 인덱스, 예비, 본문 오프셋, 본문 길이. 본문은 [제목, 리포트] UTF-8 JSON
+_ENTRY = struct.Struct("<HBBII")
+
+
+class ReportStore:
+    def __init__(self, buf):
+        self._buf = buf
+        magic, version, n, self.revision = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("지원하지 않는 리포트 데이터 형식입니다")
+        self._index = {}
+        for k in range(n):
+            year, stem, _, offset, length = _ENTRY.unpack_from(buf, _HEADER.size + k * _ENTRY.size)
+            self._index[year, stem] = (offset, length)
+        self.years = sorted({year for year, _ in self._index})
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        with open(path, "rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                buf = f.read()
+        return cls(buf)
+
+    def raw(self, year, day_gan_idx):
+        """(연도, 일간) 항목의 JSON 바이트. 없는 연도면 KeyError."""
+        try: offset, length = self._index[year, day_gan_idx]
+        except KeyError: raise KeyError(f"{year}년 {CHEON[day_gan_idx]} 리포트가 없습니다") from None
+        return self._buf[offset:offset + length]
+
+    def entry(self, year, day_gan_idx):
+        """(제목, 리포트 본문 dict). 호출할 때마다 새로 풀어 쓰므로 고쳐 써도 안전합니다."""
+        title, body = json.loads(self.raw(year, day_gan_idx))
+        return title, body
+
+
+def compile_sources(source_dir=SOURCE_DIR):
+    """원본 JSON 들 → reports.bin 바이트."""
+    entries = []
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            src = json.load(f)
+        missing = [c for c in CHEON if c not in src["reports"]]
+        if missing: raise ValueError(f"{path}: 천간 {''.join(missing)} 리포트가 없습니다")
+        for stem, body in src["reports"].items():
+            raw = json.dumps([src["title"], body], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entries.append((src["year"], CHEON.index(stem), raw))
+    entries.sort(key=lambda e: e[:2])
+
+    blob = b"".join(raw for _, _, raw in entries)
+    base = _HEADER.size + len(entries) * _ENTRY.size
+    out = [_HEADER.pack(_MAGIC, _VERSION, len(entries), zlib.crc32(blob))]
+    offset = base
+    for year, stem, raw in entries:
+        out.append(_ENTRY.pack(year, stem, 0, offset, len(raw)))
+        offset += len(raw)
+    out.append(blob)
+    return b"".join(out)
+
+
+_STORE = None
+
+
+def get_store():
+    global _STORE
+    if _STORE is None: _STORE = ReportStore.load()
+    return _STORE
+
+
+def report_header(name, title):
+    return f"{name}님의 {title}"
+
+
+def latest_year():
+    """reports.bin 에 있는 가장 최근 연도 (기본 리포트 연도)."""
+    return get_store().years[-1]
+
+
+def build_report(day_gan_idx, name, year=None):
+    """일간 인덱스의 리포트 dict (호출할 때마다 새 사본). year 를 생략하면 latest_year()."""
+    if year is None: year = latest_year()
+    title, body = get_store().entry(year, day_gan_idx)
+    report = {'year': year, 'header': report_header(name, title)}
+    report.update(body)
+    return report
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="연간 리포트 데이터 컴파일/검사")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="data/reports/*.json → reports.bin")
+    p_build.add_argument("--out", default=STORE_PATH)
+    p_check = sub.add_parser("check", help="reports.bin 이 원본 JSON 과 같은지 검사")
+    p_check.add_argument("--path", default=STORE_PATH)
+    args = parser.parse_args(argv)
+
+    data = compile_sources()
+    if args.cmd == "build":
+        tmp = f"{args.out}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, args.out)
+        store = ReportStore(data)
+        print(f"{len(store.years)}개 연도 ({', '.join(map(str, store.years))}) 저장: {args.out} ({len(data)} bytes)")
+        return 0
+
+    with open(args.path, "rb") as f:
+        stored = f.read()
+    if stored != data:
+        print(f"원본과 다릅니다. python -m saju.reports build 로 다시 만드세요: {args.path}")
+        return 1
+    print(f"일치: {args.path} (리비전 {ReportStore(stored).revision:08x})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
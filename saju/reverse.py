@@ -0,0 +1,289 @@
+"""
+역색인: 네 기둥(60갑자) → 출생 시각 구간
+
+1900-01-01 ~ 2100-12-31 (한국 표준시, 분 단위)을 네 기둥이 바뀌는 지점에서 잘라
+구간 배열로 만들고, 기둥별 60갑자 값 → 구간 번호 목록(posting list)을 둡니다.
+자르는 지점은 매일 00:00(일주), 시주 판정이 바뀔 수 있는 매시 30분, 절기 경계
+(월주·년주)이며, 각 구간의 기둥은 saju.vector.pillar_arrays 로 계산하므로
+SajuEngine.calculate 와 같은 규칙(子時 23:30~01:30 포함)을 따릅니다. 기둥이 바뀌지
+않는 지점은 앞 구간에 합쳐집니다.
+
+일부 기둥만 지정해도 되고(나머지는 아무 값), 이어 붙은 구간은 하나로 합쳐서
+[시작, 끝) 시각 쌍으로 돌려줍니다. 끝 시각은 포함하지 않습니다.
+
+색인(약 100만 구간)은 만드는 데 몇 초가 걸리므로 data/reverse_index.npz 에 미리 만들어
+두고(구간 길이 uint16 차분 + 압축) 처음 조회할 때 한 번만 읽습니다. 파일에는 만들 때 쓴
+절기 테이블의 CRC32 가 들어 있어, solar_terms.bin 을 다시 만들었거나 파일이 없으면 읽지
+않고 그 자리에서 새로 만듭니다.
+
+    from saju.reverse import get_index
+    idx = get_index()
+    for start, end in idx.query(year="庚午", month="戊子", day="甲辰", hour="丙寅"):
+        print(start, end)
+    idx.count(day="甲辰", hour="丙寅", start=datetime.datetime(1980, 1, 1), end=datetime.datetime(2000, 1, 1))
+
+    python -m saju.reverse 庚午 戊子 甲辰 丙寅
+    python -m saju.reverse '*' '*' 甲辰 丙寅 --from 1980-01-01 --to 1999-12-31 --format csv
+    python -m saju.reverse --build
+"""
+import datetime
+import os
+import sys
+import zlib
+
+import numpy as np
+
+from . import solar_terms
+from .tables import GANJI_NAMES
+from .vector import pillar_arrays
+
+PILLARS = ("year", "month", "day", "hour")
+START = datetime.datetime(1900, 1, 1)
+END = datetime.datetime(2101, 1, 1)
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reverse_index.npz")
+_VERSION = 1
+
+_EPOCH = np.datetime64("1900-01-01T00:00", "m")
+_KST_OFFSET_MIN = 9 * 60
+# 하루 안에서 기둥이 바뀔 수 있는 지점 (분): 00:00, 00:30, 01:30, ..., 23:30
+_DAY_CUTS = np.array([0] + [30 + 60 * k for k in range(24)], dtype=np.int64)
+_GANJI_LOOKUP = {name: i for i, name in enumerate(GANJI_NAMES)}
+WILDCARDS = ("", "*", "?", "-")
+
+
+def _minutes(dt):
+    return int((np.datetime64(dt, "m") - _EPOCH).astype(np.int64))
+
+
+def parse_ganji(value):
+    """'甲辰' / 60갑자 인덱스(0~59) / None·'*' → 인덱스 또는 None."""
+    if value is None: return None
+    if isinstance(value, (int, np.integer)):
+        if not 0 <= value < 60: raise ValueError(f"60갑자 인덱스는 0~59: {value}")
+        return int(value)
+    value = str(value).strip()
+    if value in WILDCARDS: return None
+    if value.isdigit(): return parse_ganji(int(value))
+    if value not in _GANJI_LOOKUP: raise ValueError(f"알 수 없는 간지: {value!r}")
+    return _GANJI_LOOKUP[value]
+
+
+def parse_pattern(year=None, month=None, day=None, hour=None):
+    """기둥별 간지 → ((기둥 번호, 60갑자 인덱스), ...). 지정하지 않은 기둥은 빠집니다."""
+    values = (parse_ganji(year), parse_ganji(month), parse_ganji(day), parse_ganji(hour))
+    return tuple((p, v) for p, v in enumerate(values) if v is not None)
+
+
+def _source_revision():
+    """색인을 만든 절기 테이블(겉보기 프레임 경계)의 CRC32."""
+    return zlib.crc32(solar_terms.get_table().bounds[solar_terms.FRAME_APPARENT].tobytes())
+
+
+class ReverseIndex:
+    def __init__(self, starts, end, ganji):
+        self.starts = starts        # 구간 시작 (1900-01-01 00:00 KST 기준 분, int64, 오름차순)
+        self.end = end              # 마지막 구간의 끝 (분)
+        self.ganji = ganji          # (4, 구간 수) uint8 — 년/월/일/시주 60갑자 인덱스
+        self._postings = [None] * 4
+
+    @classmethod
+    def build(cls, start=START, end=END):
+        start_min, end_min = _minutes(start), _minutes(end)
+        days = np.arange(start_min // 1440, -(-end_min // 1440), dtype=np.int64)
+        cuts = (days[:, None] * 1440 + _DAY_CUTS).ravel()
+
+        # 절기 경계 (겉보기 프레임): 경계 시각 이후 첫 분부터 다음 절기
+        table = solar_terms.get_table()
+        bounds = np.frombuffer(table.bounds[solar_terms.FRAME_APPARENT], dtype=np.float64)
+        term_cuts = np.ceil(bounds / 60.0).astype(np.int64) + _KST_OFFSET_MIN
+        cuts = np.union1d(cuts, term_cuts)
+        cuts = cuts[(cuts >= start_min) & (cuts < end_min)]
+        if cuts[0] != start_min: cuts = np.insert(cuts, 0, start_min)
+
+        p = pillar_arrays(_EPOCH + cuts.astype("timedelta64[m]"))
+        ganji = np.stack([(6 * p[f"{k}_gan"] - 5 * p[f"{k}_ji"]) % 60
+                          for k in ("year", "month", "day", "time")]).astype(np.uint8)
+        # 기둥이 바뀌지 않는 경계(짝수 절기, 시주가 그대로인 매시 30분 등)는 앞 구간에 합침
+        changed = np.ones(len(cuts), dtype=bool)
+        changed[1:] = (ganji[:, 1:] != ganji[:, :-1]).any(axis=0)
+        return cls(cuts[changed], end_min, np.ascontiguousarray(ganji[:, changed]))
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """save() 로 저장한 색인. 형식이 다르거나 지금 절기 테이블로 만든 것이 아니면 ValueError."""
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != _VERSION:
+                raise ValueError(f"지원하지 않는 역색인 형식입니다: {path}")
+            if int(z["revision"]) != _source_revision():
+                raise ValueError(f"절기 테이블이 바뀌어 다시 만들어야 하는 역색인입니다: {path}")
+            starts = np.empty(len(z["steps"]) + 1, dtype=np.int64)
+            starts[0] = z["start"]
+            np.cumsum(z["steps"], dtype=np.int64, out=starts[1:])
+            starts[1:] += starts[0]
+            return cls(starts, int(z["end"]), np.ascontiguousarray(z["ganji"]))
+
+    def save(self, path=INDEX_PATH):
+        # 구간 길이는 최대 120분이므로 uint16 차분으로 저장
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, version=_VERSION, revision=_source_revision(), start=self.starts[0], end=self.end,
+                                steps=np.diff(self.starts).astype(np.uint16), ganji=self.ganji)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _posting(self, pillar):
+        """기둥 하나의 (60갑자 값으로 정렬한 구간 번호, 값별 시작 위치)."""
+        if self._postings[pillar] is None:
+            values = self.ganji[pillar]
+            order = np.argsort(values, kind="stable")
+            offsets = np.searchsorted(values[order], np.arange(61))
+            self._postings[pillar] = (order, offsets)
+        return self._postings[pillar]
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def match(self, pattern, start=None, end=None):
+        """패턴에 맞고 [start, end) 와 겹치는 구간 번호 (오름차순 배열)."""
+        lo_min = _minutes(start) if start is not None else self.starts[0]
+        hi_min = _minutes(end) if end is not None else self.end
+        lo = max(int(np.searchsorted(self.starts, lo_min, side="right")) - 1, 0)
+        hi = int(np.searchsorted(self.starts, hi_min, side="left"))
+        if not pattern: return np.arange(lo, hi)
+
+        # 범위 안에서 가장 짧은 posting list 를 후보로 잡고 나머지 기둥으로 거름
+        best = None
+        for pillar, value in pattern:
+            order, offsets = self._posting(pillar)
+            ids = order[offsets[value]:offsets[value + 1]]
+            ids = ids[np.searchsorted(ids, lo):np.searchsorted(ids, hi)]
+            if best is None or len(ids) < len(best[1]): best = (pillar, ids)
+        ids = best[1]
+        mask = np.ones(len(ids), dtype=bool)
+        for pillar, value in pattern:
+            if pillar != best[0]: mask &= self.ganji[pillar][ids] == value
+        return ids[mask]
+
+    def query_minutes(self, pattern, start=None, end=None):
+        """이어 붙은 구간을 합친 (시작 분 배열, 끝 분 배열). start/end 로 잘라 냅니다."""
+        ids = self.match(pattern, start, end)
+        if len(ids) == 0: return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        first = np.ones(len(ids), dtype=bool)
+        first[1:] = np.diff(ids) != 1
+        last = np.ones(len(ids), dtype=bool)
+        last[:-1] = first[1:]
+        seg_ends = np.append(self.starts[1:], self.end)
+        starts, ends = self.starts[ids[first]], seg_ends[ids[last]]
+        if start is not None: starts = np.maximum(starts, _minutes(start))
+        if end is not None: ends = np.minimum(ends, _minutes(end))
+        return starts, ends
+
+    def query(self, year=None, month=None, day=None, hour=None, start=None, end=None, chunk_size=10000):
+        """맞는 (시작, 끝) datetime 쌍을 하나씩 내보내는 제너레이터 (chunk_size 개씩 변환)."""
+        starts, ends = self.query_minutes(parse_pattern(year, month, day, hour), start, end)
+        for i in range(0, len(starts), chunk_size):
+            s = (_EPOCH + starts[i:i + chunk_size].astype("timedelta64[m]")).tolist()
+            e = (_EPOCH + ends[i:i + chunk_size].astype("timedelta64[m]")).tolist()
+            yield from zip(s, e)
+
+    def count(self, year=None, month=None, day=None, hour=None, start=None, end=None):
+        return len(self.query_minutes(parse_pattern(year, month, day, hour), start, end)[0])
+
+    def pillars_at(self, dt):
+        """dt 가 속한 구간의 (년주, 월주, 일주, 시주) 간지 문자열. 범위 밖이면 None."""
+        m = _minutes(dt)
+        if not self.starts[0] <= m < self.end: return None
+        i = int(np.searchsorted(self.starts, m, side="right")) - 1
+        return tuple(GANJI_NAMES[v] for v in self.ganji[:, i])
+
+
+_INDEX = None
+
+
+def get_index():
+    """1900~2100 역색인을 처음 호출될 때 한 번만 읽습니다. 저장된 파일을 쓸 수 없으면 새로 만듭니다."""
+    global _INDEX
+    if _INDEX is None:
+        try:
+            _INDEX = ReverseIndex.load()
+        except (FileNotFoundError, ValueError):
+            _INDEX = ReverseIndex.build()
+    return _INDEX
+
+
+# ==========================================
+# 검증 / 조회 도구
+# ==========================================
+def check_index(index, samples=2000, seed=0):
+    """임의 시각의 색인 결과를 SajuEngine.calculate 와 비교. 불일치 목록을 반환."""
+    import random
+    from .engine import SajuEngine
+    engine = SajuEngine()
+    rng = random.Random(seed)
+    span = index.end - int(index.starts[0])
+    points = [START + datetime.timedelta(minutes=int(index.starts[0]) + rng.randrange(span)) for _ in range(samples)]
+    # 구간 경계 바로 앞뒤 분도 검사
+    for i in rng.sample(range(1, len(index)), min(samples, len(index) - 1)):
+        edge = START + datetime.timedelta(minutes=int(index.starts[i]))
+        points += [edge, edge - datetime.timedelta(minutes=1)]
+    mismatches = []
+    for d in points:
+        want = tuple(p["ganji"] for p in engine.calculate(d.year, d.month, d.day, d.hour, d.minute, "남성")["pillars"])
+        got = index.pillars_at(d)
+        if got != want: mismatches.append((d, got, want))
+    return len(points), mismatches
+
+
+def main(argv=None):
+    import argparse
+    import csv
+    import json
+    import time
+    parser = argparse.ArgumentParser(description="네 기둥 → 출생 시각 구간 조회 ('*' 는 아무 값)")
+    parser.add_argument("pattern", nargs="*", help="년주 월주 일주 시주 순서 (예: 庚午 戊子 甲辰 丙寅)")
+    parser.add_argument("--from", dest="start", help="조회 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="조회 종료일 (YYYY-MM-DD, 그날 포함)")
+    parser.add_argument("--format", choices=["text", "csv", "ndjson"], default="text")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--check", type=int, metavar="N", help="임의 N 개 시각으로 색인을 엔진과 비교")
+    parser.add_argument("--build", nargs="?", const=INDEX_PATH, metavar="PATH", help="색인을 새로 만들어 저장")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.build:
+        index = ReverseIndex.build()
+        index.save(args.build)
+        print(f"색인 {len(index)}개 구간 저장: {args.build} ({time.perf_counter() - started:.2f}초)")
+        return 0
+    index = get_index()
+    print(f"색인 {len(index)}개 구간 ({time.perf_counter() - started:.2f}초)", file=sys.stderr)
+    if args.check:
+        n, mismatches = check_index(index, args.check)
+        for m in mismatches[:20]: print("불일치:", m)
+        print(f"검사 {n}개 시각, 불일치 {len(mismatches)}건")
+        return 1 if mismatches else 0
+
+    values = (args.pattern + ["*"] * 4)[:4]
+    start = datetime.datetime.fromisoformat(args.start) if args.start else None
+    end = datetime.datetime.fromisoformat(args.end) + datetime.timedelta(days=1) if args.end else None
+    started = time.perf_counter()
+    results = index.query(*values, start=start, end=end)
+    writer = csv.writer(sys.stdout) if args.format == "csv" else None
+    if writer: writer.writerow(["start", "end"])
+    count = 0
+    for s, e in results:
+        if args.limit is not None and count >= args.limit: break
+        if writer: writer.writerow([s.isoformat(), e.isoformat()])
+        elif args.format == "ndjson": print(json.dumps({"start": s.isoformat(), "end": e.isoformat()}))
+        else: print(f"{s:%Y-%m-%d %H:%M} ~ {e:%Y-%m-%d %H:%M}")
+        count += 1
+    print(f"{count}개 구간 ({(time.perf_counter() - started) * 1e3:.1f}ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+사주 계산 HTTP JSON 서비스 (asyncio)
+
+파트너 시스템이 Streamlit 을 거치지 않고 엔진을 직접 부르는 경로입니다.
+동시에 들어온 요청은 마이크로 배치로 모아 saju.vector 로 한 번에 계산합니다.
+계산 슬롯이 비어 있으면 바로 보내고, 모두 바쁜 동안 들어온 요청은 다음 배치(최대
+max_batch 건)에 함께 실립니다. 계산을 기다리는 요청이 max_pending 을 넘거나 열린
+연결이 max_connections 를 넘으면 곧바로 503 (Retry-After) 으로 거절합니다.
+
+  GET|POST /v1/chart    SajuEngine.calculate 와 같은 dict
+  GET|POST /v1/daewoon  대운 방향 / 대운수 / 8개 대운
+  GET|POST /v1/report   연간 리포트 (report_year 로 연도 선택, 기본 리포트 데이터의 최신 연도)
+  GET      /healthz     상태, 대기 요청 수, 계산 중 배치 수
+  GET      /metrics     Prometheus 텍스트 (saju.metrics)
+
+입력은 쿼리 문자열이나 JSON 본문으로 받고 필드는 saju.batch 와 같습니다
+(name, year, month, day, hour, minute, gender, calendar).
+
+    python -m saju.server --port 8080 --workers 4
+    curl 'localhost:8080/v1/chart?year=1990&month=1&day=1&hour=12&gender=남성'
+    python bench/loadgen.py --spawn --concurrency 1,16,64,256
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from . import metrics
+from .batch import MIN_YEAR, RecordError, parse_record
+from .chart import DAEWOON_FAILED, MAX_PACKED_YEAR, Chart
+from .reports import build_report, latest_year
+
+DEFAULT_PORT = 8080
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_PENDING = 4096
+DEFAULT_MAX_CONNECTIONS = 1024
+MAX_BODY = 64 * 1024
+HEADER_TIMEOUT = 30.0  # keep-alive 연결이 다음 요청 없이 기다리는 최대 시간 (초)
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented",
+               503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    pass
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ==========================================
+# 1. 마이크로 배치
+# ==========================================
+def _compute_packed(births):
+    """작업 프로세스용: Chart 대신 pack() 정수만 돌려보내 직렬화 비용을 줄입니다."""
+    from .vector import calculate_charts
+    return [chart.pack() for chart in calculate_charts(births)]
+
+
+def _compute_charts(births):
+    from .vector import calculate_charts
+    return calculate_charts(births)
+
+
+class MicroBatcher:
+    """
+    submit(birth) 으로 Chart 를 기다립니다. 같은 배치 안의 같은 입력은 한 번만 계산합니다.
+    workers=0 이면 스레드 하나에서, 그 외에는 작업 프로세스 workers 개에서 배치를 계산하며
+    동시에 계산 중인 배치 수도 같은 수(스레드는 1)로 제한됩니다.
+    """
+
+    def __init__(self, workers=0, max_batch=DEFAULT_MAX_BATCH, max_delay=0.0, max_pending=DEFAULT_MAX_PENDING):
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.pending = 0
+        self.inflight = 0
+        self._queue = collections.deque()
+        self._wakeup = None
+        self._slots = None
+        self._executor = None
+        self._task = None
+
+    def start(self):
+        if self.workers > 0: self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else: self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="saju-batch")
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(max(1, self.workers))
+        self._task = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        if self._task is not None: self._task.cancel()
+        if self._executor is not None: self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def overloaded(self):
+        return self.pending >= self.max_pending
+
+    def submit(self, birth):
+        """(year, month, day, hour, minute, gender) → Chart 를 돌려줄 Future. 대기열이 차면 Overloaded."""
+        if self.overloaded: raise Overloaded()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((birth, future, time.perf_counter()))
+        self.pending += 1
+        metrics.set_gauge("queue_depth", self.pending)
+        self._wakeup.set()
+        return future
+
+    async def _dispatch(self):
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            if self.max_delay > 0 and len(self._queue) < self.max_batch: await asyncio.sleep(self.max_delay)
+            # 빈 계산 슬롯을 기다리는 동안 쌓인 요청이 이번 배치에 함께 실립니다.
+            await self._slots.acquire()
+            batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+            self.pending -= len(batch)
+            self.inflight += 1
+            metrics.set_gauge("queue_depth", self.pending)
+            metrics.set_gauge("inflight_batches", self.inflight)
+            asyncio.create_task(self._run(batch))
+
+    async def _compute(self, births):
+        loop = asyncio.get_running_loop()
+        if self.workers > 0:
+            packed = await loop.run_in_executor(self._executor, _compute_packed, births)
+            return [Chart.unpack(p) for p in packed]
+        return await loop.run_in_executor(self._executor, _compute_charts, births)
+
+    async def _run(self, batch):
+        started = time.perf_counter()
+        if metrics.ENABLED:
+            for _, _, queued in batch:
+                metrics.observe("queue_wait", started - queued)
+        births = list(dict.fromkeys(birth for birth, _, _ in batch))
+        try:
+            try:
+                charts = await self._compute(births)
+            except Exception:
+                # 한 건 때문에 배치 전체가 실패하지 않도록 한 건씩 다시 계산해 그 요청만 오류로 돌려줍니다.
+                charts = []
+                for birth in births:
+                    try: charts.extend(await self._compute([birth]))
+                    except Exception as e: charts.append(e)
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+            metrics.set_gauge("inflight_batches", self.inflight)
+        if metrics.ENABLED:
+            metrics.observe("batch_compute", time.perf_counter() - started)
+            metrics.inc("microbatches")
+            metrics.inc("microbatch_items", len(births))
+        by_birth = dict(zip(births, charts))
+        for birth, future, _ in batch:
+            if future.done(): continue
+            chart = by_birth[birth]
+            if isinstance(chart, Exception): future.set_exception(chart)
+            else: future.set_result(chart)
+
+
+# ==========================================
+# 2. 요청 처리
+# ==========================================
+def parse_birth(rec):
+    """요청 필드 → 검증된 양력 (year, month, day, hour, minute, gender). 잘못된 입력은 HTTPError(400)."""
+    try:
+        birth = parse_record(rec)
+    except RecordError as e:
+        raise HTTPError(400, str(e)) from None
+    year, month, day, hour, minute, _ = birth
+    # 작업 프로세스는 pack() 정수로 결과를 돌려주므로 연도 상한은 MAX_PACKED_YEAR
+    if not MIN_YEAR <= year <= MAX_PACKED_YEAR: raise HTTPError(400, f"지원 범위 밖의 연도: {year}")
+    try:
+        datetime.datetime(year, month, day, hour, minute)
+    except ValueError:
+        raise HTTPError(400, "잘못된 날짜/시간") from None
+    return birth
+
+
+def daewoon_dict(chart):
+    failed = chart.daewoon_num == DAEWOON_FAILED
+    return {"dir": "순행" if chart.direction == 1 else "역행", "num": 1 if failed else chart.daewoon_num,
+            "list": chart.daewoon_list(), "debug": "절기 탐색 실패" if failed else ""}
+
+
+class SajuService:
+    def __init__(self, batcher, max_connections=DEFAULT_MAX_CONNECTIONS):
+        self.batcher = batcher
+        self.max_connections = max_connections
+        self.connections = 0
+        self.started = time.time()
+        self.routes = {
+            "/v1/chart": self.chart,
+            "/v1/daewoon": self.daewoon,
+            "/v1/report": self.report,
+            "/healthz": self.health,
+            "/metrics": self.metrics_text,
+        }
+
+    async def _chart(self, rec):
+        birth = parse_birth(rec)
+        try:
+            return await self.batcher.submit(birth), birth[5]
+        except Overloaded:
+            metrics.inc("http_rejected", reason="queue_full")
+            raise HTTPError(503, "요청이 많습니다. 잠시 후 다시 시도해 주세요.") from None
+
+    async def chart(self, rec):
+        chart, gender = await self._chart(rec)
+        return 200, chart.to_dict(rec.get("name") or "사용자", gender)
+
+    async def daewoon(self, rec):
+        chart, _ = await self._chart(rec)
+        return 200, daewoon_dict(chart)
+
+    async def report(self, rec):
+        try: year = int(rec.get("report_year") or latest_year())
+        except (TypeError, ValueError): raise HTTPError(400, "report_year 는 정수여야 합니다") from None
+        chart, _ = await self._chart(rec)
+        try:
+            return 200, build_report(chart.day_gan, rec.get("name") or "사용자", year)
+        except KeyError as e:
+            raise HTTPError(404, e.args[0]) from None
+
+    async def health(self, rec):
+        status = "overloaded" if self.batcher.overloaded else "ok"
+        return (503 if status == "overloaded" else 200), {
+            "status": status, "queue_depth": self.batcher.pending, "inflight_batches": self.batcher.inflight,
+            "open_connections": self.connections, "workers": self.batcher.workers,
+            "uptime": round(time.time() - self.started, 1),
+        }
+
+    async def metrics_text(self, rec):
+        return 200, metrics.render()
+
+    # ------------------------------------------
+    # HTTP/1.1 (keep-alive, Content-Length 본문만)
+    # ------------------------------------------
+    async def dispatch(self, method, path, query, body):
+        handler = self.routes.get(path)
+        if handler is None: raise HTTPError(404, f"없는 경로: {path}")
+        if method not in ("GET", "POST"): raise HTTPError(405, f"지원하지 않는 메서드: {method}")
+        rec = dict(parse_qsl(query))
+        if body:
+            try: data = json.loads(body)
+            except ValueError: raise HTTPError(400, "JSON 본문을 읽을 수 없습니다") from None
+            if not isinstance(data, dict): raise HTTPError(400, "JSON 본문은 객체여야 합니다")
+            rec.update(data)
+        return await handler(rec)
+
+    async def handle(self, reader, writer):
+        if self.connections >= self.max_connections:
+            metrics.inc("http_rejected", reason="connections")
+            await _respond(writer, 503, {"error": "연결이 너무 많습니다"}, keep_alive=False)
+            writer.close()
+            return
+        self.connections += 1
+        metrics.set_gauge("open_connections", self.connections)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                    break
+                try:
+                    lines = head.decode("latin-1").split("\r\n")
+                    method, target, version = lines[0].split(" ", 2)
+                    # 퍼센트 인코딩하지 않은 UTF-8 쿼리(한글 성별 등)도 받아 줍니다.
+                    target = target.encode("latin-1").decode("utf-8")
+                except (ValueError, UnicodeDecodeError):
+                    await _respond(writer, 400, {"error": "잘못된 요청 줄"}, keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                path, _, query = target.partition("?")
+                endpoint = path if path in self.routes else "other"
+                try:
+                    if "transfer-encoding" in headers: raise HTTPError(501, "chunked 본문은 지원하지 않습니다")
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY:
+                        keep_alive = False
+                        raise HTTPError(413, f"본문은 {MAX_BODY} 바이트까지")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, path, query, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:  # 계산 중 예상하지 못한 오류도 연결은 살려 둠
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                metrics.inc("http_requests", endpoint=endpoint, status=status)
+                await _respond(writer, status, payload, keep_alive, retry_after=status == 503)
+                if not keep_alive: break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            metrics.set_gauge("open_connections", self.connections)
+            writer.close()
+
+
+async def _respond(writer, status, payload, keep_alive=True, retry_after=False):
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+    head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if retry_after: head.append("Retry-After: 1")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    try: await writer.drain()
+    except ConnectionError: pass
+
+
+# ==========================================
+# 3. 실행
+# ==========================================
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=0, max_batch=DEFAULT_MAX_BATCH, max_delay=0.0,
+                max_pending=DEFAULT_MAX_PENDING, max_connections=DEFAULT_MAX_CONNECTIONS, ready=None):
+    """서버를 띄우고 종료 신호(SIGINT/SIGTERM)까지 실행합니다. ready 는 (host, port) 를 받을 콜백."""
+    batcher = MicroBatcher(workers, max_batch, max_delay, max_pending)
+    batcher.start()
+    service = SajuService(batcher, max_connections)
+    server = await asyncio.start_server(service.handle, host, port, backlog=max_connections)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try: loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError): pass  # Windows / 메인 스레드가 아닌 경우
+    if ready: ready(server.sockets[0].getsockname()[:2])
+    async with server:
+        await stop.wait()
+    await batcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사주 계산 HTTP JSON 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 이면 빈 포트를 골라 출력")
+    parser.add_argument("--workers", type=int, default=0, help="계산 프로세스 수 (0: 계산 스레드 하나)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="마이크로 배치 최대 건수")
+    parser.add_argument("--max-delay-ms", type=float, default=0.0, help="배치를 모으려고 추가로 기다릴 시간 (기본 0: 계산 슬롯이 비면 바로)")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="이보다 많이 밀리면 503")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS)
+    parser.add_argument("--no-metrics", action="store_true", help="계측 끄기 (/metrics 는 빈 값)")
+    args = parser.parse_args(argv)
+
+    # python -m 으로 실행하면 이 파일은 __main__ 이므로, 작업 프로세스로 넘길 함수가
+    # saju.server 이름으로 pickle 되도록 saju.server 의 serve 를 불러 씁니다.
+    from .server import serve as run
+    if not args.no_metrics: metrics.enable()
+
+    def ready(address):
+        print(f"listening on http://{address[0]}:{address[1]} (workers={args.workers}, pid={os.getpid()})", flush=True)
+
+    asyncio.run(run(args.host, args.port, args.workers, args.max_batch, args.max_delay_ms / 1000.0,
+                    args.max_pending, args.max_connections, ready))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+절기(節氣) 경계 테이블
+
+태양 황경이 15° 배수를 지나는 순간(UTC)을 1900~2100년 범위에 대해
+미리 구해 바이너리 파일(data/solar_terms.bin)로 저장해 두고,
+실행 중에는 이분 탐색(O(log n))으로만 조회합니다. ephem 은
+테이블 생성/검증 도구와 테이블 범위 밖 입력에서만 사용합니다.
+
+프레임(기준 춘분점)은 기존 엔진 계산과 동일하게 두 가지를 둡니다.
+  - FRAME_APPARENT : 당일 춘분점 기준 (calculate 의 년주/월주 판정)
+  - FRAME_J2000    : J2000 기준 (get_daewoon_data 의 대운수 계산)
+"""
+import bisect
+import datetime
+import math
+import os
+import struct
+import sys
+from array import array
+
+from . import metrics
+
+FRAME_APPARENT = 0
+FRAME_J2000 = 1
+FRAMES = (FRAME_APPARENT, FRAME_J2000)
+
+# 테이블 시각 표현: 1900-01-01 00:00 UTC 로부터의 경과 초 (float64)
+EPOCH = datetime.datetime(1900, 1, 1)
+EPOCH_EPHEM_DATE = 0.5  # ephem.Date 로 표현한 EPOCH (1899-12-31 12:00 UT 기준 일수)
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "solar_terms.bin")
+
+# 파일 헤더: 매직, 버전, 프레임 수, 첫 경계의 절기 번호(황경/15), 경계 개수
+_MAGIC = b"SJST"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+
+# 기존 get_daewoon_data 의 탐색 단위/한도 (1시간 간격, 최대 1080시간)
+SEARCH_STEP_HOURS = 1
+SEARCH_LIMIT_HOURS = 1080
+
+MEAN_DEG_PER_SEC = 360.0 / (365.2422 * 86400.0)
+
+
+def to_seconds(utc_date):
+    return (utc_date - EPOCH).total_seconds()
+
+
+def from_seconds(seconds):
+    return EPOCH + datetime.timedelta(seconds=seconds)
+
+
+class SolarTermTable:
+    """절기 경계 시각 테이블. bounds[frame][i] 는 황경 ((first_term + i) % 24) * 15° 도달 시각."""
+
+    def __init__(self, first_term, bounds):
+        self.first_term = first_term
+        self.bounds = bounds
+        counts = {len(b) for b in bounds}
+        if len(counts) != 1:
+            raise ValueError("프레임별 경계 개수가 다릅니다.")
+        self.count = counts.pop()
+
+    @classmethod
+    def load(cls, path=TABLE_PATH):
+        with open(path, "rb") as f:
+            raw = f.read()
+        magic, version, n_frames, first_term, count = _HEADER.unpack_from(raw, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"지원하지 않는 절기 테이블 형식입니다: {path}")
+        offset = _HEADER.size
+        bounds = []
+        for _ in range(n_frames):
+            arr = array("d")
+            arr.frombytes(raw[offset:offset + count * 8])
+            if sys.byteorder == "big": arr.byteswap()
+            bounds.append(arr)
+            offset += count * 8
+        return cls(first_term, bounds)
+
+    def save(self, path=TABLE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(self.bounds), self.first_term, self.count))
+            for arr in self.bounds:
+                out = array("d", arr)
+                if sys.byteorder == "big": out.byteswap()
+                f.write(out.tobytes())
+
+    def term_index(self, utc_date, frame=FRAME_APPARENT):
+        """int(황경 / 15) 값(0~23). 테이블 범위 밖이면 None."""
+        b = self.bounds[frame]
+        t = to_seconds(utc_date)
+        i = bisect.bisect_right(b, t)
+        if i == 0 or i == self.count: return None
+        return (self.first_term + i - 1) % 24
+
+    def boundary_hours(self, utc_date, direction, frame=FRAME_J2000):
+        """
+        기존 1시간 단위 탐색과 같은 결과(다음/이전 절기를 넘어선 첫 정시 간격, 시간 수)를 반환.
+        direction=1 이면 다음 절기, -1 이면 현재 절기의 시작 경계. 범위 밖이면 None.
+        """
+        b = self.bounds[frame]
+        t = to_seconds(utc_date)
+        i = bisect.bisect_right(b, t)
+        if i == 0 or i == self.count: return None
+        if direction > 0:
+            hours = max(1, math.ceil((b[i] - t) / 3600.0))
+        else:
+            hours = math.floor((t - b[i - 1]) / 3600.0) + 1
+        if hours >= SEARCH_LIMIT_HOURS: return None
+        return hours
+
+
+_TABLE = None
+_TABLE_MISSING = False
+
+
+def get_table():
+    """절기 테이블을 처음 호출될 때 한 번만 읽어 둡니다. 파일이 없으면 None."""
+    global _TABLE, _TABLE_MISSING
+    if _TABLE is None and not _TABLE_MISSING:
+        try:
+            _TABLE = SolarTermTable.load()
+        except FileNotFoundError:
+            _TABLE_MISSING = True
+    return _TABLE
+
+
+def term_index(utc_date, frame=FRAME_APPARENT):
+    """테이블 조회, 범위 밖이면 ephem 으로 직접 계산."""
+    table = get_table()
+    idx = table.term_index(utc_date, frame) if table else None
+    if idx is not None:
+        if metrics.ENABLED: metrics.inc("solar_term_lookups", source="table")
+        return idx
+    metrics.inc("solar_term_lookups", source="ephem")
+    return int(ephem_sun_longitude(utc_date, frame) / 15) % 24
+
+
+def boundary_hours(utc_date, direction, frame=FRAME_J2000):
+    """테이블 조회, 범위 밖이면 ephem 1시간 단위 탐색. 찾지 못하면 None."""
+    table = get_table()
+    hours = table.boundary_hours(utc_date, direction, frame) if table else None
+    if hours is not None:
+        if metrics.ENABLED: metrics.inc("solar_term_lookups", source="table")
+        return hours
+    metrics.inc("solar_term_lookups", source="ephem")
+    return ephem_boundary_hours(utc_date, direction, frame)
+
+
+def iter_boundaries(utc_date, frame=FRAME_APPARENT):
+    """
+    utc_date 직전 경계부터 (경계 시각 초, 절기 번호) 를 시간 순으로 끝없이 내보냅니다.
+    테이블 범위 안은 테이블 값을, 그 앞뒤는 ephem 으로 이어서 계산합니다.
+    """
+    table = get_table()
+    t = to_seconds(utc_date)
+    i = bisect.bisect_right(table.bounds[frame], t) - 1 if table else -1
+    if i >= 0 and i < table.count - 1:
+        b = table.bounds[frame]
+        for k in range(i, table.count):
+            yield b[k], (table.first_term + k) % 24
+        t, term = b[-1], (table.first_term + table.count - 1) % 24
+    else:
+        lon = ephem_sun_longitude(utc_date, frame)
+        term = int(lon / 15) % 24
+        t = find_boundary(term * 15.0, t - (lon - term * 15) / MEAN_DEG_PER_SEC, frame)
+        yield t, term
+    while True:
+        term = (term + 1) % 24
+        t = find_boundary(term * 15.0, t + 15.0 / MEAN_DEG_PER_SEC, frame)
+        yield t, term
+
+
+# ==========================================
+# ephem 기반 계산 (테이블 생성/검증 및 범위 밖 입력용)
+# ==========================================
+def ephem_sun_longitude(utc_date, frame=FRAME_APPARENT):
+    """기존 엔진과 동일한 방식의 태양 황경(도, 0~360)."""
+    import ephem
+    metrics.inc("ephem_calls")
+    sun = ephem.Sun()
+    if frame == FRAME_APPARENT: sun.compute(utc_date, epoch=utc_date)
+    else: sun.compute(utc_date)
+    lon = math.degrees(ephem.Ecliptic(sun).lon)
+    if lon < 0: lon += 360
+    return lon
+
+
+def ephem_boundary_hours(utc_date, direction, frame=FRAME_J2000):
+    """기존 get_daewoon_data 의 1시간 단위 절기 탐색. 찾지 못하면 None."""
+    start_term_idx = int(ephem_sun_longitude(utc_date, frame) / 15)
+    check_date = utc_date
+    for i in range(1, SEARCH_LIMIT_HOURS):
+        check_date += datetime.timedelta(hours=SEARCH_STEP_HOURS * direction)
+        if int(ephem_sun_longitude(check_date, frame) / 15) != start_term_idx:
+            metrics.inc("solar_term_search_steps", i)
+            return i * SEARCH_STEP_HOURS
+    metrics.inc("solar_term_search_steps", SEARCH_LIMIT_HOURS - 1)
+    return None
+
+
+def _sun_longitude_at(seconds, frame):
+    import ephem
+    metrics.inc("ephem_calls")
+    d = ephem.Date(EPOCH_EPHEM_DATE + seconds / 86400.0)
+    sun = ephem.Sun()
+    if frame == FRAME_APPARENT: sun.compute(d, epoch=d)
+    else: sun.compute(d)
+    return math.degrees(ephem.Ecliptic(sun).lon) % 360.0
+
+
+def _offset(seconds, target_lon, frame):
+    """target_lon 기준 황경 차이(-180~180도). 경계 부근에서 단조 증가."""
+    return (_sun_longitude_at(seconds, frame) - target_lon + 180.0) % 360.0 - 180.0
+
+
+def find_boundary(target_lon, guess, frame, tol=1e-4):
+    """
+    황경이 target_lon 이 되는 시각(초)을 guess 부근에서 찾습니다.
+    평균 운동을 기울기로 쓰는 뉴턴 반복에 이분법 보호 구간을 함께 둡니다.
+    """
+    lo, hi = guess - 2 * 86400.0, guess + 2 * 86400.0
+    f_lo, f_hi = _offset(lo, target_lon, frame), _offset(hi, target_lon, frame)
+    while f_lo > 0:
+        hi, f_hi = lo, f_lo
+        lo -= 2 * 86400.0
+        f_lo = _offset(lo, target_lon, frame)
+    while f_hi <= 0:
+        lo, f_lo = hi, f_hi
+        hi += 2 * 86400.0
+        f_hi = _offset(hi, target_lon, frame)
+
+    t = min(max(guess, lo), hi)
+    for _ in range(100):
+        f = _offset(t, target_lon, frame)
+        if f > 0: hi = t
+        else: lo = t
+        nt = t - f / MEAN_DEG_PER_SEC
+        if not (lo < nt < hi): nt = (lo + hi) / 2.0
+        if abs(nt - t) < tol or hi - lo < tol:
+            t = nt
+            break
+        t = nt
+    # 경계 시각에서 int(황경/15) 가 새 절기를 가리키도록 살짝 뒤로 맞춤
+    while _offset(t, target_lon, frame) < 0:
+        t += tol
+    return t
+
+
+def build_table(start=datetime.datetime(1899, 12, 1), end=datetime.datetime(2101, 2, 1)):
+    """start~end(UTC) 사이의 모든 15° 경계를 두 프레임에 대해 계산합니다."""
+    t, t_end = to_seconds(start), to_seconds(end)
+    lon = _sun_longitude_at(t, FRAME_APPARENT)
+    first_term = (int(lon / 15) + 1) % 24
+    term = first_term
+    apparent = array("d")
+    t += ((term * 15 - lon) % 360.0) / MEAN_DEG_PER_SEC
+    while True:
+        t = find_boundary(term * 15.0, t, FRAME_APPARENT)
+        if t >= t_end: break
+        apparent.append(t)
+        term = (term + 1) % 24
+        t += 15.0 / MEAN_DEG_PER_SEC
+    # J2000 경계는 세차 차이(최대 하루 남짓)만큼 떨어져 있으므로 같은 절기 번호의 당일 경계를 초기값으로 사용
+    j2000 = array("d", (find_boundary(((first_term + i) % 24) * 15.0, g, FRAME_J2000)
+                        for i, g in enumerate(apparent)))
+    return SolarTermTable(first_term, [apparent, j2000])
+
+
+# ==========================================
+# 테이블 생성 / 검증 도구
+#   python -m saju.solar_terms build
+#   python -m saju.solar_terms check --samples 2000
+#   python -m saju.solar_terms check --years 2020 2024
+# ==========================================
+def check_table(table, samples=2000, daewoon_samples=200, seed=0,
+                start=datetime.datetime(1900, 1, 1), end=datetime.datetime(2100, 12, 31, 23, 59)):
+    """start~end(UTC) 의 무작위 시각과 모든 경계 직전/직후 시각에서 테이블 조회 결과를 ephem 계산과 비교합니다."""
+    import random
+    rng = random.Random(seed)
+    lo, hi = to_seconds(start), to_seconds(end)
+    mismatches = []
+
+    def _minute(seconds):
+        return EPOCH + datetime.timedelta(minutes=int(seconds // 60))
+
+    points = [_minute(rng.uniform(lo, hi)) for _ in range(samples)]
+    for frame in FRAMES:
+        for b in table.bounds[frame]:
+            if lo <= b <= hi:
+                points.append(_minute(b))
+                points.append(_minute(b) + datetime.timedelta(minutes=1))
+    for d in points:
+        for frame in FRAMES:
+            got = table.term_index(d, frame)
+            want = int(ephem_sun_longitude(d, frame) / 15)
+            if got != want: mismatches.append(("term", frame, d, got, want))
+
+    for d in points[:daewoon_samples]:
+        for direction in (1, -1):
+            got = table.boundary_hours(d, direction)
+            want = ephem_boundary_hours(d, direction)
+            if got != want: mismatches.append(("daewoon", direction, d, got, want))
+    return len(points), mismatches
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="절기 경계 테이블 생성/검증")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="ephem 으로 테이블을 계산해 저장")
+    p_build.add_argument("--out", default=TABLE_PATH)
+    p_check = sub.add_parser("check", help="저장된 테이블을 ephem 계산과 비교")
+    p_check.add_argument("--path", default=TABLE_PATH)
+    p_check.add_argument("--samples", type=int, default=2000)
+    p_check.add_argument("--daewoon-samples", type=int, default=200)
+    p_check.add_argument("--years", type=int, nargs=2, default=(1900, 2100), metavar=("FIRST", "LAST"),
+                         help="검사할 연도 범위 (UTC)")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        table = build_table()
+        table.save(args.out)
+        print(f"{table.count}개 경계 x {len(table.bounds)}프레임 저장: {args.out}")
+        return 0
+
+    table = SolarTermTable.load(args.path)
+    first, last = args.years
+    n, mismatches = check_table(table, args.samples, args.daewoon_samples,
+                                start=datetime.datetime(first, 1, 1), end=datetime.datetime(last, 12, 31, 23, 59))
+    for m in mismatches[:20]: print("불일치:", m)
+    print(f"검사 {n}개 시각, 불일치 {len(mismatches)}건")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
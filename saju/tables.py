@@ -0,0 +1,90 @@
+"""
+명리 기본 테이블
+
+천간/지지 글자, 십신/12운성 이름, 오행·음양 데이터 등
+엔진 전체가 공유하는 상수와, 이 규칙들로부터 import 시 한 번 만들어 두는
+조회 테이블(십신 10x10 / 10x12, 12운성 10x12, 신살 12x12 + 10x12,
+60갑자 특수살·공망)입니다. 엔진은 계산 대신 인덱스로 바로 조회합니다.
+"""
+
+CHEON = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
+JI = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
+SIBSIN_NAMES = ['비견', '겁재', '식신', '상관', '편재', '정재', '편관', '정관', '편인', '정인']
+UNSEONG_NAMES = ['장생', '목욕', '관대', '건록', '제왕', '쇠', '병', '사', '묘', '절', '태', '양']
+
+# (오행, 음양) — 오행: 0 목, 1 화, 2 토, 3 금, 4 수 / 음양: 0 양, 1 음
+C_DATA = [(0,0), (0,1), (1,0), (1,1), (2,0), (2,1), (3,0), (3,1), (4,0), (4,1)]
+J_DATA = [(4,1), (2,1), (0,0), (0,1), (2,0), (1,0), (1,1), (2,1), (3,0), (3,1), (2,0), (4,0)]
+
+# 일간별 12운성 장생 지지
+UNSEONG_START = [11, 6, 2, 9, 2, 9, 5, 0, 8, 3]
+
+# 년간 → 寅月 천간 (년상기월), 일간 → 子時 천간 (일상기시)
+MONTH_START_MAP = {0: 2, 1: 4, 2: 6, 3: 8, 4: 0, 5: 2, 6: 4, 7: 6, 8: 8, 9: 0}
+TIME_START_MAP = {0: 0, 1: 2, 2: 4, 3: 6, 4: 8, 5: 0, 6: 2, 7: 4, 8: 6, 9: 8}
+
+PILLAR_TITLES = ["년주", "월주", "일주", "시주"]
+
+# ==========================================
+# 신살 / 특수살 규칙
+# ==========================================
+# 일지 삼합 그룹 → 도화 / 역마 / 화개 지지
+SHINSAL_GROUPS = {0: 2, 4: 2, 8: 2, 2: 1, 6: 1, 10: 1, 3: 0, 7: 0, 11: 0, 5: 3, 9: 3, 1: 3}
+DOHWA_MAP = {2: 9, 1: 3, 0: 0, 3: 6}
+YEOKMA_MAP = {2: 2, 1: 8, 0: 5, 3: 11}
+HWAGAE_MAP = {2: 4, 1: 10, 0: 7, 3: 1}
+# 일간 → 천을귀인 지지
+GWIN_MAP = {0: [1, 7], 4: [1, 7], 6: [1, 7], 1: [0, 8], 5: [0, 8], 2: [11, 9], 3: [11, 9], 7: [2, 6], 8: [5, 3], 9: [5, 3]}
+BAEKHO = [(0,4), (1,7), (2,10), (3,1), (4,4), (8,10), (9,1)]
+GOEGANG = [(4,10), (6,4), (6,10), (8,4), (8,10), (4,4)]
+
+# 신살 비트 (표시 순서 = 비트 순서)
+DOHWA, YEOKMA, HWAGAE, CHEONEUL = 1, 2, 4, 8
+SHINSAL_BIT_NAMES = [(DOHWA, "도화"), (YEOKMA, "역마"), (HWAGAE, "화개"), (CHEONEUL, "천을귀인")]
+
+
+# ==========================================
+# 조회 테이블
+# ==========================================
+def _sibsin_index(me, tgt_elem, tgt_pol):
+    me_elem, me_pol = C_DATA[me]
+    rel = (tgt_elem - me_elem + 5) % 5
+    return rel * 2 + (0 if me_pol == tgt_pol else 1)
+
+
+def _unseong_index(day_gan, ji):
+    start_ji = UNSEONG_START[day_gan]
+    if day_gan % 2 == 0: return (ji - start_ji + 12) % 12
+    return (start_ji - ji + 12) % 12
+
+
+# [일간][천간] / [일간][지지] → 십신 인덱스
+SIBSIN_CHEON_IDX = [[_sibsin_index(me, *C_DATA[t]) for t in range(10)] for me in range(10)]
+SIBSIN_JI_IDX = [[_sibsin_index(me, *J_DATA[t]) for t in range(12)] for me in range(10)]
+SIBSIN_CHEON = [[SIBSIN_NAMES[i] for i in row] for row in SIBSIN_CHEON_IDX]
+SIBSIN_JI = [[SIBSIN_NAMES[i] for i in row] for row in SIBSIN_JI_IDX]
+
+# [일간][지지] → 12운성
+UNSEONG_IDX = [[_unseong_index(g, j) for j in range(12)] for g in range(10)]
+UNSEONG = [[UNSEONG_NAMES[i] for i in row] for row in UNSEONG_IDX]
+
+# [일지][대상 지지] → 도화/역마/화개 비트, [일간][대상 지지] → 천을귀인 비트
+SHINSAL_JI_BITS = [[(DOHWA if t == DOHWA_MAP[SHINSAL_GROUPS[d]] else 0)
+                    | (YEOKMA if t == YEOKMA_MAP[SHINSAL_GROUPS[d]] else 0)
+                    | (HWAGAE if t == HWAGAE_MAP[SHINSAL_GROUPS[d]] else 0) for t in range(12)] for d in range(12)]
+GWIN_BITS = [[CHEONEUL if t in GWIN_MAP[g] else 0 for t in range(12)] for g in range(10)]
+# 신살 비트 조합 → 표시 문자열
+SHINSAL_TEXT = [",".join(n for bit, n in SHINSAL_BIT_NAMES if mask & bit) or "-" for mask in range(16)]
+
+# [천간][지지] → 백호 / 괴강 / 합친 표시 문자열
+BAEKHO_TEXT = [["백호" if (g, j) in BAEKHO else "" for j in range(12)] for g in range(10)]
+GOEGANG_TEXT = [["괴강" if (g, j) in GOEGANG else "" for j in range(12)] for g in range(10)]
+SPECIAL_TEXT = [[f"{BAEKHO_TEXT[g][j]} {GOEGANG_TEXT[g][j]}".strip() for j in range(12)] for g in range(10)]
+
+# [일간][일지] → 공망 두 지지 (인덱스 / 표시 문자열)
+GONGMANG_JI = [[(((j - g + 12) % 12 + 10) % 12, ((j - g + 12) % 12 + 11) % 12) for j in range(12)] for g in range(10)]
+GONGMANG = [[f"{JI[a]}{JI[b]}" for a, b in row] for row in GONGMANG_JI]
+
+# 60갑자 인덱스 (甲子 = 0) ↔ (천간, 지지)
+GANJI_INDEX = [[(6 * g - 5 * j) % 60 for j in range(12)] for g in range(10)]
+GANJI_NAMES = [f"{CHEON[i % 10]}{JI[i % 12]}" for i in range(60)]
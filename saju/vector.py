@@ -0,0 +1,153 @@
+"""
+벡터화 사주 엔진 (NumPy)
+
+출생 일시 배열을 한 번에 받아 네 기둥의 천간/지지 인덱스와
+대운 방향·대운수를 정수 배열로 돌려줍니다. 계산 규칙은
+SajuEngine.calculate / get_daewoon_data 와 완전히 같고,
+절기 판정은 solar_terms 테이블을 np.searchsorted 로 조회합니다.
+
+    import numpy as np
+    from saju.vector import calculate_arrays
+    dts = np.array(["1990-01-01T12:00", "2024-02-04T17:30"], dtype="datetime64[m]")
+    out = calculate_arrays(dts, np.array([True, False]))
+    out["day_gan"], out["daewoon_num"]
+"""
+import numpy as np
+
+from . import solar_terms
+from .chart import DAEWOON_FAILED, Chart
+
+# SajuEngine.calculate 의 month_start_map / time_start_map 과 같은 표 (년간/일간 인덱스로 조회)
+MONTH_START = np.array([2, 4, 6, 8, 0, 2, 4, 6, 8, 0], dtype=np.int64)
+TIME_START = np.array([0, 2, 4, 6, 8, 0, 2, 4, 6, 8], dtype=np.int64)
+
+_EPOCH_MIN = np.datetime64("1900-01-01T00:00", "m")
+_EPOCH_DAY = np.datetime64("1900-01-01", "D")
+_KST_OFFSET_MIN = 9 * 60
+
+
+def _bounds(frame):
+    table = solar_terms.get_table()
+    if table is None: return None, 0
+    return np.frombuffer(table.bounds[frame], dtype=np.float64), table.first_term
+
+
+def term_index_array(utc_seconds, frame=solar_terms.FRAME_APPARENT):
+    """utc_seconds(1900-01-01 UTC 기준 초) 배열의 절기 번호 int(황경/15)."""
+    b, first_term = _bounds(frame)
+    if b is None:
+        out = np.empty(utc_seconds.shape, dtype=np.int64)
+        outside = np.ones(utc_seconds.shape, dtype=bool)
+    else:
+        i = np.searchsorted(b, utc_seconds, side="right")
+        out = (first_term + i - 1) % 24
+        outside = (i == 0) | (i == len(b))
+    for k in np.flatnonzero(outside):
+        out[k] = solar_terms.term_index(solar_terms.from_seconds(float(utc_seconds[k])), frame)
+    return out
+
+
+def boundary_hours_array(utc_seconds, direction, frame=solar_terms.FRAME_J2000):
+    """solar_terms.boundary_hours 의 배열판. direction 은 +1/-1 배열, 실패는 -1."""
+    b, _ = _bounds(frame)
+    hours = np.empty(utc_seconds.shape, dtype=np.int64)
+    if b is None:
+        outside = np.ones(utc_seconds.shape, dtype=bool)
+    else:
+        i = np.searchsorted(b, utc_seconds, side="right")
+        outside = (i == 0) | (i == len(b))
+        i = np.clip(i, 1, len(b) - 1)
+        fwd = np.maximum(1, np.ceil((b[i] - utc_seconds) / 3600.0)).astype(np.int64)
+        bwd = np.floor((utc_seconds - b[i - 1]) / 3600.0).astype(np.int64) + 1
+        hours[:] = np.where(direction > 0, fwd, bwd)
+        outside |= hours >= solar_terms.SEARCH_LIMIT_HOURS
+    for k in np.flatnonzero(outside):
+        h = solar_terms.boundary_hours(solar_terms.from_seconds(float(utc_seconds[k])), int(direction[k]), frame)
+        hours[k] = -1 if h is None else h
+    return hours
+
+
+def daewoon_num_array(hours):
+    """get_daewoon_data 의 대운수 반올림 규칙 (3일 = 1년, 나머지 2일 초과 시 올림, 최소 1)."""
+    diff_days = hours / 24.0
+    num = (diff_days / 3.0).astype(np.int64)
+    num += (diff_days % 3) > 2
+    num = np.maximum(num, 1)
+    return np.where(hours < 0, 1, num)
+
+
+def calculate_arrays(datetimes, is_man):
+    """
+    datetimes: 한국 표준시 출생 일시 배열 (datetime64 또는 datetime 객체)
+    is_man: 남성 여부 bool 배열 ('남성'/'여성' 문자열 배열도 허용)
+    반환: 기둥별 천간/지지 인덱스, direction(+1 순행 / -1 역행), daewoon_num 정수 배열 dict
+    """
+    kst = np.asarray(datetimes, dtype="datetime64[m]")
+    is_man = np.asarray(is_man)
+    if is_man.dtype.kind in "UO": is_man = is_man == "남성"
+    is_man = np.broadcast_to(is_man.astype(bool), kst.shape)
+
+    out = pillar_arrays(kst)
+    utc_seconds = (((kst - _EPOCH_MIN).astype(np.int64) - _KST_OFFSET_MIN) * 60).astype(np.float64)
+
+    # 대운
+    direction = np.where(is_man == (out["year_gan"] % 2 == 0), 1, -1)
+    hours = boundary_hours_array(utc_seconds, direction)
+    out["direction"] = direction
+    out["daewoon_num"] = daewoon_num_array(hours)
+    out["daewoon_failed"] = hours < 0
+    return out
+
+
+def calculate_charts(births):
+    """
+    (year, month, day, hour, minute, gender) 목록 → Chart 목록 (SajuEngine.calculate_chart 와 같은 결과).
+    날짜 검증은 호출하는 쪽에서 끝낸 입력만 넘깁니다.
+    """
+    if not births: return []
+    kst = np.array([f"{y:04d}-{m:02d}-{d:02d}T{h:02d}:{mi:02d}" for y, m, d, h, mi, _ in births], dtype="datetime64[m]")
+    is_man = np.array([g == "남성" for *_, g in births])
+    out = calculate_arrays(kst, is_man)
+    gans = np.stack([out["year_gan"], out["month_gan"], out["day_gan"], out["time_gan"]], axis=1).tolist()
+    jis = np.stack([out["year_ji"], out["month_ji"], out["day_ji"], out["time_ji"]], axis=1).tolist()
+    nums = np.where(out["daewoon_failed"], DAEWOON_FAILED, out["daewoon_num"]).tolist()
+    return [Chart(y, m, d, h, mi, g == "남성", tuple(gans[k]), tuple(jis[k]), nums[k])
+            for k, (y, m, d, h, mi, g) in enumerate(births)]
+
+
+def pillar_arrays(datetimes):
+    """한국 표준시 일시 배열 → 네 기둥 천간/지지 인덱스 배열 dict (대운 제외)."""
+    kst = np.asarray(datetimes, dtype="datetime64[m]")
+    kst_min = (kst - _EPOCH_MIN).astype(np.int64)
+    utc_seconds = ((kst_min - _KST_OFFSET_MIN) * 60).astype(np.float64)
+
+    year = kst.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = kst.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    diff_days = (kst.astype("datetime64[D]") - _EPOCH_DAY).astype(np.int64)
+    total_min = kst_min - diff_days * 1440
+
+    # 년주 / 월주 (입춘 = 절기 번호 21)
+    term_idx = term_index_array(utc_seconds)
+    target_year = year - (month == 1) - ((month == 2) & (term_idx < 21))
+    year_gan = (target_year - 4) % 10
+    year_ji = (target_year - 4) % 12
+    month_idx = ((term_idx + 3) // 2) % 12
+    month_gan = (MONTH_START[year_gan] + month_idx) % 10
+    month_ji = (month_idx + 2) % 12
+
+    # 일주
+    day_gan = (diff_days + 10) % 10
+    day_ji = (diff_days + 10) % 12
+
+    # 시주 (23:30 ~ 01:30 子時, 23:30 이후는 다음 날 일간 기준)
+    late_zi = total_min >= 23 * 60 + 30
+    zi = late_zi | (total_min < 1 * 60 + 30)
+    time_ji = np.where(zi, 0, ((total_min - 30) // 120 + 1) % 12)
+    calc_day_gan = (day_gan + late_zi) % 10
+    time_gan = (TIME_START[calc_day_gan] + time_ji) % 10
+    return {
+        "year_gan": year_gan, "year_ji": year_ji,
+        "month_gan": month_gan, "month_ji": month_ji,
+        "day_gan": day_gan, "day_ji": day_ji,
+        "time_gan": time_gan, "time_ji": time_ji,
+    }
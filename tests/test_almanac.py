@@ -0,0 +1,90 @@
+import datetime
+import io
+import re
+
+import pytest
+
+from saju.almanac import ILJIN, SEUN, WOLUN, calendar, days, months, write_ical, years
+from saju.engine import SajuEngine
+from saju.tables import CHEON, JI
+
+MINUTE = datetime.timedelta(minutes=1)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return SajuEngine()
+
+
+@pytest.fixture(scope="module")
+def chart(engine):
+    return engine.calculate_chart(1990, 1, 1, 12, 0, "남성")
+
+
+def _pillar(engine, t, i):
+    c = engine.calculate_chart(t.year, t.month, t.day, t.hour, t.minute, "여성")
+    return f"{CHEON[c.gans[i]]}{JI[c.jis[i]]}"
+
+
+@pytest.mark.parametrize("start, end", [(datetime.date(2023, 6, 1), datetime.date(2026, 6, 1)),
+                                        (datetime.date(2150, 1, 1), datetime.date(2151, 3, 1))])
+def test_year_and_month_pillars_match_engine(engine, chart, start, end):
+    # 2150년은 절기 테이블 밖 (ephem 으로 경계 계산)
+    for gen, i in ((years, 0), (months, 1)):
+        entries = list(gen(chart, start, end))
+        assert entries[0].start <= datetime.datetime(start.year, start.month, start.day) < entries[0].end
+        for prev, e in zip(entries, entries[1:]):
+            assert prev.end == e.start
+            assert _pillar(engine, e.start, i) == e.ganji, e
+            assert _pillar(engine, e.start - MINUTE, i) == prev.ganji, prev
+            assert _pillar(engine, e.start + (e.end - e.start) / 2, i) == e.ganji, e
+
+
+def test_day_pillars_match_engine(engine, chart):
+    entries = list(days(chart, datetime.date(2023, 12, 25), datetime.date(2024, 3, 5)))
+    assert len(entries) == 71
+    for e in entries:
+        assert e.end - e.start == datetime.timedelta(days=1)
+        assert _pillar(engine, e.start, 2) == e.ganji
+        assert _pillar(engine, e.end - MINUTE, 2) == e.ganji
+
+
+def test_calendar_merges_in_start_order(chart):
+    entries = list(calendar(chart, datetime.date(2024, 1, 1), datetime.date(2024, 3, 1)))
+    assert [e.start for e in entries] == sorted(e.start for e in entries)
+    assert {e.kind for e in entries} == {SEUN, WOLUN, ILJIN}
+
+
+def _ics(chart, name, kinds):
+    out = io.StringIO(newline="")
+    entries = list(calendar(chart, datetime.date(2024, 1, 1), datetime.date(2024, 4, 1), kinds))
+    n = write_ical(iter(entries), out, chart, name, dtstamp=datetime.datetime(2026, 1, 1))
+    return entries, n, out.getvalue()
+
+
+def test_ical_events_and_dtstart(chart):
+    entries, n, text = _ics(chart, "홍길동", (SEUN, WOLUN, ILJIN))
+    assert n == len(entries)
+    assert text.count("BEGIN:VEVENT\r\n") == text.count("END:VEVENT\r\n") == n
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    unfolded = text.replace("\r\n ", "")
+    dtstarts = re.findall(r"^DTSTART(;[^:]*):(.*)\r$", unfolded, re.M)
+    assert len(dtstarts) == n  # VTIMEZONE 의 DTSTART 는 매개변수가 없어 빠짐
+    for e, (params, value) in zip(entries, dtstarts):
+        if e.kind == ILJIN: assert (params, value) == (";VALUE=DATE", f"{e.start:%Y%m%d}")
+        else: assert (params, value) == (";TZID=Asia/Seoul", f"{e.start:%Y%m%dT%H%M%S}")
+    assert "DTSTAMP:20260101T000000Z\r\n" in unfolded
+
+
+def test_ical_folding_and_escaping(chart):
+    name = "김,철;수\\" + "가" * 40
+    _, _, text = _ics(chart, name, (WOLUN,))
+    lines = text.split("\r\n")
+    assert lines[-1] == ""
+    for line in lines:
+        assert len(line.encode("utf-8")) <= 75, line
+    assert any(line.startswith(" ") for line in lines)
+    unfolded = text.replace("\r\n ", "")
+    escaped = "김\\,철\\;수\\\\" + "가" * 40
+    assert f"X-WR-CALNAME:{escaped} 운세 달력\r\n" in unfolded
+    assert f"DESCRIPTION:{escaped}님 일간 기준 천간 " in unfolded
@@ -0,0 +1,78 @@
+import datetime
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+from saju import analytics
+from saju.analytics import minute_of, run, split_hist
+
+START = minute_of(datetime.datetime(2024, 1, 1))
+END = minute_of(datetime.datetime(2024, 7, 1))  # 6개월 = 작업 6개
+
+
+@pytest.fixture
+def segments(monkeypatch):
+    """run() 이 만든 공유 메모리 이름 목록."""
+    names = []
+
+    class Recording(analytics.shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name, create, size)
+            if create: names.append(self.name)
+
+    monkeypatch.setattr(analytics.shared_memory, "SharedMemory", Recording)
+    return names
+
+
+def _assert_unlinked(names):
+    assert names
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            analytics.shared_memory.SharedMemory(name=name)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="작업자에 느린 계산을 넘기려면 fork 필요")
+def test_resume_after_interrupt_matches_clean_run(tmp_path, monkeypatch, segments):
+    clean, clean_done = run(START, END, step=60, workers=2)
+    assert clean_done.all()
+    assert split_hist(clean)["total"] == (END - START) // 60
+
+    checkpoint = str(tmp_path / "ckpt.npz")
+
+    def interrupt(finished, total, n):
+        if finished == 2: raise KeyboardInterrupt
+
+    # 3월부터는 느리게 계산해 중단 시점에 남은 달이 반드시 생기게 함 (fork 로 띄운 작업자에 그대로 전달)
+    compute_points = analytics.compute_points
+    slow_from = minute_of(datetime.datetime(2024, 3, 1))
+
+    def slow_compute_points(minutes):
+        if minutes[0] >= slow_from: time.sleep(0.3)
+        return compute_points(minutes)
+
+    monkeypatch.setattr(analytics, "compute_points", slow_compute_points)
+    with pytest.raises(KeyboardInterrupt):
+        run(START, END, step=60, workers=1, checkpoint=checkpoint, checkpoint_every=0, progress=interrupt)
+    monkeypatch.setattr(analytics, "compute_points", compute_points)
+    with np.load(checkpoint) as saved:
+        assert 2 <= saved["done"].sum() < len(saved["done"])
+        partial = saved["hist"].copy()
+    assert 0 < split_hist(partial)["total"] < split_hist(clean)["total"]
+
+    calls = []
+    resumed, done = run(START, END, step=60, workers=2, checkpoint=checkpoint,
+                        progress=lambda finished, total, n: calls.append(n))
+    assert done.all()
+    assert np.array_equal(resumed, clean)
+    assert 0 < len(calls) < 6  # 끝난 달은 다시 계산하지 않음
+    _assert_unlinked(segments)
+
+
+def test_checkpoint_from_other_settings_is_rejected(tmp_path, segments):
+    checkpoint = str(tmp_path / "ckpt.npz")
+    run(START, END, step=60, workers=1, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        run(START, END, step=30, workers=1, checkpoint=checkpoint)
+    _assert_unlinked(segments)
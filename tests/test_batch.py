@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from saju.batch import iter_records, run_batch, write_results
+from saju.engine import SajuEngine
+
+GOOD = '{"name": "홍길동", "year": 1990, "month": 1, "day": 1, "hour": 12, "gender": "남성"}'
+
+
+def _run(text, fmt="ndjson", workers=0):
+    return list(run_batch(iter_records(io.StringIO(text), fmt), workers=workers, chunk_size=2))
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_bad_ndjson_lines_become_error_rows(workers):
+    text = "\n".join([
+        GOOD,
+        "{not json",
+        "[1, 2]",
+        '"x"',
+        "",
+        '{"year": 1, "month": 1, "day": 1, "hour": 0, "gender": "여성"}',
+        '{"year": 1990, "month": 2, "day": 30, "gender": "남성"}',
+        GOOD,
+    ])
+    out = _run(text, workers=workers)
+    assert len(out) == 7
+    assert "result" in out[0] and "error" not in out[0]
+    assert "result" in out[-1]
+    errors = {o["line"]: o["error"] for o in out if "error" in o}
+    assert sorted(errors) == [2, 3, 4, 6, 7]
+    assert errors[2].startswith("JSON 오류")
+    assert "객체" in errors[3] and "객체" in errors[4]
+    assert "지원 범위" in errors[6]
+    assert errors[7] == "잘못된 날짜/시간"
+
+
+def test_engine_overflow_becomes_error_row(monkeypatch):
+    calculate = SajuEngine.calculate
+
+    def overflowing(self, year, *args):
+        if year == 2000: raise OverflowError("date value out of range")
+        return calculate(self, year, *args)
+
+    monkeypatch.setattr(SajuEngine, "calculate", overflowing)
+    out = _run('{"year": 2000, "month": 1, "day": 1, "gender": "남성"}\n' + GOOD)
+    assert out[0]["line"] == 1 and "계산 실패" in out[0]["error"]
+    assert "result" in out[1]
+
+
+def test_csv_error_row_keeps_line_number():
+    text = "name,year,month,day,hour,gender\n갑,1990,1,1,12,남성\n을,abc,1,1,12,남성\n병,1,1,1,0,남성\n"
+    out = _run(text, fmt="csv")
+    assert [o.get("line") for o in out] == [None, 3, 4]
+    buf = io.StringIO()
+    write_results(out, buf, "csv")
+    rows = buf.getvalue().splitlines()
+    assert rows[0].endswith("line,error")
+    assert ",3," in rows[2]
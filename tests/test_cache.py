@@ -0,0 +1,79 @@
+import types
+
+import pytest
+
+from saju import cache as cache_mod
+from saju.cache import ChartCache, cache_key
+from saju.engine import SajuEngine
+
+BIRTH = (1990, 1, 1, 12, 0, "남성")
+TTL = 100
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_mod, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _chart(birth=BIRTH):
+    return SajuEngine().calculate_chart(*birth)
+
+
+def test_name_is_not_part_of_key(tmp_path):
+    c = ChartCache(path=str(tmp_path / "c.sqlite3"))
+    assert c.get_chart(*BIRTH, name="갑") == SajuEngine().calculate(*BIRTH, "갑")
+    assert c.get_chart(*BIRTH, name="을")["report"]["header"].startswith("을님의")
+    assert c.stats()["misses"] == 1 and c.stats()["memory_hits"] == 1
+
+
+def test_disk_entry_survives_new_instance_within_ttl(tmp_path, clock):
+    path = str(tmp_path / "c.sqlite3")
+    ChartCache(path=path, ttl=TTL).put(cache_key(*BIRTH), _chart())
+    clock[0] += TTL - 1
+    other = ChartCache(path=path, ttl=TTL)
+    assert other.get(cache_key(*BIRTH)).pack() == _chart().pack()
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_ttl_expires_memory_and_disk(tmp_path, clock):
+    path = str(tmp_path / "c.sqlite3")
+    c = ChartCache(path=path, ttl=TTL)
+    c.put(cache_key(*BIRTH), _chart())
+    clock[0] += TTL + 1
+    assert c.get(cache_key(*BIRTH)) is None
+    assert c.stats()["expired"] == 2  # 메모리, 디스크 각각
+    assert ChartCache(path=path, ttl=TTL).get(cache_key(*BIRTH)) is None
+
+
+def test_prune_removes_expired_then_oldest(tmp_path, clock):
+    c = ChartCache(path=str(tmp_path / "c.sqlite3"), ttl=TTL, max_disk_entries=2)
+    births = [(1990, 1, d, 12, 0, "남성") for d in range(1, 6)]
+    for b in births:
+        c.put(cache_key(*b), _chart(b))
+        clock[0] += 10
+    # 첫 항목은 만료, 나머지 4개 중 최근 2개만 남김
+    clock[0] = 1_000_000.0 + TTL + 5
+    assert c.prune() == 3
+    assert c.stats()["disk_entries"] == 2
+    fresh = ChartCache(path=c.path, ttl=TTL)
+    assert [fresh.get(cache_key(*b)) is not None for b in births] == [False, False, False, True, True]
+
+
+def test_memory_lru_eviction_and_peek():
+    c = ChartCache(path=None, max_entries=2)
+    births = [(1990, 1, d, 12, 0, "여성") for d in range(1, 4)]
+    for b in births: c.put(cache_key(*b), _chart(b))
+    assert c.peek(cache_key(*births[0])) is None
+    assert c.peek(cache_key(*births[2])) is not None
+    assert c.stats()["evictions"] == 1
+    assert "misses" not in c.stats() and "memory_hits" not in c.stats()  # peek 은 카운터를 올리지 않음
+
+
+def test_unwritable_path_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("x")
+    c = ChartCache(path=str(blocker / "c.sqlite3"))
+    assert c.get_chart(*BIRTH) is not None and c.get_chart(*BIRTH) is not None
+    assert c.stats()["disk_errors"] == 1 and c.stats()["memory_hits"] == 1
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from saju.chart import DAEWOON_FAILED, LEGACY_REPORT_KEY, MAX_PACKED_YEAR, Chart
+from saju.engine import SajuEngine
+from saju.reports import build_report
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "data", "chart_dicts.json")
+
+
+def _chart(year, daewoon_num=7):
+    return Chart(year, 12, 31, 23, 59, True, (9, 8, 0, 1), (11, 10, 0, 1), daewoon_num)
+
+
+@pytest.mark.parametrize("year", [0, 1, 2, 1990, MAX_PACKED_YEAR - 1, MAX_PACKED_YEAR])
+def test_pack_round_trip_at_year_edges(year):
+    for daewoon_num in (DAEWOON_FAILED, 1, 63):
+        chart = _chart(year, daewoon_num)
+        assert Chart.unpack(chart.pack()) == chart
+    assert _chart(year).pack() < 1 << 63
+
+
+@pytest.mark.parametrize("birth", [(2, 3, 1, 0, 0, "여성"), (MAX_PACKED_YEAR, 12, 31, 23, 59, "남성")])
+def test_engine_chart_round_trip(birth):
+    chart = SajuEngine().calculate_chart(*birth)
+    assert Chart.unpack(chart.pack()) == chart
+
+
+@pytest.mark.parametrize("year", [-1, MAX_PACKED_YEAR + 1, 9998])
+def test_pack_rejects_years_out_of_range(year):
+    with pytest.raises(ValueError):
+        _chart(year).pack()
+
+
+def test_to_dict_matches_pre_chart_engine():
+    # 기대값은 Chart 도입 전 SajuEngine.calculate 로 만든 결과 (report_2026 키)
+    with open(FIXTURES, encoding="utf-8") as f:
+        rows = json.load(f)
+    engine = SajuEngine()
+    for row in rows:
+        chart = engine.calculate_chart(*row["birth"])
+        got = chart.to_dict("홍길동", row["birth"][-1])
+        report = got.pop("report")
+        assert report == build_report(chart.day_gan, "홍길동")
+        # 이전 키는 같은 리포트에서 'year' 만 뺀 사본
+        assert got[LEGACY_REPORT_KEY] == {k: v for k, v in report.items() if k != "year"}
+        if report["year"] == 2026: assert got == row["expected"], row["birth"]
+        expected = dict(row["expected"])
+        legacy = build_report(chart.day_gan, "홍길동", 2026)
+        del legacy["year"]
+        assert expected.pop(LEGACY_REPORT_KEY) == legacy
+        del got[LEGACY_REPORT_KEY]
+        assert got == expected, row["birth"]
@@ -0,0 +1,53 @@
+import numpy as np
+
+from saju.compat import Roster, _pair_scores, random_roster, score_one, top_k, top_k_matrix, top_k_pairs
+
+
+def _full(a, b):
+    rows = Roster(*(getattr(a, k)[:, None] for k in Roster.__slots__))
+    cols = Roster(*(getattr(b, k)[None, :] for k in Roster.__slots__))
+    return _pair_scores(rows, cols).astype(np.int64)
+
+
+def _brute_order(raw):
+    return np.lexsort((np.arange(len(raw)), -raw))
+
+
+def test_top_k_ranks_on_unclipped_score():
+    roster, me = random_roster(20_000), random_roster(1, seed=1)
+    raw = _full(me, roster)[0]
+    assert raw.max() > 100  # 자르면 100 에서 동점이 되는 구간이 있어야 의미 있는 검사
+    idx, scores = top_k(me, roster, k=50)
+    assert (idx == _brute_order(raw)[:50]).all()
+    assert (scores == np.clip(raw[idx], 0, 100)).all()
+    assert (score_one(me, roster) == np.clip(raw, 0, 100)).all()
+
+
+def test_top_k_exclude():
+    roster, me = random_roster(500), random_roster(1, seed=1)
+    best = top_k(me, roster, k=3)[0]
+    idx, _ = top_k(me, roster, k=3, exclude=best[:2])
+    assert idx[0] == best[2] and not set(best[:2]) & set(idx.tolist())
+
+
+def test_matrix_and_pairs_match_brute_force():
+    a, b = random_roster(40, seed=2), random_roster(2000, seed=3)
+    full = _full(a, b)
+    idx, scores = top_k_matrix(a, b, k=5, max_cells=7000)
+    for i in range(len(a)):
+        assert (idx[i] == _brute_order(full[i])[:5]).all()
+    assert (scores == np.clip(np.take_along_axis(full, idx, axis=1), 0, 100)).all()
+
+    ia, ib, s = top_k_pairs(a, b, k=25, max_cells=7000)
+    best = _brute_order(full.ravel())[:25]
+    assert (ia == best // len(b)).all() and (ib == best % len(b)).all()
+    assert (s == np.clip(full.ravel()[best], 0, 100)).all()
+
+
+def test_exclude_self_leaves_empty_slots():
+    r = random_roster(20, seed=4)
+    idx, scores = top_k_matrix(r, r, k=25, exclude_self=True)
+    assert (idx[:, 19:] == -1).all() and (scores[:, 19:] == -1).all()
+    assert all(i not in idx[i] for i in range(20))
+    ia, ib, _ = top_k_pairs(r, r, k=1000, exclude_self=True)
+    assert len(ia) == 20 * 19 and not (ia == ib).any()
@@ -0,0 +1,62 @@
+import datetime
+import random
+
+import pytest
+from korean_lunar_calendar import KoreanLunarCalendar
+
+from saju import lunar, lunar_to_solar
+
+
+def test_valid_leap_date():
+    # 2023년은 윤2월이 있는 해: 윤2월 1일 = 양력 3월 22일
+    assert lunar_to_solar(2023, 2, 1, True) == (2023, 3, 22)
+    assert lunar_to_solar(2023, 2, 1, False) == (2023, 2, 20)
+
+
+def test_impossible_leap_month_raises_with_reason():
+    with pytest.raises(lunar.InvalidLunarDate) as info:
+        lunar_to_solar(2023, 3, 1, True)
+    assert info.value.code == lunar.NOT_LEAP_MONTH
+    assert "윤달은 2월" in str(info.value)
+
+
+def test_bad_day_raises():
+    with pytest.raises(lunar.InvalidLunarDate) as info:
+        lunar_to_solar(2023, 1, 31)
+    assert info.value.code == lunar.BAD_DAY
+
+
+@pytest.mark.parametrize("year", [900, 2051, 2100])
+def test_out_of_range_year_raises(year):
+    with pytest.raises(lunar.InvalidLunarDate) as info:
+        lunar_to_solar(year, 3, 1)
+    assert info.value.code == lunar.OUT_OF_RANGE
+
+
+def test_outside_table_uses_library():
+    # 1500년은 테이블(1899~2050) 밖이지만 korean_lunar_calendar 가 지원하는 범위
+    cal = KoreanLunarCalendar()
+    assert cal.setLunarDate(1500, 5, 10, False)
+    assert lunar_to_solar(1500, 5, 10) == (cal.solarYear, cal.solarMonth, cal.solarDay)
+
+
+def test_sampled_table_matches_library():
+    table = lunar.get_table()
+    rng = random.Random(0)
+    for _ in range(2000):
+        year, month, day, is_leap = (rng.randint(table.first_year, 2049), rng.randint(1, 12),
+                                     rng.randint(1, 30), rng.random() < 0.2)
+        cal = KoreanLunarCalendar()
+        ok = cal.setLunarDate(year, month, day, is_leap)
+        try: got = table.lunar_to_solar(year, month, day, is_leap)
+        except lunar.InvalidLunarDate: got = None
+        assert got == (datetime.date(cal.solarYear, cal.solarMonth, cal.solarDay) if ok else None), \
+            (year, month, day, is_leap)
+
+    first = datetime.date(1900, 3, 1).toordinal()
+    last = datetime.date(2050, 12, 31).toordinal()
+    for _ in range(2000):
+        d = datetime.date.fromordinal(rng.randint(first, last))
+        cal = KoreanLunarCalendar()
+        cal.setSolarDate(d.year, d.month, d.day)
+        assert table.solar_to_lunar(d) == (cal.lunarYear, cal.lunarMonth, cal.lunarDay, bool(cal.isIntercalation)), d
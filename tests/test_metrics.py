@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from saju import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    was = metrics.ENABLED
+    metrics.set_enabled(True)
+    metrics.reset()
+    yield
+    metrics.set_enabled(was)
+    metrics.reset()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(metrics.time, "perf_counter", lambda: now[0])
+    return now
+
+
+def _lines(text, prefix):
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+def test_timer_laps_fill_histogram(clock):
+    t = metrics.timer()
+    clock[0] += 0.002
+    t.lap("pillars")
+    clock[0] += 0.5
+    t.lap("pillars")
+    clock[0] += 0.00005
+    t.lap("report")
+    text = metrics.render()
+    assert 'saju_stage_seconds_bucket{stage="pillars",le="0.001"} 0' in text
+    assert 'saju_stage_seconds_bucket{stage="pillars",le="0.003"} 1' in text
+    assert 'saju_stage_seconds_bucket{stage="pillars",le="1"} 2' in text
+    assert 'saju_stage_seconds_bucket{stage="pillars",le="+Inf"} 2' in text
+    assert 'saju_stage_seconds_count{stage="pillars"} 2' in text
+    assert float(_lines(text, 'saju_stage_seconds_sum{stage="pillars"}')[0].split()[1]) == pytest.approx(0.502)
+    assert 'saju_stage_seconds_bucket{stage="report",le="0.0001"} 1' in text
+    # 버킷은 누적값이며 +Inf 는 개수와 같음
+    counts = [int(line.split()[1]) for line in _lines(text, 'saju_stage_seconds_bucket{stage="pillars"')]
+    assert counts == sorted(counts) and len(counts) == len(metrics.BUCKETS) + 1
+
+
+def test_timer_is_none_when_disabled():
+    metrics.set_enabled(False)
+    assert metrics.timer() is None
+    metrics.inc("ephem_calls")
+    metrics.set_gauge("queue_depth", 3)
+    text = metrics.render()
+    assert "saju_ephem_calls_total 0" in text
+    assert "saju_queue_depth" not in text
+
+
+def test_inc_with_labels_and_gauges():
+    metrics.inc("ephem_calls")
+    metrics.inc("ephem_calls", 4)
+    metrics.inc("cache_lookups", result="miss")
+    metrics.inc("cache_lookups", result="memory_hit")
+    metrics.inc("cache_lookups", result="miss")
+    metrics.inc("http_requests", status=200, endpoint="/chart")
+    metrics.set_gauge("queue_depth", 7)
+    text = metrics.render()
+    assert "# HELP saju_ephem_calls_total ephem 태양 위치 계산 횟수" in text
+    assert "# TYPE saju_ephem_calls_total counter" in text
+    assert "saju_ephem_calls_total 5" in text
+    assert _lines(text, "saju_cache_lookups_total") == ['saju_cache_lookups_total{result="memory_hit"} 1',
+                                                        'saju_cache_lookups_total{result="miss"} 2']
+    assert 'saju_http_requests_total{endpoint="/chart",status="200"} 1' in text
+    assert "# TYPE saju_queue_depth gauge" in text and "saju_queue_depth 7" in text
+    assert "saju_open_connections" not in text
+    assert text.endswith("\n")
+
+
+def test_trace_collects_per_thread(clock):
+    with metrics.trace() as collected:
+        t = metrics.timer()
+        clock[0] += 0.001
+        t.lap("pillars")
+        metrics.inc("ephem_calls", 2)
+    metrics.inc("ephem_calls")
+    assert collected["stages"] == {"pillars": pytest.approx(0.001)}
+    assert collected["counters"] == {("ephem_calls", ()): 2}
+    assert metrics.format_trace(collected) == "pillars 1.00ms · ephem_calls 2"
+
+
+def test_write_textfile(tmp_path):
+    metrics.inc("ephem_calls", 3)
+    path = str(tmp_path / "saju.prom")
+    assert metrics.write_textfile(path) == path
+    with open(path, encoding="utf-8") as f:
+        assert "saju_ephem_calls_total 3" in f.read()
+    metrics.set_enabled(False)
+    assert metrics.write_textfile(str(tmp_path / "off.prom")) is None
+
+
+def test_env_read_at_import_and_by_configure(monkeypatch):
+    code = "from saju import metrics; print(metrics.ENABLED)"
+    env = dict(os.environ, SAJU_METRICS="1")
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "True"
+
+    monkeypatch.delenv("SAJU_METRICS_PORT", raising=False)
+    monkeypatch.setenv("SAJU_METRICS", "0")
+    assert metrics.configure_from_env() is False
+    monkeypatch.setenv("SAJU_METRICS", "1")
+    assert metrics.configure_from_env() is True
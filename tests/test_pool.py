@@ -0,0 +1,132 @@
+import os
+import threading
+
+import pytest
+
+from saju import metrics, pool
+from saju.cache import ChartCache
+from saju.engine import SajuEngine
+from saju.pool import ChartPool, PoolBusy, PoolError, PoolTimeout
+
+BIRTH = (1990, 1, 1, 12, 0, "남성")
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """작업자 계산을 release.set() 전까지 붙잡아 두는 _calculate_chart."""
+    release, started = threading.Event(), threading.Event()
+    calculate = pool._calculate_chart
+
+    def blocked(birth):
+        started.set()
+        assert release.wait(10)
+        return calculate(birth)
+
+    monkeypatch.setattr(pool, "_calculate_chart", blocked)
+    yield release, started
+    release.set()
+
+
+def test_result_matches_engine():
+    p = ChartPool(ChartCache(path=None))
+    try:
+        assert p.get_chart(*BIRTH, name="홍길동") == SajuEngine().calculate(*BIRTH, "홍길동")
+        assert p.get_chart(2023, 2, 30, 0, 0, "남성") is None
+    finally:
+        p.shutdown()
+
+
+def test_identical_requests_share_one_computation(gate):
+    release, started = gate
+    p = ChartPool(ChartCache(path=None))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(p.get_chart(*BIRTH))) for _ in range(8)]
+    try:
+        for t in threads: t.start()
+        assert started.wait(5)
+        release.set()
+        for t in threads: t.join(10)
+        stats = p.stats()
+        assert len(results) == 8 and all(r == results[0] for r in results)
+        assert stats["computed"] == 1 and stats["merged"] + stats["computed"] <= 8
+        assert stats["pending"] == 0 and stats["waiters"] == 0
+    finally:
+        p.shutdown()
+
+
+def test_timeout_keeps_computing_in_background(gate):
+    release, _ = gate
+    p = ChartPool(ChartCache(path=None), timeout=0.05)
+    try:
+        with pytest.raises(PoolTimeout):
+            p.get_chart(*BIRTH)
+        assert p.stats()["timeouts"] == 1
+        release.set()
+        assert p.get_chart(*BIRTH, timeout=5) is not None
+    finally:
+        p.shutdown()
+
+
+def test_busy_when_pending_limit_reached(gate):
+    p = ChartPool(ChartCache(path=None), max_pending=1, timeout=0.01)
+    try:
+        with pytest.raises(PoolTimeout):
+            p.get_chart(*BIRTH)
+        with pytest.raises(PoolBusy):
+            p.get_chart(1985, 6, 15, 8, 30, "여성")
+        assert issubclass(PoolBusy, PoolError) and p.stats()["rejected"] == 1
+    finally:
+        p.shutdown(wait=False)
+
+
+def test_worker_exception_becomes_pool_error(monkeypatch):
+    def broken(birth): raise OverflowError("date value out of range")
+
+    monkeypatch.setattr(pool, "_calculate_chart", broken)
+    p = ChartPool(ChartCache(path=None))
+    try:
+        with pytest.raises(PoolError):
+            p.get_chart(*BIRTH)
+        assert p.stats()["errors"] == 1 and p.stats()["pending"] == 0
+    finally:
+        p.shutdown()
+
+
+def test_shutdown_cancels_queued_work_cleanly(gate, caplog):
+    release, started = gate
+    p = ChartPool(ChartCache(path=None), workers=1)
+    running = p.submit(BIRTH)
+    queued = p.submit((1985, 6, 15, 8, 30, "여성"))
+    assert started.wait(5)
+    p.shutdown(wait=False)  # 대기 중인 작업은 취소 (_finish 가 CancelledError 없이 정리해야 함)
+    assert queued.cancelled()
+    release.set()
+    running.result(5)
+    assert p.stats()["pending"] == 0 and p.stats()["errors"] == 0
+    assert not [r for r in caplog.records if r.name == "concurrent.futures"]
+
+
+def test_broken_process_pool_is_replaced():
+    p = ChartPool(ChartCache(path=None), workers=1, processes=True)
+    try:
+        assert p.get_chart(*BIRTH, timeout=60) is not None
+        executor = p._executor
+        with pytest.raises(Exception):
+            executor.submit(os._exit, 1).result(30)
+        assert p.get_chart(1985, 6, 15, 8, 30, "여성", timeout=60) is not None
+        assert p._executor is not executor
+    finally:
+        p.shutdown()
+
+
+def test_worker_stages_reach_callers_trace():
+    metrics.enable()
+    p = ChartPool(ChartCache(path=None))
+    try:
+        with metrics.trace() as collected:
+            p.get_chart(*BIRTH)
+        assert {"sun_longitude", "pillars", "daewoon_search"} <= set(collected["stages"])
+    finally:
+        p.shutdown()
+        metrics.enable(False)
+        metrics.reset()
@@ -0,0 +1,28 @@
+import glob
+import json
+import os
+import shutil
+
+from saju import reports
+from saju.engine import SajuEngine
+from saju.reports import ReportStore, build_report, compile_sources, latest_year
+
+
+def test_default_year_is_latest_in_store():
+    assert latest_year() == max(reports.get_store().years)
+    report = SajuEngine().calculate(1990, 1, 1, 12, 0, "남성", "홍길동")["report"]
+    assert report["year"] == latest_year() and report["header"].startswith("홍길동님의 ")
+
+
+def test_new_year_needs_no_code_change(tmp_path, monkeypatch):
+    for path in glob.glob(os.path.join(reports.SOURCE_DIR, "*.json")):
+        shutil.copy(path, tmp_path)
+    src = json.loads((tmp_path / "2026.json").read_text(encoding="utf-8"))
+    src["year"], src["title"] = 2027, "2027 정미년 전략 리포트"
+    (tmp_path / "2027.json").write_text(json.dumps(src, ensure_ascii=False), encoding="utf-8")
+
+    monkeypatch.setattr(reports, "_STORE", ReportStore(compile_sources(str(tmp_path))))
+    assert latest_year() == 2027
+    report = SajuEngine().calculate(1990, 1, 1, 12, 0, "남성", "홍길동")["report"]
+    assert report["year"] == 2027 and "2027 정미년" in report["header"]
+    assert build_report(0, "갑", 2026)["year"] == 2026
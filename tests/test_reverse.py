@@ -0,0 +1,87 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from saju import reverse
+from saju.engine import SajuEngine
+from saju.reverse import ReverseIndex, get_index
+from saju.tables import CHEON, GANJI_NAMES, JI
+
+# 입춘(2024-02-04 17:27 KST)과 자정·자시가 모두 들어가는 사흘
+WINDOW = (datetime.datetime(2024, 2, 3, 0, 0), datetime.datetime(2024, 2, 6, 0, 0))
+
+
+@pytest.fixture(scope="module")
+def forward():
+    """WINDOW 의 모든 분을 SajuEngine 으로 계산한 (시각 목록, 분마다 네 기둥 60갑자 인덱스 (n, 4))."""
+    engine = SajuEngine()
+    lookup = {name: i for i, name in enumerate(GANJI_NAMES)}
+    times, ganji = [], []
+    t = WINDOW[0]
+    while t < WINDOW[1]:
+        chart = engine.calculate_chart(t.year, t.month, t.day, t.hour, t.minute, "남성")
+        times.append(t)
+        ganji.append([lookup[f"{CHEON[g]}{JI[j]}"] for g, j in zip(chart.gans, chart.jis)])
+        t += datetime.timedelta(minutes=1)
+    return times, np.array(ganji)
+
+
+def _scan(times, ganji, pattern):
+    """패턴에 맞는 분을 이어 붙인 [시작, 끝) 구간 목록 (정방향 전수 조사)."""
+    mask = np.ones(len(times), dtype=bool)
+    for pillar, value in pattern: mask &= ganji[:, pillar] == value
+    out = []
+    for k in np.flatnonzero(mask):
+        end = times[k] + datetime.timedelta(minutes=1)
+        if out and out[-1][1] == times[k]: out[-1] = (out[-1][0], end)
+        else: out.append((times[k], end))
+    return out
+
+
+def test_queries_match_forward_scan(forward):
+    times, ganji = forward
+    index = get_index()
+    patterns = {()}
+    for row in ganji[::97]:
+        values = [GANJI_NAMES[v] for v in row]
+        patterns.add(tuple(values))
+        patterns.add(("*", "*") + tuple(values[2:]))
+        patterns.add((values[0], values[1], "*", "*"))
+        patterns.add(("*", "*", "*", values[3]))
+    for values in patterns:
+        want = _scan(times, ganji, reverse.parse_pattern(*values))
+        got = list(index.query(*values, start=WINDOW[0], end=WINDOW[1]))
+        assert got == want, values
+        assert index.count(*values, start=WINDOW[0], end=WINDOW[1]) == len(want)
+
+
+def test_pillars_at_matches_forward_scan(forward):
+    times, ganji = forward
+    index = get_index()
+    for t, row in zip(times[::7], ganji[::7]):
+        assert index.pillars_at(t) == tuple(GANJI_NAMES[v] for v in row), t
+
+
+def test_saved_index_round_trip(tmp_path):
+    built = ReverseIndex.build(*WINDOW)
+    path = str(tmp_path / "index.npz")
+    built.save(path)
+    loaded = ReverseIndex.load(path)
+    assert (loaded.starts == built.starts).all() and (loaded.ganji == built.ganji).all()
+    assert loaded.end == built.end
+
+
+def test_stale_index_is_rejected(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.npz")
+    ReverseIndex.build(*WINDOW).save(path)
+    monkeypatch.setattr(reverse, "_source_revision", lambda: 0)
+    with pytest.raises(ValueError):
+        ReverseIndex.load(path)
+
+
+def test_shipped_index_is_current():
+    # 절기 테이블을 다시 만들었다면 python -m saju.reverse --build 로 다시 저장해야 합니다.
+    index = ReverseIndex.load()
+    assert len(index) > 1_000_000
+    assert index.pillars_at(reverse.START) is not None
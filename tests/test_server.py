@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from saju import server
+from saju.chart import Chart
+from saju.server import HTTPError, MicroBatcher, SajuService, parse_birth
+
+BIRTHS = [(1990, 1, 1, 12, 0, "남성"), (1985, 6, 15, 8, 30, "여성"), (2001, 3, 3, 3, 3, "남성"), (1970, 12, 31, 23, 59, "여성")]
+
+
+@pytest.mark.parametrize("year", ["1", "0", "4096", "10000"])
+def test_parse_birth_rejects_unsupported_years(year):
+    with pytest.raises(HTTPError) as e:
+        parse_birth({"year": year, "month": "1", "day": "1", "gender": "남성"})
+    assert e.value.status == 400
+
+
+def test_parse_birth_accepts_supported_range():
+    assert parse_birth({"year": "2", "month": "1", "day": "1", "gender": "남성"}) == (2, 1, 1, 0, 0, "남성")
+    assert parse_birth({"year": "4095", "month": "12", "day": "31", "gender": "여"})[0] == 4095
+
+
+async def _submit_all(births):
+    batcher = MicroBatcher(workers=0, max_batch=len(births))
+    batcher.start()
+    try:
+        futures = [batcher.submit(b) for b in births]
+        return await asyncio.gather(*futures, return_exceptions=True)
+    finally:
+        await batcher.close()
+
+
+def test_bad_birth_fails_only_its_own_request(monkeypatch):
+    compute = server._compute_charts
+    poison = BIRTHS[2]
+    calls = []
+
+    def flaky(births):
+        calls.append(len(births))
+        if poison in births: raise OverflowError("date value out of range")
+        return compute(births)
+
+    monkeypatch.setattr(server, "_compute_charts", flaky)
+    results = asyncio.run(_submit_all(BIRTHS))
+    assert calls[0] == len(BIRTHS)  # 한 배치로 실렸다가 한 건씩 다시 계산
+    assert isinstance(results[2], OverflowError)
+    for birth, chart in zip(BIRTHS, results):
+        if birth == poison: continue
+        assert isinstance(chart, Chart) and (chart.year, chart.month, chart.day) == birth[:3]
+
+
+def test_batch_dedups_identical_inputs():
+    results = asyncio.run(_submit_all([BIRTHS[0]] * 3 + [BIRTHS[1]]))
+    assert results[0] is results[1] is results[2]
+
+
+def test_dispatch_year_one_is_400():
+    async def go():
+        batcher = MicroBatcher(workers=0)
+        batcher.start()
+        try:
+            with pytest.raises(HTTPError) as e:
+                await SajuService(batcher).dispatch("GET", "/v1/chart", "year=1&month=1&day=1&gender=남성", b"")
+            return e.value.status
+        finally:
+            await batcher.close()
+    assert asyncio.run(go()) == 400
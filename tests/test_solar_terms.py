@@ -0,0 +1,54 @@
+import datetime
+
+import pytest
+
+from saju import solar_terms
+from saju.solar_terms import FRAME_APPARENT, FRAME_J2000
+
+
+@pytest.fixture(scope="module")
+def table():
+    return solar_terms.get_table()
+
+
+@pytest.mark.parametrize("year", [1900, 1984, 2024, 2100])
+def test_check_table_sampled_years(table, year):
+    n, mismatches = solar_terms.check_table(table, samples=100, daewoon_samples=20, start=datetime.datetime(year, 1, 1),
+                                            end=datetime.datetime(year, 12, 31, 23, 59))
+    assert n > 100
+    assert mismatches == []
+
+
+def test_check_table_outside_stored_range():
+    # 1850년은 저장된 테이블 밖: 같은 방식으로 그 해만 계산한 테이블이 ephem 과 맞는지 확인
+    local = solar_terms.build_table(datetime.datetime(1849, 12, 1), datetime.datetime(1851, 2, 1))
+    n, mismatches = solar_terms.check_table(local, samples=100, daewoon_samples=20,
+                                            start=datetime.datetime(1850, 1, 1), end=datetime.datetime(1850, 12, 31, 23, 59))
+    assert n > 100
+    assert mismatches == []
+
+
+def test_outside_table_falls_back_to_ephem(table):
+    d = datetime.datetime(1850, 6, 1, 3, 0)
+    assert table.term_index(d) is None and table.boundary_hours(d, 1) is None
+    assert solar_terms.term_index(d) == int(solar_terms.ephem_sun_longitude(d) / 15)
+    assert solar_terms.boundary_hours(d, 1) == solar_terms.ephem_boundary_hours(d, 1)
+
+
+def test_j2000_frame_is_separate(table):
+    # 세차 때문에 J2000 경계는 당일 춘분점 경계보다 늦습니다 (2024년 기준 8시간 남짓).
+    # 두 경계 사이 시각에서는 프레임마다 다른 절기 번호가 나와야 합니다.
+    d = datetime.datetime(2024, 2, 4)
+    i = next(k for k, t in enumerate(table.bounds[FRAME_APPARENT]) if solar_terms.from_seconds(t) > d)
+    apparent, j2000 = table.bounds[FRAME_APPARENT][i], table.bounds[FRAME_J2000][i]
+    assert 4 * 3600 < j2000 - apparent < 12 * 3600
+    between = solar_terms.from_seconds((apparent + j2000) / 2)
+    for frame in (FRAME_APPARENT, FRAME_J2000):
+        assert table.term_index(between, frame) == int(solar_terms.ephem_sun_longitude(between, frame) / 15)
+    assert table.term_index(between, FRAME_APPARENT) == (table.term_index(between, FRAME_J2000) + 1) % 24
+    # 대운수는 J2000 기준, 같은 시각이라도 당일 기준과 결과가 다릅니다.
+    for direction in (1, -1):
+        assert table.boundary_hours(between, direction) == solar_terms.ephem_boundary_hours(between, direction)
+        assert (table.boundary_hours(between, direction, FRAME_APPARENT)
+                == solar_terms.ephem_boundary_hours(between, direction, FRAME_APPARENT))
+    assert table.boundary_hours(between, 1) != table.boundary_hours(between, 1, FRAME_APPARENT)
@@ -0,0 +1,66 @@
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from saju import solar_terms
+from saju.engine import SajuEngine
+from saju.vector import calculate_arrays, calculate_charts
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return SajuEngine()
+
+
+def _assert_parity(engine, births):
+    got = calculate_charts(births)
+    for birth, chart in zip(births, got):
+        assert chart == engine.calculate_chart(*birth), birth
+
+
+def _kst(seconds):
+    return solar_terms.from_seconds(seconds) + datetime.timedelta(hours=9)
+
+
+def test_solar_term_boundaries(engine):
+    # 입춘(21)·경칩(23)·입하(3) 등 절기 경계가 걸친 분과 그 앞뒤 분
+    table = solar_terms.get_table()
+    rng = random.Random(1)
+    bounds = rng.sample(list(table.bounds[solar_terms.FRAME_APPARENT][24:-24]), 20)
+    births = []
+    for k, b in enumerate(bounds):
+        d = _kst(b).replace(second=0, microsecond=0)
+        utc = solar_terms.from_seconds(b).replace(second=0, microsecond=0)
+        assert table.term_index(utc) != table.term_index(utc + datetime.timedelta(minutes=1))
+        for delta in (-1, 0, 1):
+            t = d + datetime.timedelta(minutes=delta)
+            births.append((t.year, t.month, t.day, t.hour, t.minute, "남성" if k % 2 else "여성"))
+    _assert_parity(engine, births)
+
+
+def test_midnight_hours(engine):
+    # 23:00~00:59 (자시) 출생은 다음 날 일간 기준 시주
+    births = [(1990, 5, 17, h, m, g) for h in (22, 23, 0, 1) for m in (0, 30, 59) for g in ("남성", "여성")]
+    births += [(1999, 12, 31, 23, 30, "남성"), (2000, 1, 1, 0, 30, "여성")]
+    _assert_parity(engine, births)
+
+
+def test_leap_days(engine):
+    births = [(y, 2, 29, h, 0, g) for y in (1904, 1960, 2000, 2024, 2096) for h in (0, 12, 23) for g in ("남성", "여성")]
+    _assert_parity(engine, births)
+
+
+def test_years_outside_table(engine):
+    # 1900~2100 밖은 ephem 으로 직접 계산
+    births = [(1850, 2, 4, 12, 0, "남성"), (1850, 7, 15, 23, 30, "여성"),
+              (2150, 3, 6, 6, 0, "여성"), (2150, 12, 31, 23, 59, "남성")]
+    _assert_parity(engine, births)
+
+
+def test_gender_strings_accepted():
+    dts = np.array(["1990-01-01T12:00", "1990-01-01T12:00"], dtype="datetime64[m]")
+    by_str = calculate_arrays(dts, np.array(["남성", "여성"]))
+    by_bool = calculate_arrays(dts, np.array([True, False]))
+    for key in by_bool: assert (by_str[key] == by_bool[key]).all(), key